@@ -0,0 +1,57 @@
+"""
+Projection d'attention précalculée (PreparedFeatures) : gain par pas de décodage
+et sur le forward complet, sur CPU avec des poids aléatoires.
+L'équivalence avec le chemin sans précalcul est vérifiée par tests/test_attention_cache.py.
+
+    python scripts/benchmark_attention_cache.py --batch-size 128
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.model.decoder import DecoderWithAttention
+from tests.reference_decoder import reference_forward
+
+
+def time_it(fn, repeats: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vocab-size", type=int, default=8000)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--max-len", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    decoder = DecoderWithAttention(attention_dim=256, embed_dim=256, decoder_dim=512, vocab_size=args.vocab_size).eval()
+    features = torch.randn(args.batch_size, 2048)
+    lengths = sorted(torch.randint(5, args.max_len + 1, (args.batch_size,)).tolist(), reverse=True)
+    captions = torch.randint(4, args.vocab_size, (args.batch_size, max(lengths)))
+
+    with torch.no_grad():
+        # ⏱️ Coût d'un pas d'attention, avec et sans précalcul
+        prepared = decoder.prepare_features(features)
+        hidden = prepared.h
+        per_step = time_it(lambda: decoder.attention(features, hidden), args.repeats)
+        cached = time_it(lambda: decoder.attend(prepared, hidden), args.repeats)
+        print(f"⏱️ attention / pas  : {per_step * 1e3:.3f} ms → {cached * 1e3:.3f} ms (batch={args.batch_size})")
+
+        ref_time = time_it(lambda: reference_forward(decoder, features, captions, lengths), max(1, args.repeats // 10))
+        new_time = time_it(lambda: decoder(features, captions, lengths), max(1, args.repeats // 10))
+        print(f"⏱️ forward complet  : {ref_time * 1e3:.1f} ms → {new_time * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Authentification sous charge, dans l'application réelle (requêtes concurrentes sur la
+boucle asyncio via httpx.ASGITransport) :
+
+- requêtes autorisées seules : dépendance synchrone qui décode le JWT à chaque requête
+  (ancien get_current_user) contre get_current_user asynchrone avec cache des tokens ;
+- rafale de connexions : ancien /login (endpoint synchrone, deux SELECT, bcrypt dans le
+  pool de threads partagé) contre /login actuel (une requête, bcrypt dans un pool dédié),
+  avec en parallèle des requêtes autorisées dont on mesure la latence.
+
+    python scripts/benchmark_auth.py --requests 500 --logins 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "services" / "api"))
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("JOBS_ENABLED", "false")
+
+
+def install_legacy_routes(app):
+    """Anciens chemins, reproduits à l'identique pour la comparaison."""
+    from fastapi import Depends, HTTPException
+    from fastapi.security import OAuth2PasswordRequestForm
+    from jose import jwt
+    from api_src.auth.dependencies import oauth2_scheme, SECRET_KEY, ALGORITHM, get_current_user
+    from api_src.auth.jwt_manager import create_access_token
+    from api_src.auth.security import verify_password
+    from api_src.database.database import Database
+    from api_src.repositories.user_repository import UserRepository
+
+    def legacy_current_user(token: str = Depends(oauth2_scheme)):
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return {"username": payload["sub"], "id_user": payload["id_user"]}
+
+    @app.post("/_benchmark/legacy_login")
+    def legacy_login(form_data: OAuth2PasswordRequestForm = Depends()):
+        repository = UserRepository(Database())
+        hashed_password = repository.get_password_hash_by_username(form_data.username)
+        if not hashed_password or not verify_password(form_data.password, hashed_password):
+            raise HTTPException(status_code=400)
+        id_user = repository.get_id_by_username(form_data.username)
+        return {"access_token": create_access_token(data={"sub": form_data.username, "id_user": id_user})}
+
+    @app.get("/_benchmark/legacy_me")
+    def legacy_me(user: dict = Depends(legacy_current_user)):
+        return user
+
+    @app.get("/_benchmark/me")
+    async def me(user: dict = Depends(get_current_user)):
+        return user
+
+
+def percentiles(latencies: list[float]) -> tuple[float, float]:
+    latencies = sorted(latencies)
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95) - 1] * 1000
+
+
+async def authorized_requests(client, path: str, headers: dict, count: int, concurrency: int) -> dict:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    elapsed = time.perf_counter() - start
+    p50, p95 = percentiles(latencies)
+    return {"per_s": count / elapsed, "p50_ms": p50, "p95_ms": p95}
+
+
+async def login_burst(client, login_path: str, me_path: str, headers: dict, logins: int, probes: int) -> dict:
+    """`logins` connexions simultanées ; pendant la rafale, `probes` requêtes autorisées espacées de 20ms."""
+    async def login():
+        response = await client.post(login_path, data={"username": "benchmark", "password": "benchmark"})
+        response.raise_for_status()
+
+    async def probe():
+        latencies = []
+        for _ in range(probes):
+            start = time.perf_counter()
+            (await client.get(me_path, headers=headers)).raise_for_status()
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.02)
+        return latencies
+
+    start = time.perf_counter()
+    probe_task = asyncio.create_task(probe())
+    await asyncio.gather(*(login() for _ in range(logins)))
+    login_time = time.perf_counter() - start
+    p50, p95 = percentiles(await probe_task)
+    return {"logins_per_s": logins / login_time, "p50_ms": p50, "p95_ms": p95}
+
+
+async def run(args):
+    import httpx
+    from main import app
+
+    install_legacy_routes(app)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            response = await client.post("/login", data={"username": "benchmark", "password": "benchmark"})
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            legacy = await authorized_requests(client, "/_benchmark/legacy_me", headers, args.requests, args.concurrency)
+            cached = await authorized_requests(client, "/_benchmark/me", headers, args.requests, args.concurrency)
+            print(f"🔑 {args.requests} requêtes autorisées ({args.concurrency} simultanées) : "
+                  f"{legacy['per_s']:.0f} → {cached['per_s']:.0f} requêtes/s | "
+                  f"p50 {legacy['p50_ms']:.2f} → {cached['p50_ms']:.2f}ms | p95 {legacy['p95_ms']:.2f} → {cached['p95_ms']:.2f}ms")
+
+            legacy = await login_burst(client, "/_benchmark/legacy_login", "/_benchmark/legacy_me", headers, args.logins, args.probes)
+            current = await login_burst(client, "/login", "/_benchmark/me", headers, args.logins, args.probes)
+            print(f"🔐 rafale de {args.logins} connexions : {legacy['logins_per_s']:.1f} → {current['logins_per_s']:.1f} connexions/s | "
+                  f"requêtes autorisées pendant la rafale : p50 {legacy['p50_ms']:.2f} → {current['p50_ms']:.2f}ms, "
+                  f"p95 {legacy['p95_ms']:.2f} → {current['p95_ms']:.2f}ms")
+            print(f"📊 {(await client.get('/monitoring/auth')).json()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--probes", type=int, default=20, help="requêtes autorisées envoyées pendant la rafale")
+    args = parser.parse_args()
+
+    import api_src.database.database as database
+    database.DB_FILE = tempfile.mktemp(suffix=".db")
+    from api_src.auth.security import hash_password
+    db = database.Database()
+    db.create_tables()
+    db.add_user("benchmark", hash_password("benchmark"))
+    db.close()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Débit de l'API pour un envoi en masse : N requêtes /upload_image contre N/k requêtes
+/upload_images de k fichiers (authentification, connexion SQLite, appel modèle et commit
+une fois par requête), et un job POST /jobs suivi jusqu'à la fin.
+Base SQLite temporaire, cache des légendes désactivé.
+
+    python scripts/benchmark_batch_upload.py --images 64 --files-per-request 16
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "services" / "api"))
+
+# ♻️ Sans cache : chaque image passe réellement par le modèle
+os.environ["CAPTION_CACHE_SIZE"] = "0"
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+
+def make_images(count: int, size=(640, 480)) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        buffer = io.BytesIO()
+        pixels = rng.integers(0, 256, (size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+        Image.fromarray(pixels).resize(size).save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=64)
+    parser.add_argument("--files-per-request", type=int, default=16)
+    args = parser.parse_args()
+
+    import api_src.database.database as database
+    database.DB_FILE = tempfile.mktemp(suffix=".db")
+    from api_src.auth.security import hash_password
+    db = database.Database()
+    db.create_tables()
+    db.add_user("benchmark", hash_password("benchmark"))
+    db.close()
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    images = make_images(args.images)
+    with TestClient(app) as client:
+        token = client.post("/login", data={"username": "benchmark", "password": "benchmark"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.post("/upload_image", files={"file": ("warmup.jpg", images[0], "image/jpeg")}, headers=headers)
+
+        # 1️⃣ Une requête par image
+        start = time.perf_counter()
+        single = []
+        for i, image in enumerate(images):
+            response = client.post("/upload_image", files={"file": (f"{i}.jpg", image, "image/jpeg")}, headers=headers)
+            response.raise_for_status()
+            single.append(response.json()["resultat_pred"])
+        single_time = time.perf_counter() - start
+
+        # 2️⃣ Plusieurs images par requête
+        start = time.perf_counter()
+        batched = []
+        for offset in range(0, len(images), args.files_per_request):
+            files = [
+                ("files", (f"{offset + i}.jpg", image, "image/jpeg"))
+                for i, image in enumerate(images[offset:offset + args.files_per_request])
+            ]
+            response = client.post("/upload_images", files=files, headers=headers)
+            response.raise_for_status()
+            batched.extend(item["resultat_pred"] for item in response.json()["resultats"])
+        batched_time = time.perf_counter() - start
+
+        # 3️⃣ Un job en arrière-plan, suivi par GET /jobs/{id_job}
+        start = time.perf_counter()
+        files = [("files", (f"{i}.jpg", image, "image/jpeg")) for i, image in enumerate(images)]
+        response = client.post("/jobs", files=files, headers=headers)
+        response.raise_for_status()
+        id_job = response.json()["id_job"]
+        submit_time = time.perf_counter() - start
+        while client.get(f"/jobs/{id_job}", headers=headers).json()["statut"] in ("pending", "running"):
+            time.sleep(0.1)
+        job_time = time.perf_counter() - start
+        items = client.get(f"/jobs/{id_job}/items", params={"limit": args.images}, headers=headers).json()["items"]
+        job = [item["resultat_pred"] for item in items]
+
+        pipeline_stats = client.get("/monitoring/pipeline").json()["model"]
+
+    same = sum(a == b for a, b in zip(single, batched))
+    same_job = sum(a == b for a, b in zip(single, job))
+    print(f"1️⃣ {args.images} x /upload_image : {single_time:.2f}s ({args.images / single_time:.1f} images/s)")
+    print(f"📦 {-(-args.images // args.files_per_request)} x /upload_images ({args.files_per_request} fichiers) : "
+          f"{batched_time:.2f}s ({args.images / batched_time:.1f} images/s)")
+    print(f"⚡ x{single_time / batched_time:.2f} | légendes identiques : {same}/{args.images}")
+    print(f"🗂️ 1 job de {args.images} images : {job_time:.2f}s ({args.images / job_time:.1f} images/s), "
+          f"réponse POST /jobs en {submit_time * 1000:.0f}ms | légendes identiques : {same_job}/{args.images}")
+    print(f"📊 modèle : {pipeline_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark du démarrage à froid de l'API, avec et sans modèle de traduction.
+
+Chaque scénario est lancé dans un processus neuf : import de l'application,
+exécution du lifespan (chargement des modèles) puis mesure de la mémoire.
+
+    python scripts/benchmark_cold_start.py --repeats 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+SCENARIOS = {
+    "traduction désactivée": {"TRANSLATION_ENABLED": "false"},
+    "traduction paresseuse": {"TRANSLATION_ENABLED": "true", "TRANSLATION_WARMUP": "false"},
+    "traduction pré-chargée": {"TRANSLATION_ENABLED": "true", "TRANSLATION_WARMUP": "true"},
+}
+
+# Base SQLite temporaire : le lifespan crée et migre les tables, jamais dans la vraie base
+CHILD = """
+import json, os, sys, tempfile, time
+start = time.perf_counter()
+sys.path.insert(0, os.path.join(os.getcwd(), "services", "api"))
+from main import app
+imported = time.perf_counter()
+import api_src.database.database as database
+from fastapi.testclient import TestClient
+with tempfile.TemporaryDirectory() as tmp:
+    database.DB_FILE = os.path.join(tmp, "database.db")
+    with TestClient(app):
+        ready = time.perf_counter()
+        with open("/proc/self/status") as f:
+            rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS"))
+print(json.dumps({"import_s": imported - start, "ready_s": ready - start, "rss_mb": rss / 2**20}))
+"""
+
+
+def run_scenario(env_overrides: dict) -> dict:
+    env = {**os.environ, **env_overrides}
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=PROJECT_ROOT, env=env,
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec du démarrage ({env_overrides}) :\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, env_overrides in SCENARIOS.items():
+        try:
+            runs = [run_scenario(env_overrides) for _ in range(args.repeats)]
+        except RuntimeError as e:
+            print(f"❌ {name:<24} {str(e).strip().splitlines()[-1]}")
+            continue
+        print(
+            f"🚀 {name:<24} import {statistics.median(r['import_s'] for r in runs):6.2f}s | "
+            f"prêt {statistics.median(r['ready_s'] for r in runs):6.2f}s | "
+            f"RSS {statistics.median(r['rss_mb'] for r in runs):7.1f} Mo"
+        )
+
+
+if __name__ == "__main__":
+    main()
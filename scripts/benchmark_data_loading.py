@@ -0,0 +1,127 @@
+"""
+Temps de chargement d'une epoch du DataLoader : fichiers .pt (un torch.load par paire),
+feature store compact (memmap), puis feature store + corpus pré-tokenisé.
+Sans --features-dir, un jeu synthétique est créé.
+
+    python scripts/benchmark_data_loading.py --images 2000 --workers 0
+    python scripts/benchmark_data_loading.py --features-dir data/processed/features_resnet_global --captions data/processed/aligned_captions.json
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+from torch.utils.data import DataLoader
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.data.caption_corpus import load_or_build_corpus
+from src.data.dataset import ImageCaptionDataset, get_collate_fn
+from src.data.feature_store import FeatureStore, pack_features
+from src.data.tokenizer import Tokenizer
+
+AUGMENTATIONS = ["", "_aug0", "_aug1", "_aug2"]
+WORDS = ["a", "dog", "runs", "on", "the", "grass", "man", "rides", "bike", "in", "street", "two", "children", "play"]
+
+
+def make_synthetic(features_dir: Path, n_images: int, dim: int) -> dict:
+    """Crée n_images × 4 fichiers .pt et 5 légendes par image"""
+    generator = torch.Generator().manual_seed(0)
+    captions = {}
+    for i in range(n_images):
+        image_id = f"img_{i:06d}"
+        for suffix in AUGMENTATIONS:
+            torch.save(torch.randn(dim, generator=generator), features_dir / f"{image_id}{suffix}.pt")
+        captions[image_id] = [
+            " ".join(WORDS[j % len(WORDS)] for j in torch.randint(0, 100, (10,), generator=generator).tolist())
+            for _ in range(5)
+        ]
+    return captions
+
+
+def run_epoch(dataset, collate_fn, batch_size, workers) -> float:
+    loader = DataLoader(dataset, batch_size=batch_size, shuffle=True, num_workers=workers, collate_fn=collate_fn)
+    start = time.perf_counter()
+    for _ in loader:
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features-dir", default=None)
+    parser.add_argument("--captions", default=None, help="aligned_captions.json (requis avec --features-dir)")
+    parser.add_argument("--store-dir", default=None)
+    parser.add_argument("--images", type=int, default=1000, help="taille du jeu synthétique")
+    parser.add_argument("--dim", type=int, default=2048)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.features_dir is None:
+            features_dir = Path(tmp) / "features"
+            features_dir.mkdir()
+            captions_dict = make_synthetic(features_dir, args.images, args.dim)
+            captions_path = Path(tmp) / "aligned_captions.json"
+            with open(captions_path, "w") as f:
+                json.dump(captions_dict, f)
+            print(f"🧪 Jeu synthétique : {args.images} images × {len(AUGMENTATIONS)} variantes")
+        else:
+            features_dir = Path(args.features_dir)
+            captions_path = Path(args.captions)
+            with open(captions_path, "r") as f:
+                captions_dict = json.load(f)
+
+        store_dir = Path(args.store_dir) if args.store_dir else Path(tmp) / "store"
+        start = time.perf_counter()
+        added = pack_features(features_dir, store_dir)
+        print(f"📦 Conversion : {added} images en {time.perf_counter() - start:.2f}s")
+
+        pairs = [
+            (image_id + suffix, caption)
+            for image_id, captions in captions_dict.items()
+            for suffix in AUGMENTATIONS
+            for caption in captions
+        ]
+        words = sorted({word for captions in captions_dict.values() for caption in captions for word in caption.split()})
+        word2idx = {token: i for i, token in enumerate(["<pad>", "<start>", "<end>", "<unk>"] + words)}
+        tokenizer = Tokenizer(word2idx)
+        collate_fn = get_collate_fn(tokenizer)
+
+        start = time.perf_counter()
+        corpus = load_or_build_corpus(captions_path, tokenizer, Path(tmp) / "caption_corpus.npz")
+        print(f"🔡 Corpus pré-tokenisé : {len(corpus)} légendes en {time.perf_counter() - start:.2f}s")
+        corpus_pairs = [
+            (image_id + suffix, caption_idx)
+            for image_id in captions_dict
+            for suffix in AUGMENTATIONS
+            for caption_idx in corpus.caption_indices(image_id)
+        ]
+
+        feature_store = FeatureStore(store_dir)
+        files_dataset = ImageCaptionDataset(pairs, features_dir, tokenizer)
+        store_dataset = ImageCaptionDataset(pairs, features_dir, tokenizer, feature_store=feature_store)
+        corpus_dataset = ImageCaptionDataset(corpus_pairs, None, tokenizer, feature_store=feature_store, corpus=corpus)
+
+        # ✅ Mêmes features et mêmes tokens dans les trois modes
+        image_id = pairs[0][0]
+        same_features = torch.equal(files_dataset[0][0], store_dataset[0][0])
+        same_tokens = all(
+            torch.equal(files_dataset[i][1], corpus_dataset[i][1].long()) for i in range(0, len(pairs), 97)
+        )
+        print(f"✅ features identiques pour {image_id} : {same_features} | tokens identiques : {same_tokens}")
+
+        files = run_epoch(files_dataset, collate_fn, args.batch_size, args.workers)
+        store = run_epoch(store_dataset, collate_fn, args.batch_size, args.workers)
+        pretokenized = run_epoch(corpus_dataset, collate_fn, args.batch_size, args.workers)
+        print(f"⏱️ epoch ({len(pairs)} paires, {args.workers} workers) : fichiers .pt {files:.2f}s "
+              f"→ feature store {store:.2f}s (x{files / store:.2f}) "
+              f"→ + corpus {pretokenized:.2f}s (x{files / pretokenized:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Écritures concurrentes dans SQLite, comme pendant des uploads en parallèle :
+chaque thread enregistre des (Image, Prediction) en boucle.
+
+- ancien accès : une connexion neuve par requête (journal rollback par défaut),
+  puis deux commits (add_image, puis add_prediction) ;
+- ConnectionPool : une connexion par thread, mode WAL, synchronous=NORMAL,
+  save_prediction en une seule transaction.
+
+    python scripts/benchmark_db_writes.py --threads 1 4 8 --writes 300
+"""
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "services" / "api"))
+
+from api_src.database.database import ConnectionPool, Database
+from api_src.repositories.image_repository import ImageRepository
+
+
+def create_database(path: str, legacy: bool) -> int:
+    db = Database(ConnectionPool(path))
+    db.create_tables()
+    user_id = db.add_user("benchmark", "x")
+    db.pool.close()
+    if legacy:
+        # Journal rollback, comme avant le passage au WAL
+        with sqlite3.connect(path) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE;")
+    return user_id
+
+
+def legacy_save_prediction(path: str, user_id: int, index: int):
+    """Ancien chemin : get_db() → sqlite3.connect par requête, add_image et add_prediction commitent chacun"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO Image (nom_fichier, date_fichier, id_user) VALUES (?, ?, ?)",
+        (f"{index}.jpg", "2025-01-01 00:00:00", user_id)
+    )
+    conn.commit()
+    image_id = cursor.lastrowid
+    cursor.execute(
+        "INSERT INTO Prediction (resultat_pred, confiance_pred, monitor_pred, date_pred, id_image) VALUES (?, ?, ?, ?, ?)",
+        ("a dog on the grass", 0.42, 0, "2025-01-01 00:00:00", image_id)
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(save, threads: int, writes: int) -> dict:
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker(offset: int):
+        local_latencies, local_errors = [], 0
+        for i in range(writes):
+            start = time.perf_counter()
+            try:
+                save(offset + i)
+            except Exception:
+                local_errors += 1
+            local_latencies.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+
+    workers = [threading.Thread(target=worker, args=(t * writes,)) for t in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "per_s": threads * writes / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": sum(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--writes", type=int, default=300, help="enregistrements par thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for threads in args.threads:
+            legacy_path = str(Path(tmp) / f"{threads}_legacy.db")
+            pooled_path = str(Path(tmp) / f"{threads}_pooled.db")
+            legacy_user = create_database(legacy_path, legacy=True)
+            pooled_user = create_database(pooled_path, legacy=False)
+
+            legacy = run(lambda i: legacy_save_prediction(legacy_path, legacy_user, i), threads, args.writes)
+
+            pool = ConnectionPool(pooled_path)
+            repository = ImageRepository(Database(pool))
+            pooled = run(
+                lambda i: repository.save_prediction(pooled_user, f"{i}.jpg", "a dog on the grass", [0.42], 0),
+                threads, args.writes
+            )
+            stats = pool.stats()
+            pool.close()
+
+            print(f"🧵 {threads} thread(s) : "
+                  f"{legacy['per_s']:7.0f} → {pooled['per_s']:7.0f} prédictions/s (x{pooled['per_s'] / legacy['per_s']:.1f}) | "
+                  f"p50 {legacy['p50_ms']:.2f} → {pooled['p50_ms']:.2f}ms | "
+                  f"p95 {legacy['p95_ms']:.2f} → {pooled['p95_ms']:.2f}ms | "
+                  f"erreurs {legacy['errors']} → {pooled['errors']} | "
+                  f"{stats['journal_mode']}, {stats['opened_total']} connexion(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Forward d'entraînement de DecoderWithAttention : temps d'une « epoch » synthétique
+(forward + loss + backward) sur CPU, boucle d'origine contre forward_packed.
+L'équivalence des sorties est vérifiée par tests/test_decoder_forward.py.
+
+    python scripts/benchmark_decoder_forward.py --batches 20 --batch-size 128
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import torch
+from torch import nn
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.model.decoder import DecoderWithAttention
+from tests.reference_decoder import reference_forward
+
+PAD = 0
+
+
+def make_batch(batch_size, vocab_size, max_len):
+    """Batch trié par longueur décroissante, comme l'attend la boucle d'origine"""
+    lengths = sorted(torch.randint(8, max_len + 1, (batch_size,)).tolist(), reverse=True)
+    captions = torch.full((batch_size, lengths[0]), PAD, dtype=torch.long)
+    for i, length in enumerate(lengths):
+        captions[i, :length] = torch.randint(4, vocab_size, (length,))
+    return torch.randn(batch_size, 2048), captions, lengths
+
+
+def run_epoch(decoder, batches, criterion, step_fn) -> float:
+    optimizer = torch.optim.Adam(decoder.parameters(), lr=1e-4)
+    decoder.train()
+    start = time.perf_counter()
+    for features, captions, lengths in batches:
+        optimizer.zero_grad()
+        loss = step_fn(features, captions, lengths, criterion)
+        loss.backward()
+        optimizer.step()
+    return time.perf_counter() - start
+
+
+def reference_step(decoder):
+    def step(features, captions, lengths, criterion):
+        outputs = reference_forward(decoder, features, captions, lengths)
+        return criterion(outputs.view(-1, outputs.shape[-1]), captions[:, 1:].reshape(-1))
+    return step
+
+
+def packed_step(decoder):
+    def step(features, captions, lengths, criterion):
+        outputs, targets = decoder.forward_packed(features, captions, lengths)
+        return criterion(outputs, targets)
+    return step
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vocab-size", type=int, default=8000)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--max-len", type=int, default=20)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    decoder = DecoderWithAttention(attention_dim=256, embed_dim=256, decoder_dim=512, vocab_size=args.vocab_size)
+    criterion = nn.CrossEntropyLoss(ignore_index=PAD)
+    batches = [make_batch(args.batch_size, args.vocab_size, args.max_len) for _ in range(args.batches)]
+
+    # ⏱️ Epoch synthétique
+    reference = run_epoch(decoder, batches, criterion, reference_step(decoder))
+    packed = run_epoch(decoder, batches, criterion, packed_step(decoder))
+    print(f"⏱️ epoch ({args.batches} batches de {args.batch_size}) : "
+          f"{reference:.2f}s → {packed:.2f}s (x{reference / packed:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark CPU : décodage glouton vs beam search.
+
+Utilise un DecoderWithAttention aux poids aléatoires (mêmes dimensions que le
+modèle servi par l'API) : aucun checkpoint n'est nécessaire. Le token <end> est
+désactivé pour que toutes les méthodes décodent max_len pas (pire cas).
+
+    python scripts/benchmark_decoding.py --batch-sizes 1 8 --beam-sizes 3 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.model.decoder import DecoderWithAttention
+from src.inference.decoding import greedy_decode, beam_search_decode
+
+START, END, PAD = 1, 2, 0
+
+
+def build_decoder(vocab_size: int) -> DecoderWithAttention:
+    decoder = DecoderWithAttention(attention_dim=256, embed_dim=256, decoder_dim=512, vocab_size=vocab_size).eval()
+    with torch.no_grad():
+        decoder.fc.bias[END] = -1e4  # jamais de <end> → longueur maximale
+    return decoder
+
+
+def time_it(fn, repeats: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vocab-size", type=int, default=8000)
+    parser.add_argument("--max-len", type=int, default=20)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--beam-sizes", type=int, nargs="+", default=[3, 5])
+    parser.add_argument("--length-penalty", type=float, default=1.0)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    torch.manual_seed(0)
+    decoder = build_decoder(args.vocab_size)
+
+    print(f"🧪 vocab={args.vocab_size} max_len={args.max_len} threads={torch.get_num_threads()}")
+    for batch_size in args.batch_sizes:
+        features = torch.randn(batch_size, 2048)
+        greedy = time_it(
+            lambda: greedy_decode(decoder, features, START, END, PAD, max_len=args.max_len),
+            args.repeats
+        )
+        print(f"\n📦 batch={batch_size}")
+        print(f"   greedy        : {greedy * 1000:8.2f} ms  (x1.00)")
+
+        for beam_size in args.beam_sizes:
+            beam = time_it(
+                lambda: beam_search_decode(
+                    decoder, features, START, END, PAD,
+                    beam_size=beam_size, max_len=args.max_len, length_penalty=args.length_penalty
+                ),
+                args.repeats
+            )
+            print(f"   beam={beam_size:<2}       : {beam * 1000:8.2f} ms  (x{beam / greedy:.2f})")
+
+
+if __name__ == "__main__":
+    main()
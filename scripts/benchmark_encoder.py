@@ -0,0 +1,69 @@
+"""
+Encoder : prétraitement PIL image par image (transform + unsqueeze, ancienne API) contre
+lot (resize uint8 + normalisation en un seul tenseur), écart des features et temps sur CPU.
+
+    python scripts/benchmark_encoder.py --batch-size 8 --repeat 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from PIL import Image
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.model.encoder import Encoder
+
+
+def per_image(encoder, images):
+    """Ancien chemin : un passage ResNet par image"""
+    features = []
+    with torch.no_grad():
+        for image in images:
+            features.append(encoder.resnet(encoder.transform(image).unsqueeze(0)).squeeze())
+    return torch.stack(features)
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    rng = np.random.default_rng(0)
+    images = [
+        Image.fromarray(rng.integers(0, 256, (int(rng.integers(300, 500)), int(rng.integers(300, 500)), 3), dtype=np.uint8))
+        for _ in range(args.batch_size)
+    ]
+    encoder = Encoder().eval()
+
+    # 🧪 Prétraitement seul
+    old_pre, old_batch = timed(lambda: torch.stack([encoder.transform(image) for image in images]), args.repeat)
+    new_pre, new_batch = timed(lambda: encoder.to_batch(images), args.repeat)
+    print(f"🧪 prétraitement ({args.batch_size} images) : {old_pre * 1000:.1f}ms → {new_pre * 1000:.1f}ms "
+          f"(écart max des pixels normalisés {(old_batch - new_batch).abs().max().item():.3f})")
+
+    # 🧠 Encodage complet
+    old, old_features = timed(lambda: per_image(encoder, images), args.repeat)
+    new, new_features = timed(lambda: encoder(images), args.repeat)
+    similarity = torch.nn.functional.cosine_similarity(old_features, new_features).min().item()
+    print(f"✅ features : forme {tuple(new_features.shape)}, similarité cosinus min {similarity:.5f}")
+    print(f"⏱️ encodage : image par image {old:.2f}s → lot {new:.2f}s (x{old / new:.2f}), "
+          f"{args.batch_size / new:.1f} images/s")
+
+
+if __name__ == "__main__":
+    main()
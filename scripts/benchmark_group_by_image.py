@@ -0,0 +1,107 @@
+"""
+Mode groupé par image (une ligne de features pour ses K légendes) contre paires
+(image, légende) indépendantes : équivalence du forward et temps d'une epoch
+synthétique (DataLoader + forward_packed + backward) sur CPU.
+
+    python scripts/benchmark_group_by_image.py --images 256
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+from torch import nn
+from torch.utils.data import DataLoader
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.data.caption_corpus import load_or_build_corpus
+from src.data.dataset import ImageCaptionDataset, ImageCaptionGroupDataset, get_collate_fn, get_grouped_collate_fn
+from src.data.feature_store import FeatureStoreWriter
+from src.data.tokenizer import Tokenizer
+from src.model.decoder import DecoderWithAttention
+
+CAPTIONS_PER_IMAGE = 5
+
+
+def make_synthetic(tmp: Path, n_images: int, vocab_size: int):
+    """Feature store + légendes aléatoires (5 par image, 8 à 18 mots)"""
+    generator = torch.Generator().manual_seed(0)
+    words = [f"w{i}" for i in range(vocab_size - 4)]
+    image_ids = [f"img_{i:06d}" for i in range(n_images)]
+
+    FeatureStoreWriter(tmp / "store").append(image_ids, torch.randn(n_images, 2048, generator=generator).numpy())
+    captions_dict = {
+        image_id: [
+            " ".join(words[j] for j in torch.randint(0, len(words), (int(torch.randint(8, 19, (1,), generator=generator)),), generator=generator).tolist())
+            for _ in range(CAPTIONS_PER_IMAGE)
+        ]
+        for image_id in image_ids
+    }
+    with open(tmp / "aligned_captions.json", "w") as f:
+        json.dump(captions_dict, f)
+
+    word2idx = {token: i for i, token in enumerate(["<pad>", "<start>", "<end>", "<unk>"] + words)}
+    return captions_dict, Tokenizer(word2idx)
+
+
+def run_epoch(decoder, loader, criterion) -> float:
+    optimizer = torch.optim.Adam(decoder.parameters(), lr=1e-4)
+    decoder.train()
+    start = time.perf_counter()
+    for features, captions, lengths, *feature_index in loader:
+        optimizer.zero_grad()
+        feature_index = feature_index[0] if feature_index else None
+        loss = criterion(*decoder.forward_packed(features, captions, lengths, feature_index))
+        loss.backward()
+        optimizer.step()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=128, help="légendes par batch")
+    parser.add_argument("--vocab-size", type=int, default=8000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        captions_dict, tokenizer = make_synthetic(tmp, args.images, args.vocab_size)
+        corpus = load_or_build_corpus(tmp / "aligned_captions.json", tokenizer, tmp / "caption_corpus.npz")
+
+        pairs = [(image_id, idx) for image_id in captions_dict for idx in corpus.caption_indices(image_id)]
+        groups = [(image_id, list(corpus.caption_indices(image_id))) for image_id in captions_dict]
+        flat = ImageCaptionDataset(pairs, None, tokenizer, feature_store=tmp / "store", corpus=corpus)
+        grouped = ImageCaptionGroupDataset(groups, None, tokenizer, feature_store=tmp / "store", corpus=corpus)
+
+        torch.manual_seed(0)
+        decoder = DecoderWithAttention(attention_dim=256, embed_dim=256, decoder_dim=512, vocab_size=tokenizer.vocab_size)
+        criterion = nn.CrossEntropyLoss(ignore_index=tokenizer.pad_token_id)
+
+        # ✅ Équivalence : les mêmes légendes, features dupliquées ou indexées
+        decoder.eval()
+        with torch.no_grad():
+            features, captions, lengths, feature_index = get_grouped_collate_fn(tokenizer)([grouped[i] for i in range(4)])
+            expected = decoder(features[feature_index], captions, lengths)
+            actual = decoder(features, captions, lengths, feature_index)
+        print(f"✅ forward équivalent : {torch.allclose(expected, actual, atol=1e-5)} "
+              f"(écart max {(expected - actual).abs().max().item():.2e})")
+
+        # ⏱️ Epoch : même nombre de légendes par batch des deux côtés
+        flat_loader = DataLoader(flat, batch_size=args.batch_size, shuffle=True, collate_fn=get_collate_fn(tokenizer))
+        grouped_loader = DataLoader(
+            grouped, batch_size=args.batch_size // CAPTIONS_PER_IMAGE, shuffle=True,
+            collate_fn=get_grouped_collate_fn(tokenizer)
+        )
+        flat_time = run_epoch(decoder, flat_loader, criterion)
+        grouped_time = run_epoch(decoder, grouped_loader, criterion)
+        print(f"⏱️ epoch ({len(pairs)} légendes, {len(groups)} images) : "
+              f"paires {flat_time:.2f}s → groupé par image {grouped_time:.2f}s (x{flat_time / grouped_time:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Temps des requêtes de lecture sur une grosse base synthétique, avant et après la
+migration des index (cf. api_src/database/migrations.py) :
+- recherche d'un utilisateur par nom (connexion) ;
+- historique d'un utilisateur : première page, page profonde par clé (`before`)
+  et même page par OFFSET ;
+- statistiques des feedbacks par jour et par modèle sur 30 jours ;
+- nombre de prédictions ayant reçu un feedback.
+
+    python scripts/benchmark_history_queries.py --predictions 1000000 --users 1000
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "services" / "api"))
+
+from api_src.database.database import ConnectionPool, Database
+from api_src.repositories.prediction_repository import PredictionRepository
+
+INDEX_MIGRATION = 2
+
+
+def populate(db: Database, users: int, predictions: int, days: int):
+    rng = random.Random(0)
+    end = datetime(2025, 6, 30)
+    with db.transaction():
+        db.cursor.executemany(
+            "INSERT INTO User (id_user, nom_user, mdp_user, date_creation) VALUES (?, ?, 'x', '2025-01-01 00:00:00')",
+            ((i, f"user{i}") for i in range(1, users + 1))
+        )
+    chunk = 100_000
+    versions = ["v1", "v2"]
+    for offset in range(0, predictions, chunk):
+        ids = range(offset + 1, min(offset + chunk, predictions) + 1)
+        # Dates croissantes avec les identifiants, comme en production
+        dates = [
+            (end - timedelta(seconds=(predictions - i) * days * 86400 // predictions)).strftime("%Y-%m-%d %H:%M:%S")
+            for i in ids
+        ]
+        with db.transaction():
+            db.cursor.executemany(
+                "INSERT INTO Image (id_image, nom_fichier, date_fichier, id_user) VALUES (?, ?, ?, ?)",
+                ((i, f"{i}.jpg", date, rng.randint(1, users)) for i, date in zip(ids, dates))
+            )
+            db.cursor.executemany(
+                "INSERT INTO Prediction (id_pred, resultat_pred, confiance_pred, monitor_pred, date_pred, id_image, model_version) "
+                "VALUES (?, 'a dog on the grass', ?, ?, ?, ?, ?)",
+                (
+                    (i, round(rng.random(), 4), rng.choice((0, 0, 0, 1, 2, 3, 4)), date, i,
+                     versions[0] if i < predictions // 2 else versions[1])
+                    for i, date in zip(ids, dates)
+                )
+            )
+
+
+def timed(fn, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def run_queries(db: Database, users: int, repeat: int, page_size: int, deep_page: int) -> dict:
+    repository = PredictionRepository(db)
+    user_id = users // 2
+    cursor = db.cursor
+
+    # Page profonde : id_image de départ obtenu en suivant les pages, puis comparé à OFFSET
+    before = None
+    for _ in range(deep_page):
+        page = repository.get_history(user_id, before, page_size)
+        if len(page) < page_size:
+            break
+        before = page[-1]["id_image"]
+
+    def offset_page():
+        cursor.execute(
+            """
+            SELECT i.id_image FROM Image i JOIN Prediction p ON p.id_image = i.id_image
+            WHERE i.id_user = ? ORDER BY i.id_image DESC LIMIT ? OFFSET ?
+            """,
+            (user_id, page_size, deep_page * page_size)
+        )
+        cursor.fetchall()
+
+    def login():
+        cursor.execute("SELECT mdp_user FROM User WHERE nom_user = ?", (f"user{user_id}",))
+        cursor.fetchone()
+
+    def feedbacks():
+        cursor.execute("SELECT COUNT(*) FROM Prediction WHERE monitor_pred > 0")
+        cursor.fetchone()
+
+    return {
+        "connexion (nom_user)": timed(login, repeat),
+        "historique, page 1": timed(lambda: repository.get_history(user_id, None, page_size), repeat),
+        f"historique, page {deep_page + 1} (before)": timed(lambda: repository.get_history(user_id, before, page_size), repeat),
+        f"historique, page {deep_page + 1} (OFFSET)": timed(offset_page, repeat),
+        "statistiques 30 jours": timed(lambda: repository.get_feedback_stats("2025-06-01", "2025-07-01"), repeat),
+        "nombre de feedbacks": timed(feedbacks, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--predictions", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365, help="période couverte par les prédictions")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--deep-page", type=int, default=10, help="nombre de pages suivies avant la page mesurée")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(str(Path(tmp) / "history.db"))
+        db = Database(pool)
+        db.create_tables(migrate=False)
+        db.migrate(target_version=INDEX_MIGRATION - 1)
+
+        start = time.perf_counter()
+        populate(db, args.users, args.predictions, args.days)
+        print(f"🗄️ {args.predictions} prédictions, {args.users} utilisateurs générés en {time.perf_counter() - start:.1f}s")
+
+        before = run_queries(db, args.users, args.repeat, args.page_size, args.deep_page)
+
+        start = time.perf_counter()
+        db.migrate()
+        print(f"🔧 migration des index (version {db.schema_version()}) : {time.perf_counter() - start:.1f}s")
+        db.cursor.execute("ANALYZE;")
+
+        after = run_queries(db, args.users, args.repeat, args.page_size, args.deep_page)
+        pool.close()
+
+    for name in before:
+        print(f"⏱️ {name:<32} {before[name]:9.3f}ms → {after[name]:9.3f}ms (x{before[name] / after[name]:.0f})")
+
+
+if __name__ == "__main__":
+    main()
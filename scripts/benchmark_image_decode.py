@@ -0,0 +1,95 @@
+"""
+Décodage des images reçues par l'API : décodage pleine résolution (Image.open + convert)
+contre ImageDecoder (JPEG draft, réduction entière), sur un mélange de JPEG/PNG de grande taille.
+Le resize final 224x224 de l'encodeur est inclus des deux côtés.
+
+    python scripts/benchmark_image_decode.py --repeat 5
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "services" / "api"))
+
+from api_src.inference.image_decoder import ImageDecoder
+from src.model.encoder import Encoder
+
+INPUTS = [
+    ("JPEG", (4000, 3000)),  # photo de téléphone 12 Mpx
+    ("JPEG", (6000, 4000)),  # 24 Mpx
+    ("JPEG", (1024, 768)),
+    ("PNG", (3000, 2000)),
+    ("PNG", (320, 240)),
+]
+
+
+def make_image(fmt: str, size: tuple[int, int]) -> bytes:
+    """Dégradés + bruit : se compresse comme une photo plutôt que comme un aplat"""
+    width, height = size
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    pixels = np.stack([x + 0 * y, y + 0 * x, (x + y) / 2], axis=2)
+    pixels += rng.normal(0, 12, pixels.shape).astype(np.float32)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels.clip(0, 255).astype(np.uint8)).save(buffer, format=fmt, quality=90)
+    return buffer.getvalue()
+
+
+def full_decode(image_bytes: bytes) -> Image.Image:
+    """Ancien chemin : bitmap pleine résolution"""
+    return Image.open(io.BytesIO(image_bytes)).convert("RGB")
+
+
+def timed(fn, image_bytes, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        image = fn(image_bytes)
+        tensor = Encoder.image_to_tensor(image)
+        best = min(best, time.perf_counter() - start)
+    return best, image, tensor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    decoder = ImageDecoder()
+    total_old = total_new = 0.0
+    for fmt, size in INPUTS:
+        image_bytes = make_image(fmt, size)
+        old, old_image, old_tensor = timed(full_decode, image_bytes, args.repeat)
+        new, new_image, new_tensor = timed(decoder.decode, image_bytes, args.repeat)
+        total_old += old
+        total_new += new
+
+        diff = (old_tensor.float() - new_tensor.float()).abs().mean().item()
+        print(f"🖼️ {fmt:<4} {size[0]}x{size[1]} ({len(image_bytes) / 2**20:.1f} Mo) : "
+              f"{old * 1000:7.1f}ms → {new * 1000:6.1f}ms (x{old / new:5.1f}) | "
+              f"bitmap {old_image.size[0]}x{old_image.size[1]} → {new_image.size[0]}x{new_image.size[1]} | "
+              f"écart moyen 224px {diff:.2f}/255")
+
+    print(f"⏱️ total : {total_old * 1000:.1f}ms → {total_new * 1000:.1f}ms (x{total_old / total_new:.1f})")
+
+    # 🚫 Rejet avant décodage
+    limited = ImageDecoder(max_pixels=20_000_000)
+    image_bytes = make_image("JPEG", (6000, 4000))
+    start = time.perf_counter()
+    try:
+        limited.decode(image_bytes)
+    except ValueError as e:
+        print(f"🚫 rejet en {(time.perf_counter() - start) * 1000:.2f}ms : {e}")
+    print(f"📊 {decoder.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Instrumentation (src/monitoring/metrics.py) :
+- coût d'un Counter.inc / Histogram.observe, avec 1 et plusieurs threads ;
+- coût du rendu de GET /metrics ;
+- répartition du temps par étape sur de vraies prédictions (décodage d'image,
+  encodeur, boucle de décodage, par token), lue dans les histogrammes eux-mêmes.
+
+    python scripts/benchmark_metrics.py --images 32 --batch-size 8
+"""
+import argparse
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "services" / "api"))
+
+from src.monitoring.metrics import MetricsRegistry, registry
+
+
+def per_call_ns(fn, calls: int, threads: int) -> float:
+    def worker():
+        for _ in range(calls):
+            fn()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return (time.perf_counter() - start) / (calls * threads) * 1e9
+
+
+def make_images(count: int, size=(640, 480)) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        buffer = io.BytesIO()
+        pixels = rng.integers(0, 256, (size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+        Image.fromarray(pixels).resize(size).save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+def mean_ms(name: str, **labels) -> float | None:
+    snapshot = registry._metrics[name].snapshot(**labels)
+    return snapshot["sum"] / snapshot["count"] * 1000 if snapshot["count"] else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000, help="appels par thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--images", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    # 1️⃣ Coût unitaire (registre isolé)
+    local = MetricsRegistry()
+    requests = local.counter("bench_requests_total", "bench", ["route", "status"])
+    latency = local.histogram("bench_seconds", "bench", ["route"])
+    for threads in args.threads:
+        inc = per_call_ns(lambda: requests.inc(route="/upload_image", status=200), args.calls, threads)
+        observe = per_call_ns(lambda: latency.observe(0.0123, route="/upload_image"), args.calls, threads)
+        print(f"🧵 {threads} thread(s) : Counter.inc {inc:.0f}ns | Histogram.observe {observe:.0f}ns")
+
+    for route in range(30):
+        for status in (200, 400, 413):
+            requests.inc(route=f"/route{route}", status=status)
+        latency.observe(0.01, route=f"/route{route}")
+    start = time.perf_counter()
+    text = local.render()
+    print(f"📄 rendu de {len(text.splitlines())} lignes : {(time.perf_counter() - start) * 1000:.2f}ms")
+
+    # 2️⃣ Répartition par étape sur de vraies prédictions
+    from api_src.inference.model_registry import get_default_pipeline
+    pipeline = get_default_pipeline(warmup=True)
+    images = make_images(args.images)
+    start = time.perf_counter()
+    for offset in range(0, len(images), args.batch_size):
+        decoded = [pipeline.preprocess(image) for image in images[offset:offset + args.batch_size]]
+        pipeline.predict_batch(decoded)
+    elapsed = time.perf_counter() - start
+
+    batches = -(-args.images // args.batch_size)
+    print(f"🧠 {args.images} images en {batches} lots de {args.batch_size} : {elapsed * 1000 / args.images:.1f}ms par image")
+    print(f"   décodage d'image {mean_ms('image_decode_seconds'):.2f}ms/image | "
+          f"encodeur {mean_ms('caption_encoder_seconds'):.1f}ms/lot | "
+          f"boucle de décodage {mean_ms('caption_decode_seconds', strategy='greedy'):.1f}ms/lot, "
+          f"{mean_ms('caption_decode_token_seconds', strategy='greedy'):.2f}ms/token")
+
+
+if __name__ == "__main__":
+    main()
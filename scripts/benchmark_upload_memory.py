@@ -0,0 +1,95 @@
+"""
+Lecture des uploads par l'API : `await file.read()` (fichier entier en mémoire) contre
+UploadReader (lecture par morceaux, arrêt dès qu'une limite est dépassée).
+Mesure le pic mémoire Python (tracemalloc) et le temps par requête, pour un fichier valide,
+un fichier trop lourd, une image trop grande en pixels et un fichier qui n'est pas une image.
+
+    python scripts/benchmark_upload_memory.py --max-mb 20 --huge-mb 100
+"""
+import argparse
+import asyncio
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from PIL import Image
+from starlette.datastructures import UploadFile
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "services" / "api"))
+
+from api_src.services.upload_reader import UploadReader
+
+
+def make_jpeg(size: tuple[int, int]) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (120, 80, 40)).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def make_upload(content: bytes) -> UploadFile:
+    """Comme Starlette : corps multipart déjà reçu dans un SpooledTemporaryFile (sur disque au-delà de 1 Mo)"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(content)
+    spooled.seek(0)
+    return UploadFile(spooled, size=None, filename="upload.jpg")
+
+
+async def read_whole(file: UploadFile) -> bytes:
+    """Ancien chemin : tout le fichier en mémoire, quelle que soit sa taille"""
+    return await file.read()
+
+
+async def measure(read_fn, content: bytes):
+    """Pic mesuré dans la boucle : le démontage d'asyncio.run fausserait tracemalloc"""
+    file = make_upload(content)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        await read_fn(file)
+        outcome = "accepté"
+    except Exception as e:
+        outcome = f"rejeté ({type(e).__name__})"
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await file.close()
+    return elapsed, peak, outcome
+
+
+async def run(reader: UploadReader, cases):
+    for name, content in cases:
+        old_time, old_peak, old_outcome = await measure(read_whole, content)
+        new_time, new_peak, new_outcome = await measure(reader.read, content)
+        print(f"📥 {name:<18} ({len(content) / 2**20:6.1f} Mo) : "
+              f"pic {old_peak / 2**20:6.1f} Mo → {new_peak / 2**20:6.2f} Mo | "
+              f"{old_time * 1000:6.1f}ms → {new_time * 1000:6.1f}ms | "
+              f"{old_outcome} → {new_outcome}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-mb", type=int, default=20, help="limite UPLOAD_MAX_BYTES (Mo)")
+    parser.add_argument("--huge-mb", type=int, default=100, help="taille du fichier trop lourd (Mo)")
+    args = parser.parse_args()
+
+    reader = UploadReader(max_bytes=args.max_mb * 2**20, max_pixels=50_000_000)
+    jpeg = make_jpeg((1024, 768))
+    padded = lambda size: jpeg + b"\0" * (size - len(jpeg))  # JPEG valide complété (données après EOI)
+    cases = [
+        ("valide ~10 Mo", padded(10 * 2**20)),
+        (f"trop lourd {args.huge_mb} Mo", padded(args.huge_mb * 2**20)),
+        ("9000x7000 px", make_jpeg((9000, 7000))),
+        ("pas une image", b"%PDF-1.4" + b"\0" * (5 * 2**20)),
+    ]
+
+    asyncio.run(run(reader, cases))
+    print(f"📊 {reader.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Coût de l'enregistrement d'une prédiction pour la requête /upload_image :
+- synchrone : ImageRepository.save_prediction (une transaction et un commit par prédiction) ;
+- écriture différée : PredictionWriter.save_prediction (identifiants réservés par blocs,
+  ligne mise en file, écrite par lots en arrière-plan).
+
+Latence vue par l'appelant, débit avec plusieurs threads, retard de la file
+(mise en file → écriture) et vérification que toutes les lignes sont en base après stop().
+
+    python scripts/benchmark_write_behind.py --threads 1 8 --writes 500 --synchronous NORMAL FULL
+"""
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "services" / "api"))
+
+from api_src.database.database import ConnectionPool, Database
+from api_src.repositories.image_repository import ImageRepository
+from api_src.services.prediction_writer import PredictionWriter
+
+
+def run(save, threads: int, writes: int) -> dict:
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(offset: int):
+        local_latencies = []
+        for i in range(writes):
+            start = time.perf_counter()
+            save(offset + i)
+            local_latencies.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local_latencies)
+
+    workers = [threading.Thread(target=worker, args=(t * writes,)) for t in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "per_s": threads * writes / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def create_database(path: str, synchronous: str) -> tuple[ConnectionPool, int]:
+    pool = ConnectionPool(path, synchronous=synchronous)
+    db = Database(pool)
+    db.create_tables()
+    return pool, db.add_user("benchmark", "x")
+
+
+def count_predictions(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM Prediction JOIN Image USING (id_image)").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--writes", type=int, default=500, help="prédictions par thread")
+    parser.add_argument("--synchronous", nargs="+", default=["NORMAL", "FULL"], choices=["NORMAL", "FULL"])
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for synchronous in args.synchronous:
+            for threads in args.threads:
+                expected = threads * args.writes
+
+                # 1️⃣ Écriture synchrone
+                sync_path = str(Path(tmp) / f"{synchronous}_{threads}_sync.db")
+                pool, user_id = create_database(sync_path, synchronous)
+                repository = ImageRepository(Database(pool))
+                sync = run(
+                    lambda i: repository.save_prediction(user_id, f"{i}.jpg", "a dog on the grass", [0.42], 0),
+                    threads, args.writes
+                )
+                pool.close()
+
+                # 2️⃣ Écriture différée
+                behind_path = str(Path(tmp) / f"{synchronous}_{threads}_behind.db")
+                pool, user_id = create_database(behind_path, synchronous)
+                writer = PredictionWriter(
+                    ImageRepository(Database(pool)),
+                    max_batch_size=args.max_batch,
+                    max_delay_ms=args.max_delay_ms
+                )
+                writer.start()
+                behind = run(
+                    lambda i: writer.save_prediction(user_id, f"{i}.jpg", "a dog on the grass", [0.42], 0),
+                    threads, args.writes
+                )
+                start = time.perf_counter()
+                writer.stop()
+                drain_ms = (time.perf_counter() - start) * 1000
+                stats = writer.stats()
+                pool.close()
+
+                print(f"🧵 {threads} thread(s), synchronous={synchronous} : "
+                      f"{sync['per_s']:7.0f} → {behind['per_s']:7.0f} prédictions/s (x{behind['per_s'] / sync['per_s']:.1f}) | "
+                      f"p50 {sync['p50_ms']:.3f} → {behind['p50_ms']:.3f}ms | "
+                      f"p99 {sync['p99_ms']:.3f} → {behind['p99_ms']:.3f}ms")
+                print(f"   ✍️ lots de {stats['batch_size_mean']} lignes en moyenne, "
+                      f"retard moyen {stats['lag_mean_ms']}ms / max {stats['lag_max_ms']}ms, "
+                      f"vidage à l'arrêt {drain_ms:.1f}ms | "
+                      f"en base : {count_predictions(sync_path)} / {count_predictions(behind_path)} sur {expected}")
+
+
+if __name__ == "__main__":
+    main()
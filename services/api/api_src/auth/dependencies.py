@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from dotenv import load_dotenv
@@ -12,14 +12,21 @@ ALGORITHM = os.getenv("ALGORITHM")
 # scopes={} pour dire qu’il n’y a pas de scopes obligatoires
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", scopes={})
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)):
+    # async : pas de passage par le pool de threads pour un contrôle de quelques microsecondes
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Impossible de valider les informations d'identification",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # ♻️ Token déjà vérifié (cf. TokenCache) : ni décodage ni vérification de signature
+    token_cache = getattr(request.app.state, "token_cache", None)
+    payload = token_cache.get(token) if token_cache is not None else None
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload is None:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            if token_cache is not None:
+                token_cache.put(token, payload)
         username: str = payload.get("sub")
         id_user: int = payload.get("id_user")  
 
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+
+from src.monitoring.metrics import CACHE_LOOKUPS
+
+
+class TokenCache:
+    """
+    Cache des claims de JWT déjà vérifiés, indexé par le token lui-même.
+
+    Seul un token dont la signature a été vérifiée est mis en cache ; une entrée
+    expire au plus tôt entre le `exp` du token et `ttl_s` secondes après sa vérification.
+    LRU borné à `max_size` entrées.
+    """
+
+    def __init__(self, max_size: int = 4096, ttl_s: float = 60.0):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 📊 Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(cache="token", result="miss")
+                return None
+            claims, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[token]
+                self.expired += 1
+                self.misses += 1
+                CACHE_LOOKUPS.inc(cache="token", result="expired")
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            CACHE_LOOKUPS.inc(cache="token", result="hit")
+            return claims
+
+    def put(self, token: str, claims: dict):
+        now = time.time()
+        expires_at = now + self.ttl_s
+        if claims.get("exp") is not None:
+            expires_at = min(expires_at, float(claims["exp"]))
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[token] = (claims, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_size": self.max_size,
+                "ttl_s": self.ttl_s,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
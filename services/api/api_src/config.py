@@ -0,0 +1,78 @@
+from dotenv import load_dotenv
+import os
+
+load_dotenv()  # Charge les variables d'environnement depuis .env
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# 🧠 Modèle de légende (chemins relatifs à la racine du projet)
+DECODER_PATH = os.getenv("DECODER_PATH", "outputs/20250625_115742/decoder.pt")
+TOKENIZER_PATH = os.getenv("TOKENIZER_PATH", "data/vocab/tokenizer.pkl")
+MODEL_DEVICE = os.getenv("MODEL_DEVICE") or None  # None → cuda si disponible, sinon cpu
+MODEL_WARMUP = _get_bool("MODEL_WARMUP", True)
+
+# 🗄️ SQLite (mode WAL, une connexion par thread)
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000))
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL").upper()  # NORMAL (WAL) ou FULL
+
+# ✍️ Écriture différée des prédictions de /upload_image (lots en arrière-plan, flush avant feedback)
+WRITE_BEHIND_ENABLED = _get_bool("WRITE_BEHIND_ENABLED", False)
+WRITE_BEHIND_MAX_BATCH = int(os.getenv("WRITE_BEHIND_MAX_BATCH", 256))
+WRITE_BEHIND_MAX_DELAY_MS = float(os.getenv("WRITE_BEHIND_MAX_DELAY_MS", 50))
+WRITE_BEHIND_ID_BLOCK = int(os.getenv("WRITE_BEHIND_ID_BLOCK", 64))  # identifiants réservés par aller-retour en base
+
+# 📦 Micro-batching des requêtes d'inférence
+BATCHING_ENABLED = _get_bool("BATCHING_ENABLED", True)
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 8))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", 10))
+BATCH_MAX_QUEUE = int(os.getenv("BATCH_MAX_QUEUE", 64))
+
+# 🖼️ Décodage des images reçues : au-delà de IMAGE_MAX_PIXELS → HTTP 413
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 50_000_000))
+
+# 📥 Lecture des uploads par morceaux : au-delà de UPLOAD_MAX_BYTES → HTTP 413
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 20 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", 32))  # /upload_images
+UPLOAD_BATCH_MAX_BYTES = int(os.getenv("UPLOAD_BATCH_MAX_BYTES", 100 * 1024 * 1024))  # total de la requête /upload_images
+UPLOAD_MULTIPART_OVERHEAD = 64 * 1024  # marge du Content-Length pour les en-têtes multipart et champs de formulaire
+
+# 🗂️ Jobs de légendage en masse (traités en arrière-plan, repris après redémarrage)
+JOBS_ENABLED = _get_bool("JOBS_ENABLED", True)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 1))
+JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", BATCH_MAX_SIZE))
+JOB_MAX_FILES = int(os.getenv("JOB_MAX_FILES", 1000))
+JOB_MAX_BYTES = int(os.getenv("JOB_MAX_BYTES", UPLOAD_BATCH_MAX_BYTES))  # total de la requête POST /jobs (gardé en mémoire)
+
+# 🔍 Décodage : BEAM_SIZE = 1 → glouton, > 1 → beam search
+BEAM_SIZE = int(os.getenv("BEAM_SIZE", 1))
+LENGTH_PENALTY = float(os.getenv("LENGTH_PENALTY", 1.0))
+
+# 🧵 Pool de threads dédié à l'inférence (hors boucle asyncio)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", 2))
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", 0)) or None  # None → valeur par défaut de torch
+INFERENCE_MAX_PENDING = int(os.getenv("INFERENCE_MAX_PENDING", 64))  # 0 → file non bornée
+
+# 🔐 Authentification : bcrypt dans un petit pool dédié, claims des JWT vérifiés en cache
+AUTH_WORKERS = int(os.getenv("AUTH_WORKERS", 2))
+AUTH_MAX_PENDING = int(os.getenv("AUTH_MAX_PENDING", 64))  # au-delà → HTTP 503 sur /login
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 4096))  # 0 → cache désactivé
+TOKEN_CACHE_TTL_S = float(os.getenv("TOKEN_CACHE_TTL_S", 60))  # jamais au-delà du `exp` du token
+
+# ♻️ Cache des légendes (clé = hash de l'image + version du modèle + langue)
+CAPTION_CACHE_SIZE = int(os.getenv("CAPTION_CACHE_SIZE", 1024))  # 0 → cache désactivé
+CAPTION_CACHE_PERSISTENT = _get_bool("CAPTION_CACHE_PERSISTENT", True)
+
+# 🇫🇷 Cache des traductions anglais → français
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", 4096))
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH") or None  # fichier JSON, None → mémoire seule
+
+# 💤 Traduction : désactivable par déploiement, chargée au premier appel sauf pré-chauffe
+TRANSLATION_ENABLED = _get_bool("TRANSLATION_ENABLED", True)
+TRANSLATION_WARMUP = _get_bool("TRANSLATION_WARMUP", False)
@@ -1,12 +1,27 @@
-from fastapi import APIRouter, HTTPException, Depends, Response, UploadFile, File, Form
-from typing import Optional
-from api_src.models.image_model import ImagePredictionResponse, FeedbackRequest, LangEnum
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, UploadFile, File, Form
+from typing import List, Optional
+from api_src.models.image_model import (
+    ImagePredictionResponse, BatchImageResult, BatchPredictionResponse, FeedbackRequest, LangEnum
+)
 from api_src.services.image_service import ImageService
+from api_src.services.caption_cache import CaptionCache
+from api_src.services.upload_reader import UploadReader, UploadTooLargeError, UnsupportedMediaTypeError
+from api_src.services.prediction_writer import PredictionWriter
+from api_src.inference.pipeline import InferencePipeline
+from api_src.inference.model_registry import get_default_pipeline
+from api_src.inference.batch_scheduler import BatchScheduler
+from api_src.inference.executor import InferenceExecutor, QueueFullError
+from api_src.inference.image_decoder import ImageTooLargeError
 from api_src.repositories.image_repository import ImageRepository
 from api_src.repositories.user_repository import UserRepository
 from api_src.services.user_service import UserService
 from api_src.database.database import Database
+from src.inference.decoding import mean_confidence
 from api_src.auth.dependencies import get_current_user
+from api_src.config import (
+    TRANSLATION_ENABLED, IMAGE_MAX_PIXELS, UPLOAD_MAX_BYTES, UPLOAD_CHUNK_SIZE,
+    UPLOAD_BATCH_MAX_FILES, UPLOAD_BATCH_MAX_BYTES, BATCH_MAX_SIZE
+)
 
 
 image_router = APIRouter()
@@ -20,8 +35,32 @@ def get_image_repository(db: Database = Depends(get_db)):
 def get_user_repository(db: Database = Depends(get_db)):
     return UserRepository(db)
 
-def get_image_service(image_repo: ImageRepository = Depends(get_image_repository)):
-    return ImageService(image_repo)
+def get_pipeline():
+    return get_default_pipeline()
+
+def get_caption_cache(request: Request) -> CaptionCache | None:
+    return getattr(request.app.state, "caption_cache", None)
+
+def get_prediction_writer(request: Request) -> PredictionWriter | None:
+    return getattr(request.app.state, "prediction_writer", None)
+
+def get_image_service(
+    image_repo: ImageRepository = Depends(get_image_repository),
+    pipeline: InferencePipeline = Depends(get_pipeline),
+    caption_cache: Optional[CaptionCache] = Depends(get_caption_cache),
+    prediction_writer: Optional[PredictionWriter] = Depends(get_prediction_writer)
+):
+    return ImageService(image_repo, pipeline, caption_cache, prediction_writer)
+
+def get_batch_scheduler(request: Request) -> BatchScheduler | None:
+    return getattr(request.app.state, "batch_scheduler", None)
+
+def get_inference_executor(request: Request) -> InferenceExecutor:
+    return request.app.state.inference_executor
+
+def get_upload_reader(request: Request) -> UploadReader:
+    reader = getattr(request.app.state, "upload_reader", None)
+    return reader or UploadReader(max_bytes=UPLOAD_MAX_BYTES, max_pixels=IMAGE_MAX_PIXELS, chunk_size=UPLOAD_CHUNK_SIZE)
 
 def get_user_service(user_repo: UserRepository = Depends(get_user_repository)):
     return UserService(user_repo)
@@ -43,7 +82,10 @@ def get_user_service(user_repo: UserRepository = Depends(get_user_repository)):
         "- **id_prediction** : identifiant de la prédiction associée.\n"
         "- **message** : message de confirmation.\n"
         "- **resultat_pred** : description/textuelle prédite pour l'image.\n"
-        "- **confiance_pred** : confiance (score) de la prédiction."
+        "- **confiance_pred** : confiance (score) de la prédiction.\n\n"
+        "### Erreurs :\n"
+        "- **413** : fichier trop volumineux ou image trop grande (pixels).\n"
+        "- **415** : format non supporté (JPEG, PNG, WEBP ou BMP)."
     ),
     response_description="Informations de l'image et prédiction calculée"
 )
@@ -52,7 +94,10 @@ async def upload_image(
     file: UploadFile = File(..., description="Image à uploader"),
     lang: LangEnum = Form(LangEnum.en),
     current_user: dict = Depends(get_current_user),
-    image_service: ImageService = Depends(get_image_service)
+    image_service: ImageService = Depends(get_image_service),
+    scheduler: Optional[BatchScheduler] = Depends(get_batch_scheduler),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    upload_reader: UploadReader = Depends(get_upload_reader)
 ):
     response.headers["Cache-Control"] = "no-store"
     response.headers["Pragma"] = "no-cache"
@@ -63,16 +108,43 @@ async def upload_image(
         raise HTTPException(status_code=400, detail="Utilisateur introuvable")
 
     nom_fichier = file.filename
-    content = await file.read()
     translate = lang == LangEnum.fr
+    if translate and not TRANSLATION_ENABLED:
+        raise HTTPException(status_code=400, detail="La traduction est désactivée sur ce serveur")
 
-    result = image_service.save_image_and_predict(
-        nom_fichier=nom_fichier,
-        id_user=id_user,
-        file_bytes=content,
-        monitor_pred=0,
-        translate=translate  # ✅ propagation du paramètre
-    )
+    # 📥 Lecture par morceaux : format, pixels et taille vérifiés au fil de l'eau
+    try:
+        content = await upload_reader.read(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedMediaTypeError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    try:
+        if scheduler is not None:
+            result = await image_service.save_image_and_predict_batched(
+                scheduler,
+                executor,
+                nom_fichier=nom_fichier,
+                id_user=id_user,
+                file_bytes=content,
+                monitor_pred=0,
+                translate=translate
+            )
+        else:
+            # 🧵 Inférence dans le pool dédié : la boucle asyncio reste libre (/login, etc.)
+            result = await executor.run(
+                image_service.save_image_and_predict,
+                nom_fichier=nom_fichier,
+                id_user=id_user,
+                file_bytes=content,
+                monitor_pred=0,
+                translate=translate  # ✅ propagation du paramètre
+            )
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
@@ -82,7 +154,101 @@ async def upload_image(
         id_prediction=result["id_prediction"],
         message="Image enregistrée et prédiction calculée",
         resultat_pred=result["resultat_pred"],
-        confiance_pred=round(sum(result["confiance_pred"]) / len(result["confiance_pred"]), 4)
+        confiance_pred=mean_confidence(result["confiance_pred"])
+    )
+
+
+@image_router.post(
+    "/upload_images",
+    response_model=BatchPredictionResponse,
+    summary="Upload de plusieurs images en une requête",
+    description=(
+        "Variante de /upload_image pour les envois en masse : une seule authentification, "
+        "inférence encodeur+décodeur par lots et une seule transaction pour toutes les images.\n\n"
+        "### Paramètres :\n"
+        f"- **files** : fichiers images (multipart/form-data, {UPLOAD_BATCH_MAX_FILES} au maximum).\n"
+        "- **lang** : langue des légendes générées (\"en\" ou \"fr\")\n\n"
+        "### Retourne :\n"
+        "- **resultats** : un résultat par fichier, dans l'ordre d'envoi "
+        "(mêmes champs que /upload_image, ou **success** = false et **message** en cas d'échec "
+        "pour ce fichier : format non supporté, fichier ou image trop grand).\n\n"
+        "### Erreurs :\n"
+        "- **400** : aucun fichier ou trop de fichiers.\n"
+        "- **413** : requête trop volumineuse."
+    ),
+    response_description="Résultat par image"
+)
+async def upload_images(
+    response: Response,
+    files: List[UploadFile] = File(..., description="Images à uploader"),
+    lang: LangEnum = Form(LangEnum.en),
+    current_user: dict = Depends(get_current_user),
+    image_service: ImageService = Depends(get_image_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    upload_reader: UploadReader = Depends(get_upload_reader)
+):
+    response.headers["Cache-Control"] = "no-store"
+
+    id_user = current_user.get("id_user")
+    if id_user is None:
+        raise HTTPException(status_code=400, detail="Utilisateur introuvable")
+    if not files or len(files) > UPLOAD_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Entre 1 et {UPLOAD_BATCH_MAX_FILES} fichiers attendus")
+
+    translate = lang == LangEnum.fr
+    if translate and not TRANSLATION_ENABLED:
+        raise HTTPException(status_code=400, detail="La traduction est désactivée sur ce serveur")
+
+    # 📥 Lecture bornée de chaque fichier : un fichier refusé n'empêche pas les autres,
+    # mais le total gardé en mémoire reste borné par UPLOAD_BATCH_MAX_BYTES
+    readable, rejected = [], {}
+    total_bytes = 0
+    for index, file in enumerate(files):
+        try:
+            content = await upload_reader.read(file)
+        except (UploadTooLargeError, UnsupportedMediaTypeError) as e:
+            rejected[index] = BatchImageResult(nom_fichier=file.filename, success=False, message=str(e))
+            continue
+        total_bytes += len(content)
+        if total_bytes > UPLOAD_BATCH_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="Requête trop volumineuse")
+        readable.append((file.filename, content))
+
+    results = []
+    if readable:
+        try:
+            result = await executor.run(
+                image_service.save_images_and_predict,
+                files=readable,
+                id_user=id_user,
+                monitor_pred=0,
+                translate=translate,
+                max_batch_size=BATCH_MAX_SIZE
+            )
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        if not result["success"]:
+            raise HTTPException(status_code=400, detail=result["message"])
+        results = result["results"]
+
+    # 🔀 Résultats remis dans l'ordre d'envoi
+    processed = iter(results)
+    resultats = []
+    for index in range(len(files)):
+        if index in rejected:
+            resultats.append(rejected[index])
+            continue
+        item = next(processed)
+        if item["success"]:
+            item["confiance_pred"] = mean_confidence(item["confiance_pred"])
+        resultats.append(BatchImageResult(**item))
+
+    nb_succes = sum(item.success for item in resultats)
+    return BatchPredictionResponse(
+        message=f"{nb_succes}/{len(files)} images enregistrées et prédictions calculées",
+        nb_images=len(files),
+        nb_succes=nb_succes,
+        resultats=resultats
     )
 
 
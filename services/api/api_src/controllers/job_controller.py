@@ -0,0 +1,237 @@
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from api_src.models.image_model import LangEnum
+from api_src.models.job_model import JobResponse, JobItemResult, JobItemsResponse, JobStatus
+from api_src.services.job_service import JobService
+from api_src.services.job_worker import JobWorker
+from api_src.services.image_service import ImageService
+from api_src.services.caption_cache import CaptionCache
+from api_src.services.upload_reader import UploadReader, UploadTooLargeError, UnsupportedMediaTypeError
+from api_src.inference.pipeline import InferencePipeline
+from api_src.inference.executor import InferenceExecutor, QueueFullError
+from api_src.repositories.image_repository import ImageRepository
+from api_src.repositories.job_repository import JobRepository
+from api_src.database.database import Database
+from api_src.auth.dependencies import get_current_user
+from api_src.controllers.image_controller import (
+    get_db, get_pipeline, get_caption_cache, get_inference_executor, get_upload_reader
+)
+from api_src.config import TRANSLATION_ENABLED, JOB_MAX_FILES, JOB_MAX_BYTES
+
+
+job_router = APIRouter()
+
+_TERMINAL = {JobStatus.completed.value, JobStatus.cancelled.value, JobStatus.failed.value}
+
+def get_job_service(
+    db: Database = Depends(get_db),
+    pipeline: InferencePipeline = Depends(get_pipeline),
+    caption_cache: Optional[CaptionCache] = Depends(get_caption_cache)
+):
+    return JobService(JobRepository(db), ImageService(ImageRepository(db), pipeline, caption_cache))
+
+def get_job_worker(request: Request) -> JobWorker:
+    worker = getattr(request.app.state, "job_worker", None)
+    if worker is None:
+        raise HTTPException(status_code=503, detail="Les jobs sont désactivés sur ce serveur")
+    return worker
+
+def _job_response(job: dict, worker: JobWorker) -> JobResponse:
+    return JobResponse(**job, **worker.progress(job["id_job"]))
+
+def _get_user_id(current_user: dict) -> int:
+    id_user = current_user.get("id_user")
+    if id_user is None:
+        raise HTTPException(status_code=400, detail="Utilisateur introuvable")
+    return id_user
+
+
+@job_router.post(
+    "/jobs",
+    response_model=JobResponse,
+    status_code=202,
+    summary="Création d'un job de légendage en masse",
+    description=(
+        "Enregistre les images et rend la main immédiatement : le traitement se fait en arrière-plan, "
+        "par lots, et survit à un redémarrage du serveur.\n\n"
+        "### Paramètres :\n"
+        f"- **files** : fichiers images (multipart/form-data, {JOB_MAX_FILES} au maximum).\n"
+        "- **lang** : langue des légendes générées (\"en\" ou \"fr\")\n\n"
+        "### Suivi :\n"
+        "- **GET /jobs/{id_job}** : avancement, débit et temps restant estimé.\n"
+        "- **GET /jobs/{id_job}/events** : même information en flux (Server-Sent Events).\n"
+        "- **GET /jobs/{id_job}/items** : résultat par image.\n"
+        "- **POST /jobs/{id_job}/cancel** : annulation.\n\n"
+        "Un fichier refusé (format, taille) est enregistré en échec sans bloquer les autres.\n\n"
+        "### Erreurs :\n"
+        "- **413** : requête trop volumineuse (taille totale des fichiers)."
+    ),
+    response_description="Job créé (en attente de traitement)"
+)
+async def create_job(
+    files: List[UploadFile] = File(..., description="Images à légender"),
+    lang: LangEnum = Form(LangEnum.en),
+    current_user: dict = Depends(get_current_user),
+    job_service: JobService = Depends(get_job_service),
+    worker: JobWorker = Depends(get_job_worker),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    upload_reader: UploadReader = Depends(get_upload_reader)
+):
+    id_user = _get_user_id(current_user)
+    if not files or len(files) > JOB_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Entre 1 et {JOB_MAX_FILES} fichiers attendus")
+
+    translate = lang == LangEnum.fr
+    if translate and not TRANSLATION_ENABLED:
+        raise HTTPException(status_code=400, detail="La traduction est désactivée sur ce serveur")
+
+    # 📥 Lecture bornée de chaque fichier ; les refus deviennent des items en échec.
+    # Total gardé en mémoire borné par JOB_MAX_BYTES, même sans Content-Length
+    items = []
+    total_bytes = 0
+    for file in files:
+        try:
+            content = await upload_reader.read(file)
+        except (UploadTooLargeError, UnsupportedMediaTypeError) as e:
+            items.append((file.filename, None, str(e)))
+            continue
+        total_bytes += len(content)
+        if total_bytes > JOB_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="Requête trop volumineuse")
+        items.append((file.filename, content, None))
+
+    try:
+        result = await executor.run(job_service.create_job, id_user, translate, items)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+
+    job = result["job"]
+    await worker.submit(job["id_job"])
+    return _job_response(job, worker)
+
+
+@job_router.get(
+    "/jobs",
+    response_model=List[JobResponse],
+    summary="Liste des jobs de l'utilisateur",
+    description="Jobs de l'utilisateur connecté, du plus récent au plus ancien.",
+    response_description="Jobs de l'utilisateur"
+)
+def list_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: dict = Depends(get_current_user),
+    job_service: JobService = Depends(get_job_service),
+    worker: JobWorker = Depends(get_job_worker)
+):
+    return [_job_response(job, worker) for job in job_service.list_jobs(_get_user_id(current_user), limit)]
+
+
+@job_router.get(
+    "/jobs/{id_job}",
+    response_model=JobResponse,
+    summary="Avancement d'un job",
+    description=(
+        "Statut du job et nombre d'items terminés, en échec, annulés et restants.\n"
+        "Pendant le traitement : **debit_items_s** (images/s) et **eta_s** (secondes restantes estimées)."
+    ),
+    response_description="Avancement du job"
+)
+def get_job(
+    id_job: int,
+    current_user: dict = Depends(get_current_user),
+    job_service: JobService = Depends(get_job_service),
+    worker: JobWorker = Depends(get_job_worker)
+):
+    job = job_service.get_job(id_job, _get_user_id(current_user))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job introuvable")
+    return _job_response(job, worker)
+
+
+@job_router.get(
+    "/jobs/{id_job}/items",
+    response_model=JobItemsResponse,
+    summary="Résultats d'un job, image par image",
+    description=(
+        "Items du job par position croissante, avec la légende et la confiance des images traitées.\n"
+        "Pagination : repasser **next_after** dans le paramètre **after** pour la page suivante."
+    ),
+    response_description="Résultats des items"
+)
+def get_job_items(
+    id_job: int,
+    after: int = Query(-1, ge=-1),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user),
+    job_service: JobService = Depends(get_job_service)
+):
+    items = job_service.get_items(id_job, _get_user_id(current_user), after, limit)
+    if items is None:
+        raise HTTPException(status_code=404, detail="Job introuvable")
+    return JobItemsResponse(
+        id_job=id_job,
+        items=[JobItemResult(**item) for item in items],
+        next_after=items[-1]["position"] if len(items) == limit else None
+    )
+
+
+@job_router.post(
+    "/jobs/{id_job}/cancel",
+    response_model=JobResponse,
+    summary="Annulation d'un job",
+    description=(
+        "Les items pas encore traités sont abandonnés ; le lot en cours de traitement n'est pas enregistré.\n"
+        "Retourne 409 si le job est déjà terminé."
+    ),
+    response_description="Job annulé"
+)
+def cancel_job(
+    id_job: int,
+    current_user: dict = Depends(get_current_user),
+    job_service: JobService = Depends(get_job_service),
+    worker: JobWorker = Depends(get_job_worker)
+):
+    id_user = _get_user_id(current_user)
+    if job_service.get_job(id_job, id_user) is None:
+        raise HTTPException(status_code=404, detail="Job introuvable")
+    if not job_service.cancel_job(id_job):
+        raise HTTPException(status_code=409, detail="Job déjà terminé")
+    return _job_response(job_service.get_job(id_job, id_user), worker)
+
+
+@job_router.get(
+    "/jobs/{id_job}/events",
+    summary="Suivi d'un job en flux (Server-Sent Events)",
+    description=(
+        "Envoie l'avancement du job (même contenu que GET /jobs/{id_job}) toutes les **interval** secondes, "
+        "jusqu'à ce qu'il soit terminé, annulé ou en échec."
+    ),
+    response_description="Flux text/event-stream"
+)
+async def stream_job_events(
+    id_job: int,
+    interval: float = Query(1.0, ge=0.1, le=30),
+    current_user: dict = Depends(get_current_user),
+    job_service: JobService = Depends(get_job_service),
+    worker: JobWorker = Depends(get_job_worker)
+):
+    id_user = _get_user_id(current_user)
+    if await run_in_threadpool(job_service.get_job, id_job, id_user) is None:
+        raise HTTPException(status_code=404, detail="Job introuvable")
+
+    async def events():
+        while True:
+            job = await run_in_threadpool(job_service.get_job, id_job, id_user)
+            payload = _job_response(job, worker).model_dump(mode="json")
+            yield f"event: progress\ndata: {json.dumps(payload)}\n\n"
+            if job["statut"] in _TERMINAL:
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-store"})
@@ -0,0 +1,182 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from api_src.inference.model_registry import model_registry, get_default_pipeline
+from api_src.database.database import get_pool
+from api_src.config import TRANSLATION_ENABLED
+from src.translation.translator import get_translation_cache, is_translation_loaded
+from src.monitoring.metrics import registry
+
+
+monitoring_router = APIRouter()
+
+
+@monitoring_router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Métriques au format Prometheus",
+    description=(
+        "Histogrammes des durées par étape (décodage d'image, encodeur, boucle de décodage "
+        "par lot et par token, traduction, écritures SQLite, prédiction de bout en bout, requêtes HTTP) "
+        "et compteurs (requêtes par route et statut, erreurs, caches, chargements de modèles).\n"
+        "Format texte d'exposition Prometheus 0.0.4, à collecter par un scraper."
+    ),
+    response_description="Métriques au format texte Prometheus"
+)
+def get_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@monitoring_router.get(
+    "/monitoring/models",
+    summary="Modèles chargés en mémoire",
+    description=(
+        "Liste les pipelines d'inférence chargés par le processus, avec pour chacun :\n"
+        "- **load_time_s** / **warmup_time_s** : temps de chargement et de pré-chauffe\n"
+        "- **encoder_bytes** / **decoder_bytes** : taille des poids en mémoire\n"
+        "- **rss_delta_bytes** : augmentation de la mémoire du processus pendant le chargement\n\n"
+        "Indique aussi si le modèle de traduction est activé et déjà chargé (chargement paresseux)."
+    ),
+    response_description="Statistiques de chargement des modèles"
+)
+def get_models():
+    return {
+        "models": model_registry.stats(),
+        "translation": {"enabled": TRANSLATION_ENABLED, "loaded": is_translation_loaded()}
+    }
+
+
+@monitoring_router.get(
+    "/monitoring/pipeline",
+    summary="Temps de décodage d'image et temps modèle",
+    description=(
+        "Statistiques du pipeline d'inférence de l'API, en séparant :\n"
+        "- **decode** : décodage des images reçues (décodage JPEG réduit, réductions, rejets 413)\n"
+        "- **model** : encodeur + décodeur (+ traduction) par appel et par image"
+    ),
+    response_description="Statistiques du pipeline d'inférence"
+)
+def get_pipeline_stats():
+    return get_default_pipeline().stats()
+
+
+@monitoring_router.get(
+    "/monitoring/uploads",
+    summary="Statistiques de lecture des uploads",
+    description=(
+        "Fichiers acceptés, rejets (413 taille / pixels, 415 format), taille moyenne "
+        "et plus gros buffer tenu en mémoire par une requête, temps de lecture."
+    ),
+    response_description="Statistiques de lecture des uploads"
+)
+def get_upload_stats(request: Request):
+    reader = getattr(request.app.state, "upload_reader", None)
+    if reader is None:
+        return {"enabled": False}
+    return {"enabled": True, **reader.stats()}
+
+
+@monitoring_router.get(
+    "/monitoring/batching",
+    summary="Statistiques du micro-batching",
+    description=(
+        "Taille réalisée des lots (moyenne et histogramme), profondeur de la file, "
+        "latence d'attente dans la file et nombre de requêtes rejetées (503)."
+    ),
+    response_description="Statistiques de la file de micro-batching"
+)
+def get_batching_stats(request: Request):
+    scheduler = getattr(request.app.state, "batch_scheduler", None)
+    if scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **scheduler.stats()}
+
+
+@monitoring_router.get(
+    "/monitoring/jobs",
+    summary="Statistiques des jobs en arrière-plan",
+    description=(
+        "Jobs en file et en cours, jobs terminés / annulés / en échec depuis le démarrage, "
+        "images traitées et débit (images par seconde de traitement)."
+    ),
+    response_description="Statistiques du traitement des jobs"
+)
+def get_job_stats(request: Request):
+    worker = getattr(request.app.state, "job_worker", None)
+    if worker is None:
+        return {"enabled": False}
+    return {"enabled": True, **worker.stats()}
+
+
+@monitoring_router.get(
+    "/monitoring/database",
+    summary="Statistiques des connexions SQLite",
+    description=(
+        "Mode de journalisation (WAL attendu), connexions ouvertes (une par thread), "
+        "transactions validées et annulées."
+    ),
+    response_description="Statistiques du pool de connexions"
+)
+def get_database_stats():
+    return get_pool().stats()
+
+
+@monitoring_router.get(
+    "/monitoring/writer",
+    summary="Statistiques de l'écriture différée des prédictions",
+    description=(
+        "Profondeur de la file, lignes écrites et perdues, taille moyenne des lots, "
+        "retard actuel de la file et retard moyen / maximal entre mise en file et écriture."
+    ),
+    response_description="Statistiques de l'écriture différée"
+)
+def get_writer_stats(request: Request):
+    writer = getattr(request.app.state, "prediction_writer", None)
+    if writer is None:
+        return {"enabled": False}
+    return {"enabled": True, **writer.stats()}
+
+
+@monitoring_router.get(
+    "/monitoring/auth",
+    summary="Statistiques de l'authentification",
+    description=(
+        "Pool dédié aux vérifications bcrypt de /login (file, attente, durée) "
+        "et cache des tokens JWT vérifiés (taille, hits, expirations)."
+    ),
+    response_description="Statistiques de l'authentification"
+)
+def get_auth_stats(request: Request):
+    token_cache = getattr(request.app.state, "token_cache", None)
+    return {
+        "executor": request.app.state.auth_executor.stats(),
+        "token_cache": token_cache.stats() if token_cache is not None else {"enabled": False},
+    }
+
+
+@monitoring_router.get(
+    "/monitoring/executor",
+    summary="Statistiques du pool d'inférence",
+    description=(
+        "Profondeur de la file d'attente, tâches en cours, temps d'attente "
+        "et d'exécution dans le pool de threads dédié à l'inférence."
+    ),
+    response_description="Statistiques du pool d'inférence"
+)
+def get_executor_stats(request: Request):
+    return request.app.state.inference_executor.stats()
+
+
+@monitoring_router.get(
+    "/monitoring/cache",
+    summary="Statistiques du cache des légendes",
+    description=(
+        "Taille du cache, hits en mémoire, hits sur le niveau persistant (SQLite), "
+        "misses et évictions LRU.\n"
+        "- **translation** : taille et hits/misses du cache des traductions anglais → français."
+    ),
+    response_description="Statistiques du cache des légendes"
+)
+def get_cache_stats(request: Request):
+    cache = getattr(request.app.state, "caption_cache", None)
+    stats = {"enabled": False} if cache is None else {"enabled": True, **cache.stats()}
+    return {**stats, "translation": get_translation_cache().stats()}
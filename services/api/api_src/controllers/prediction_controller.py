@@ -0,0 +1,78 @@
+from datetime import date
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+from api_src.models.prediction_model import (
+    PredictionHistoryItem, PredictionHistoryResponse, FeedbackStatsRow, FeedbackStatsResponse
+)
+from api_src.services.prediction_service import PredictionService
+from api_src.services.prediction_writer import PredictionWriter
+from api_src.repositories.prediction_repository import PredictionRepository
+from api_src.database.database import Database
+from api_src.auth.dependencies import get_current_user
+from api_src.controllers.image_controller import get_db, get_prediction_writer
+
+
+prediction_router = APIRouter()
+
+def get_prediction_service(
+    db: Database = Depends(get_db),
+    prediction_writer: Optional[PredictionWriter] = Depends(get_prediction_writer)
+):
+    return PredictionService(PredictionRepository(db), prediction_writer)
+
+
+@prediction_router.get(
+    "/predictions",
+    response_model=PredictionHistoryResponse,
+    summary="Historique des prédictions de l'utilisateur",
+    description=(
+        "Images envoyées par l'utilisateur connecté et leurs prédictions, de la plus récente à la plus ancienne, "
+        "avec le feedback donné (`monitor_pred`, 0 si aucun) et la version du modèle.\n"
+        "Pagination : repasser **next_before** dans le paramètre **before** pour la page suivante."
+    ),
+    response_description="Page de l'historique"
+)
+def get_prediction_history(
+    before: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: dict = Depends(get_current_user),
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    id_user = current_user.get("id_user")
+    if id_user is None:
+        raise HTTPException(status_code=400, detail="Utilisateur introuvable")
+
+    items = prediction_service.get_history(id_user, before, limit)
+    return PredictionHistoryResponse(
+        items=[PredictionHistoryItem(**item) for item in items],
+        next_before=items[-1]["id_image"] if len(items) == limit else None
+    )
+
+
+@prediction_router.get(
+    "/predictions/stats",
+    response_model=FeedbackStatsResponse,
+    summary="Statistiques des feedbacks par jour et par modèle",
+    description=(
+        "Pour chaque jour et chaque version du modèle (toutes prédictions confondues) : nombre de prédictions, "
+        "nombre de feedbacks, note moyenne (feedbacks uniquement) et confiance moyenne.\n"
+        "Période : **date_debut** et **date_fin** incluses (30 derniers jours par défaut, 366 jours au plus), "
+        "filtre optionnel sur **model_version**."
+    ),
+    response_description="Statistiques par jour et par version du modèle"
+)
+def get_feedback_stats(
+    date_debut: Optional[date] = Query(None),
+    date_fin: Optional[date] = Query(None),
+    model_version: Optional[str] = Query(None, max_length=64),
+    current_user: dict = Depends(get_current_user),
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    result = prediction_service.get_feedback_stats(date_debut, date_fin, model_version)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    return FeedbackStatsResponse(
+        date_debut=result["date_debut"],
+        date_fin=result["date_fin"],
+        stats=[FeedbackStatsRow(**row) for row in result["stats"]]
+    )
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from api_src.models.user_model import UserLoginResponse
 from api_src.services.user_service import UserService
 from api_src.repositories.user_repository import UserRepository
 from api_src.database.database import Database
+from api_src.services.bounded_executor import BoundedExecutor, QueueFullError
 
 user_router = APIRouter()
 
@@ -12,6 +13,9 @@ def get_user_service():
     user_repository = UserRepository(db)
     return UserService(user_repository)
 
+def get_auth_executor(request: Request) -> BoundedExecutor:
+    return request.app.state.auth_executor
+
 @user_router.post(
     "/login",
     response_model=UserLoginResponse,
@@ -31,9 +35,10 @@ def get_user_service():
     ),
     response_description="Token JWT d'accès et message de confirmation"
 )
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(), 
-    user_service: UserService = Depends(get_user_service)
+    user_service: UserService = Depends(get_user_service),
+    auth_executor: BoundedExecutor = Depends(get_auth_executor)
 ):
     """
     Authentifie un utilisateur avec son username et mot de passe.
@@ -45,7 +50,12 @@ def login(
     """
     nom_user = form_data.username
     mdp_user = form_data.password
-    result = user_service.authenticate(nom_user, mdp_user)
+    # 🔐 bcrypt dans un pool dédié et borné : une rafale de connexions n'occupe pas
+    # les threads partagés par les autres endpoints (ni la boucle asyncio)
+    try:
+        result = await auth_executor.run(user_service.authenticate, nom_user, mdp_user)
+    except QueueFullError:
+        raise HTTPException(status_code=503, detail="Trop de connexions en cours, réessayez plus tard")
     
     if result.success:
         return UserLoginResponse(
@@ -1,27 +1,176 @@
 import sqlite3
+import threading
 import pytz
+from contextlib import contextmanager
 from datetime import datetime
 import os
 
+from api_src.database.migrations import MIGRATIONS
+
 DB_FILE = os.path.join(os.path.dirname(__file__), 'database.db')
 
+
+class ConnectionPool:
+    """
+    Une connexion SQLite par thread (threads de FastAPI et de l'executor d'inférence),
+    ouverte au premier usage puis réutilisée, en mode WAL : les lectures ne bloquent
+    plus les écritures et un commit ne force plus qu'un seul fsync au checkpoint.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000, synchronous: str = "NORMAL", cache_size_kb: int = 16384):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.synchronous = synchronous
+        self.cache_size_kb = cache_size_kb
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+        self.journal_mode = None
+
+        # 📊 Métriques
+        self._opened = 0
+        self._commits = 0
+        self._rollbacks = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
+        self.journal_mode = conn.execute("PRAGMA journal_mode = WAL;").fetchone()[0]
+        conn.execute(f"PRAGMA synchronous = {self.synchronous};")  # NORMAL : sûr en WAL, un fsync par checkpoint
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms};")
+        conn.execute(f"PRAGMA cache_size = -{self.cache_size_kb};")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        with self._lock:
+            self._connections.append(conn)
+            self._opened += 1
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.cursor = conn.cursor()
+            self._local.depth = 0
+        return conn
+
+    def cursor(self) -> sqlite3.Cursor:
+        self.connection()
+        return self._local.cursor
+
+    @contextmanager
+    def transaction(self, immediate: bool = True):
+        """
+        Transaction explicite sur la connexion du thread : commit à la sortie, rollback sur exception.
+        Réentrante : un bloc imbriqué fait partie de la transaction englobante.
+        immediate=True : verrou d'écriture pris dès le BEGIN (pas d'échec « database is locked » en cours de route).
+        """
+        conn = self.connection()
+        local = self._local
+        if local.depth == 0:
+            if conn.in_transaction:
+                conn.commit()  # transaction implicite laissée ouverte par un appel précédent
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        local.depth += 1
+        try:
+            yield local.cursor
+        except BaseException:
+            local.depth -= 1
+            if local.depth == 0:
+                conn.rollback()
+                with self._lock:
+                    self._rollbacks += 1
+            raise
+        local.depth -= 1
+        if local.depth == 0:
+            conn.commit()
+            with self._lock:
+                self._commits += 1
+
+    def release(self):
+        """Ferme la connexion du thread courant (rouverte au prochain usage)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn.close()
+            self._local.conn = None
+
+    def close(self):
+        """Ferme toutes les connexions (arrêt de l'application)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "path": self.path,
+                "journal_mode": self.journal_mode,
+                "synchronous": self.synchronous,
+                "open_connections": len(self._connections),
+                "opened_total": self._opened,
+                "transactions_committed": self._commits,
+                "transactions_rolled_back": self._rollbacks,
+            }
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(**options) -> ConnectionPool:
+    """Pool de la base DB_FILE (créé au premier appel, options prises en compte à la création)."""
+    with _pools_lock:
+        pool = _pools.get(DB_FILE)
+        if pool is None:
+            pool = _pools[DB_FILE] = ConnectionPool(DB_FILE, **options)
+        return pool
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
 class Database:
-    def __init__(self):
+    """
+    Accès à la base : objet léger, les connexions appartiennent au ConnectionPool.
+    `conn` et `cursor` désignent la connexion (et le curseur) du thread courant.
+    """
+
+    def __init__(self, pool: ConnectionPool | None = None):
+        self.pool = pool or get_pool()
+
+    @property
+    def conn(self) -> sqlite3.Connection | None:
         try:
-            self.conn = sqlite3.connect(DB_FILE, check_same_thread=False)
-            self.conn.execute("PRAGMA foreign_keys = ON;")
-            self.cursor = self.conn.cursor()
+            return self.pool.connection()
         except sqlite3.Error as e:
             print(f"Erreur de connexion à la base : {e}")
-            self.conn = None
-            self.cursor = None
+            return None
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        return self.pool.cursor()
+
+    def transaction(self, immediate: bool = True):
+        return self.pool.transaction(immediate)
 
-    
     def _get_local_now(self):
         paris_tz = pytz.timezone("Europe/Paris")
         return datetime.now(paris_tz).strftime("%Y-%m-%d %H:%M:%S")
 
-    def create_tables(self):
+    def create_tables(self, migrate: bool = True):
         if not self.conn:
             print("Pas de connexion.")
             return
@@ -54,17 +203,86 @@ class Database:
                     FOREIGN KEY (id_image) REFERENCES Image(id_image) ON DELETE CASCADE
                 );
             """)
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS Job (
+                    id_job INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id_user INTEGER NOT NULL,
+                    statut VARCHAR(20) NOT NULL,
+                    langue VARCHAR(2) NOT NULL,
+                    nb_items INTEGER NOT NULL,
+                    message VARCHAR(255),
+                    date_creation TIMESTAMP NOT NULL,
+                    date_debut TIMESTAMP,
+                    date_fin TIMESTAMP,
+                    FOREIGN KEY (id_user) REFERENCES User(id_user) ON DELETE CASCADE
+                );
+            """)
+            # 📦 Contenu conservé jusqu'au traitement de l'item (reprise après redémarrage), puis effacé
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS JobItem (
+                    id_item INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id_job INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    nom_fichier VARCHAR(255) NOT NULL,
+                    contenu BLOB,
+                    statut VARCHAR(20) NOT NULL,
+                    id_image INTEGER,
+                    message VARCHAR(255),
+                    FOREIGN KEY (id_job) REFERENCES Job(id_job) ON DELETE CASCADE,
+                    FOREIGN KEY (id_image) REFERENCES Image(id_image) ON DELETE SET NULL
+                );
+            """)
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobitem_job_statut ON JobItem (id_job, statut, position);"
+            )
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS CaptionCache (
+                    cache_key VARCHAR(128) PRIMARY KEY,
+                    resultat_pred VARCHAR(200) NOT NULL,
+                    confiances_pred TEXT NOT NULL,
+                    date_cache TIMESTAMP NOT NULL
+                );
+            """)
             self.conn.commit()
             print("Tables créées ou déjà existantes.")
         except sqlite3.Error as e:
             print(f"Erreur de création des tables : {e}")
+            return
+        if migrate:
+            self.migrate()
+
+    def schema_version(self) -> int:
+        self.cursor.execute("PRAGMA user_version;")
+        return self.cursor.fetchone()[0]
+
+    def migrate(self, target_version: int | None = None) -> list[int]:
+        """
+        Applique les migrations en attente (cf. migrations.py) jusqu'à `target_version`
+        (toutes par défaut), chacune dans sa transaction.
+        Le verrou d'écriture est pris avant de relire la version : deux processus qui démarrent
+        en même temps n'appliquent pas deux fois la même migration.
+        Retourne les versions appliquées.
+        """
+        applied = []
+        for version, description, statements in MIGRATIONS:
+            if target_version is not None and version > target_version:
+                break
+            with self.transaction():
+                if self.schema_version() >= version:
+                    continue
+                for statement in statements:
+                    self.cursor.execute(statement)
+                self.cursor.execute(f"PRAGMA user_version = {version};")
+            print(f"🗄️ Migration {version} appliquée : {description}")
+            applied.append(version)
+        return applied
 
     def get_connection(self):
         return self.conn
 
     def close(self):
-        if self.conn:
-            self.conn.close()
+        # Ne ferme que la connexion du thread courant ; les autres restent au pool
+        self.pool.release()
 
     def add_user(self, nom_user: str, mdp_user: str) -> int | None:
 
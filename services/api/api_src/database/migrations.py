@@ -0,0 +1,32 @@
+"""
+Migrations versionnées du schéma SQLite (PRAGMA user_version).
+
+create_tables crée le schéma de base (version 0) ; chaque entrée de MIGRATIONS fait
+passer la base à sa version, une seule fois, dans sa propre transaction.
+Ne jamais modifier une migration déjà publiée : en ajouter une nouvelle.
+"""
+
+MIGRATIONS: list[tuple[int, str, list[str]]] = [
+    (
+        1,
+        "Version du modèle sur chaque prédiction",
+        [
+            "ALTER TABLE Prediction ADD COLUMN model_version VARCHAR(64);",
+        ],
+    ),
+    (
+        2,
+        "Index : connexion par nom, historique par utilisateur, statistiques par jour, feedbacks",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_user_nom ON User (nom_user);",
+            # 🔑 Contient aussi id_image (rowid) : historique paginé par id_image décroissant sans tri
+            "CREATE INDEX IF NOT EXISTS idx_image_user ON Image (id_user);",
+            # 📊 Index couvrant : les agrégats par jour / modèle se calculent sans lire la table
+            "CREATE INDEX IF NOT EXISTS idx_prediction_date ON Prediction "
+            "(date_pred, model_version, monitor_pred, confiance_pred);",
+            "CREATE INDEX IF NOT EXISTS idx_prediction_monitor ON Prediction (monitor_pred);",
+        ],
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from PIL import Image
+
+from api_src.inference.pipeline import InferencePipeline
+from api_src.inference.executor import InferenceExecutor, QueueFullError
+
+
+@dataclass
+class _PendingRequest:
+    image: Image.Image
+    translate: bool
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class BatchScheduler:
+    """
+    Micro-batching des requêtes d'inférence.
+
+    Les requêtes sont regroupées pendant au plus `max_wait_ms` millisecondes
+    (ou jusqu'à `max_batch_size` images), puis passent ensemble dans
+    l'encodeur et le décodeur. Chaque appelant récupère son propre résultat.
+    """
+
+    def __init__(
+        self,
+        pipeline: InferencePipeline,
+        executor: InferenceExecutor | None = None,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        max_queue_size: int = 64
+    ):
+        self.pipeline = pipeline
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+        # 📊 Métriques
+        self._batch_sizes = Counter()
+        self._requests = 0
+        self._rejected = 0
+        self._queue_latency_total = 0.0
+        self._queue_latency_max = 0.0
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # ❌ Les requêtes encore en attente ne seront jamais traitées
+        while self._queue is not None and not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.set_exception(RuntimeError("Service d'inférence arrêté"))
+
+    async def submit(self, image: Image.Image, translate: bool = False) -> tuple[str, list[float]]:
+        if self._queue is None:
+            raise RuntimeError("BatchScheduler non démarré")
+
+        request = _PendingRequest(image, translate, asyncio.get_running_loop().create_future())
+        try:
+            self._queue.put_nowait(request)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise QueueFullError("Trop de requêtes en attente, réessayez plus tard")
+
+        return await request.future
+
+    async def _collect_batch(self) -> list[_PendingRequest]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            await self._process(batch)
+
+    async def _process(self, batch: list[_PendingRequest]):
+        # Les clients déconnectés entre-temps sont ignorés
+        batch = [request for request in batch if not request.future.done()]
+        if not batch:
+            return
+
+        started_at = time.perf_counter()
+        for request in batch:
+            latency = started_at - request.enqueued_at
+            self._queue_latency_total += latency
+            self._queue_latency_max = max(self._queue_latency_max, latency)
+        self._requests += len(batch)
+        self._batch_sizes[len(batch)] += 1
+
+        images = [request.image for request in batch]
+        translate = [request.translate for request in batch]
+        try:
+            if self.executor is not None:
+                results = await self.executor.run(self.pipeline.predict_batch, images, translate)
+            else:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    None, self.pipeline.predict_batch, images, translate
+                )
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        for request, result in zip(batch, results):
+            if not request.future.done():
+                request.future.set_result(result)
+
+    def stats(self) -> dict:
+        batches = sum(self._batch_sizes.values())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_queue_size": self.max_queue_size,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "requests": self._requests,
+            "rejected": self._rejected,
+            "batches": batches,
+            "batch_size_mean": round(self._requests / batches, 3) if batches else None,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "queue_latency_mean_ms": round(self._queue_latency_total / self._requests * 1000, 3) if self._requests else None,
+            "queue_latency_max_ms": round(self._queue_latency_max * 1000, 3),
+        }
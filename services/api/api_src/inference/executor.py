@@ -0,0 +1,21 @@
+import torch
+
+from api_src.services.bounded_executor import BoundedExecutor, QueueFullError
+
+
+class InferenceExecutor(BoundedExecutor):
+    """
+    Pool de threads dédié aux traitements CPU (décodage d'image, ResNet50, LSTM,
+    traduction, écritures SQLite) pour ne jamais bloquer la boucle asyncio.
+
+    Un pool de threads plutôt que de processus : torch libère le GIL pendant
+    les calculs et les modèles du ModelRegistry restent partagés en mémoire.
+    Le nombre de threads intra-op de torch est un réglage du processus, fixé
+    une fois au démarrage (cf. TORCH_THREADS dans main.py), pas par worker.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 0, thread_name_prefix: str = "inference"):
+        super().__init__(max_workers=max_workers, max_pending=max_pending, thread_name_prefix=thread_name_prefix)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "torch_threads": torch.get_num_threads()}
@@ -0,0 +1,79 @@
+import io
+import threading
+import time
+from PIL import Image
+
+from src.model.encoder import IMAGE_SIZE
+from src.monitoring.metrics import histogram
+
+IMAGE_DECODE_SECONDS = histogram("image_decode_seconds", "Décodage d'une image reçue (en-tête, draft JPEG, réduction)")
+
+
+class ImageTooLargeError(ValueError):
+    """Image au-delà de la limite de pixels (à traduire en HTTP 413)."""
+
+
+class ImageDecoder:
+    """
+    Décodage des images reçues par l'API, au plus près de la taille d'entrée du modèle.
+
+    - La taille est lue dans l'en-tête : une image trop grande est rejetée avant décodage.
+    - JPEG : décodage réduit (draft, DCT à 1/2, 1/4 ou 1/8) → jamais de bitmap 12 MP en mémoire.
+    - Autres formats : réduction entière (Image.reduce) dès que l'image dépasse 2x la cible.
+
+    Le resize final en 224x224 reste fait par l'encodeur.
+    """
+
+    def __init__(self, target_size: tuple[int, int] = IMAGE_SIZE, max_pixels: int = 50_000_000):
+        self.target_size = target_size  # (hauteur, largeur), comme Encoder
+        self.max_pixels = max_pixels
+
+        # 📊 Métriques (nombre et durée des décodages : histogramme IMAGE_DECODE_SECONDS)
+        self._lock = threading.Lock()
+        self._rejected = 0
+        self._drafted = 0
+        self._reduced = 0
+
+    def decode(self, image_bytes: bytes) -> Image.Image:
+        start = time.perf_counter()
+        image = Image.open(io.BytesIO(image_bytes))  # lecture de l'en-tête uniquement
+
+        width, height = image.size
+        if width * height > self.max_pixels:
+            with self._lock:
+                self._rejected += 1
+            raise ImageTooLargeError(
+                f"Image trop grande ({width}x{height}, limite {self.max_pixels / 1e6:.0f} Mpx)"
+            )
+
+        target_height, target_width = self.target_size
+        drafted = False
+        if image.format == "JPEG":
+            # 📉 Plus petite échelle DCT dont le résultat reste >= à la cible
+            image.draft("RGB", (target_width, target_height))
+            drafted = image.size != (width, height)
+
+        image = image.convert("RGB")
+
+        factor = min(image.width // (2 * target_width), image.height // (2 * target_height))
+        reduced = factor > 1
+        if reduced:
+            image = image.reduce(factor)
+
+        IMAGE_DECODE_SECONDS.observe(time.perf_counter() - start)
+        with self._lock:
+            self._drafted += drafted
+            self._reduced += reduced
+        return image
+
+    def stats(self) -> dict:
+        decode = IMAGE_DECODE_SECONDS.snapshot()
+        with self._lock:
+            return {
+                "max_pixels": self.max_pixels,
+                "decoded": decode["count"],
+                "rejected": self._rejected,
+                "jpeg_draft": self._drafted,
+                "reduced": self._reduced,
+                "decode_mean_ms": round(decode["sum"] / decode["count"] * 1000, 3) if decode["count"] else None,
+            }
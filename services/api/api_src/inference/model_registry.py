@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from PIL import Image
+
+from api_src.config import DECODER_PATH, TOKENIZER_PATH, MODEL_DEVICE, BEAM_SIZE, LENGTH_PENALTY, IMAGE_MAX_PIXELS
+from api_src.inference.pipeline import InferencePipeline
+from src.monitoring.metrics import MODEL_LOADS, MODEL_LOAD_SECONDS
+
+
+def _get_rss_bytes() -> int | None:
+    """Mémoire résidente du processus (Linux), None si indisponible."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _module_bytes(module) -> int:
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class ModelRegistry:
+    """
+    Registre des pipelines d'inférence, partagé par tout le processus.
+
+    Chaque combinaison (decoder_path, tokenizer_path, device, options de décodage) n'est chargée
+    qu'une seule fois ; les requêtes suivantes réutilisent les mêmes modèles
+    (en lecture seule, mode eval), ce qui est sûr entre threads.
+    """
+
+    def __init__(self):
+        self._pipelines: dict[tuple, InferencePipeline] = {}
+        self._stats: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(decoder_path: str, tokenizer_path: str, device=None, **options) -> tuple:
+        return (decoder_path, tokenizer_path, str(device) if device is not None else None, tuple(sorted(options.items())))
+
+    def get(self, decoder_path: str, tokenizer_path: str, device=None, warmup: bool = False, **options) -> InferencePipeline:
+        """options : paramètres supplémentaires d'InferencePipeline (beam_size, length_penalty, max_image_pixels)."""
+        key = self._key(decoder_path, tokenizer_path, device, **options)
+        pipeline = self._pipelines.get(key)
+        if pipeline is not None:
+            return pipeline
+
+        # 🔒 Un seul chargement même si plusieurs requêtes arrivent en même temps
+        with self._lock:
+            pipeline = self._pipelines.get(key)
+            if pipeline is None:
+                pipeline = self._load(key, decoder_path, tokenizer_path, device, warmup, options)
+        return pipeline
+
+    def _load(self, key, decoder_path, tokenizer_path, device, warmup, options) -> InferencePipeline:
+        rss_before = _get_rss_bytes()
+        start = time.perf_counter()
+        pipeline = InferencePipeline(decoder_path, tokenizer_path, device, **options)
+        load_time = time.perf_counter() - start
+        MODEL_LOADS.inc(model="caption")
+        MODEL_LOAD_SECONDS.observe(load_time, model="caption")
+
+        warmup_time = None
+        if warmup:
+            warmup_time = self._warmup(pipeline)
+
+        rss_after = _get_rss_bytes()
+        captioner = pipeline.captioner
+        self._stats[key] = {
+            "decoder_path": decoder_path,
+            "tokenizer_path": tokenizer_path,
+            "device": str(captioner.device),
+            "options": options,
+            "load_time_s": round(load_time, 4),
+            "warmup_time_s": round(warmup_time, 4) if warmup_time is not None else None,
+            "encoder_bytes": _module_bytes(captioner.encoder),
+            "decoder_bytes": _module_bytes(captioner.decoder),
+            "rss_delta_bytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            "loaded_at": time.time(),
+        }
+        self._pipelines[key] = pipeline
+        print(f"🧠 Modèle chargé en {load_time:.2f}s ({decoder_path}, device={captioner.device})")
+        return pipeline
+
+    @staticmethod
+    def _warmup(pipeline: InferencePipeline) -> float:
+        """Premier passage à vide : alloue les buffers et initialise les kernels."""
+        start = time.perf_counter()
+        pipeline.captioner.generate(Image.new("RGB", (224, 224)))
+        return time.perf_counter() - start
+
+    def warmup(self, decoder_path: str, tokenizer_path: str, device=None, **options) -> float:
+        key = self._key(decoder_path, tokenizer_path, device, **options)
+        warmup_time = self._warmup(self.get(decoder_path, tokenizer_path, device, **options))
+        self._stats[key]["warmup_time_s"] = round(warmup_time, 4)
+        return warmup_time
+
+    def stats(self) -> list[dict]:
+        return [dict(stats) for stats in self._stats.values()]
+
+    def clear(self):
+        with self._lock:
+            self._pipelines.clear()
+            self._stats.clear()
+
+
+# Instance unique pour tout le processus
+model_registry = ModelRegistry()
+
+
+def get_default_pipeline(warmup: bool = False) -> InferencePipeline:
+    """Pipeline configuré pour l'API (chargé au démarrage via le lifespan)."""
+    return model_registry.get(
+        DECODER_PATH, TOKENIZER_PATH, MODEL_DEVICE, warmup=warmup,
+        beam_size=BEAM_SIZE, length_penalty=LENGTH_PENALTY, max_image_pixels=IMAGE_MAX_PIXELS
+    )
@@ -1,35 +1,85 @@
-from PIL import Image
-import io
+import hashlib
 import sys 
+import time
 from pathlib import Path
 project_root = Path(__file__).resolve().parents[4]  # <- remonte jusqu'à la racine
 sys.path.append(str(project_root))
 
 from src.inference.caption_generator import CaptionGenerator
+from src.inference.decoding import mean_confidence
+from api_src.inference.image_decoder import ImageDecoder
+from src.monitoring.metrics import counter, histogram
+
+# 📊 Temps passé dans le modèle (encodeur + décodeur + traduction), hors décodage d'image
+MODEL_SECONDS = histogram("pipeline_model_seconds", "Appel du modèle sur un lot d'images décodées (encodeur + décodeur + traduction)")
+MODEL_IMAGES = counter("pipeline_model_images_total", "Images passées dans le modèle")
 
 class InferencePipeline:
-    def __init__(self, decoder_path: str, tokenizer_path: str, device=None):
+    def __init__(
+        self,
+        decoder_path: str,
+        tokenizer_path: str,
+        device=None,
+        beam_size: int = 1,
+        length_penalty: float = 1.0,
+        max_image_pixels: int = 50_000_000
+    ):
         # ✅ Charger ton CaptionGenerator
-        self.captioner = CaptionGenerator(decoder_path, tokenizer_path, device)
+        self.captioner = CaptionGenerator(
+            decoder_path, tokenizer_path, device,
+            beam_size=beam_size, length_penalty=length_penalty
+        )
+        self.model_version = self._compute_model_version(decoder_path, tokenizer_path, beam_size, length_penalty)
+        self.image_decoder = ImageDecoder(max_pixels=max_image_pixels)
+
+    @staticmethod
+    def _compute_model_version(decoder_path: str, tokenizer_path: str, beam_size: int, length_penalty: float) -> str:
+        # 🏷️ Empreinte des poids + vocabulaire + options de décodage (sert de clé de cache)
+        digest = hashlib.sha256()
+        for path in (decoder_path, tokenizer_path):
+            with open(project_root / path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        digest.update(f"beam={beam_size};lp={length_penalty}".encode())
+        return digest.hexdigest()[:16]
 
     def preprocess(self, image_bytes: bytes):
-        # ✅ Chargement image depuis les bytes reçus dans l'API
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        return image
+        # ✅ Décodage réduit au plus près de 224 px (ImageTooLargeError si trop grande)
+        return self.image_decoder.decode(image_bytes)
 
     def predict(self, image_bytes: bytes, translate: bool = False):
         # 1. Chargement et prétraitement
         image = self.preprocess(image_bytes)
 
         # 2. Génération de la légende (en anglais ou traduite)
-        caption, confidences = self.captioner.generate(image, translate=translate)
+        caption, confidences = self.predict_batch([image], translate=translate)[0]
 
         # 3. Retour de la légende + score moyen
         return {
             "caption": caption,
-            "confidence_mean": round(sum(confidences) / len(confidences), 4),
+            "confidence_mean": mean_confidence(confidences),
             "tokens": [
                 {"word": w, "confidence": round(c, 4)}
                 for w, c in zip(caption.split(), confidences)
             ]
-        }
\ No newline at end of file
+        }
+
+    def predict_batch(self, images: list, translate=False):
+        # 📦 Lot d'images PIL déjà décodées → liste de (caption, confidences)
+        start = time.perf_counter()
+        results = self.captioner.generate_batch(images, translate=translate)
+        MODEL_SECONDS.observe(time.perf_counter() - start)
+        MODEL_IMAGES.inc(len(images))
+        return results
+
+    def stats(self) -> dict:
+        # 📈 Lu dans le registre de métriques (mêmes valeurs que /metrics)
+        snapshot = MODEL_SECONDS.snapshot()
+        calls, images = snapshot["count"], MODEL_IMAGES.value()
+        model = {
+            "calls": calls,
+            "images": int(images),
+            "model_mean_ms": round(snapshot["sum"] / calls * 1000, 3) if calls else None,
+            "model_per_image_ms": round(snapshot["sum"] / images * 1000, 3) if images else None,
+        }
+        return {"model_version": self.model_version, "decode": self.image_decoder.stats(), "model": model}
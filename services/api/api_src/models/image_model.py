@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from enum import Enum
 
 class ImagePredictionRequest(BaseModel):
@@ -14,6 +14,21 @@ class ImagePredictionResponse(BaseModel):
     resultat_pred: Optional[str] = None
     confiance_pred: Optional[float] = None
 
+class BatchImageResult(BaseModel):
+    nom_fichier: str
+    success: bool
+    id_image: Optional[int] = None
+    id_prediction: Optional[int] = None
+    resultat_pred: Optional[str] = None
+    confiance_pred: Optional[float] = None
+    message: Optional[str] = None  # raison de l'échec pour cette image
+
+class BatchPredictionResponse(BaseModel):
+    message: str
+    nb_images: int
+    nb_succes: int
+    resultats: List[BatchImageResult]
+
 class FeedbackRequest(BaseModel):
     id_image: int
     feedback: int  # par exemple 1 à 4, la note donnée par l'utilisateur
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from enum import Enum
+
+class JobStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    cancelled = "cancelled"
+    failed = "failed"
+
+class JobItemStatus(str, Enum):
+    pending = "pending"
+    done = "done"
+    failed = "failed"
+    cancelled = "cancelled"
+
+class JobResponse(BaseModel):
+    id_job: int
+    statut: JobStatus
+    langue: str
+    nb_items: int
+    nb_termines: int = 0
+    nb_echecs: int = 0
+    nb_annules: int = 0
+    nb_restants: int = 0
+    message: Optional[str] = None
+    date_creation: str
+    date_debut: Optional[str] = None
+    date_fin: Optional[str] = None
+    debit_items_s: Optional[float] = None  # images traitées par seconde (job en cours)
+    eta_s: Optional[float] = None  # estimation du temps restant (job en cours)
+
+class JobItemResult(BaseModel):
+    id_item: int
+    position: int
+    nom_fichier: str
+    statut: JobItemStatus
+    id_image: Optional[int] = None
+    id_prediction: Optional[int] = None
+    resultat_pred: Optional[str] = None
+    confiance_pred: Optional[float] = None
+    message: Optional[str] = None
+
+class JobItemsResponse(BaseModel):
+    id_job: int
+    items: List[JobItemResult]
+    next_after: Optional[int] = None  # position à passer en `after` pour la page suivante
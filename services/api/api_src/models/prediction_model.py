@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class PredictionHistoryItem(BaseModel):
+    id_image: int
+    nom_fichier: str
+    date_fichier: str
+    id_prediction: int
+    resultat_pred: str
+    confiance_pred: float
+    monitor_pred: int  # 0 tant qu'aucun feedback n'a été donné
+    model_version: Optional[str] = None
+
+class PredictionHistoryResponse(BaseModel):
+    items: List[PredictionHistoryItem]
+    next_before: Optional[int] = None  # id_image à passer en `before` pour la page suivante
+
+class FeedbackStatsRow(BaseModel):
+    jour: str
+    model_version: Optional[str] = None  # None : prédictions antérieures au suivi des versions
+    nb_predictions: int
+    nb_feedbacks: int
+    monitor_moyen: Optional[float] = None  # moyenne des notes données (feedbacks uniquement)
+    confiance_moyenne: float
+
+class FeedbackStatsResponse(BaseModel):
+    date_debut: str
+    date_fin: str
+    stats: List[FeedbackStatsRow]
@@ -0,0 +1,27 @@
+import json
+from api_src.database.database import Database
+
+class CaptionCacheRepository:
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get(self, cache_key: str) -> tuple[str, list[float]] | None:
+        self.db.cursor.execute(
+            "SELECT resultat_pred, confiances_pred FROM CaptionCache WHERE cache_key = ?",
+            (cache_key,)
+        )
+        row = self.db.cursor.fetchone()
+        if row:
+            return row[0], json.loads(row[1])
+        return None
+
+    def put(self, cache_key: str, resultat_pred: str, confidences: list[float]):
+        now_local = self.db._get_local_now()
+        try:
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    "INSERT OR REPLACE INTO CaptionCache (cache_key, resultat_pred, confiances_pred, date_cache) VALUES (?, ?, ?, ?)",
+                    (cache_key, resultat_pred, json.dumps(confidences), now_local)
+                )
+        except Exception as e:
+            raise Exception(f"Erreur lors de l'écriture dans le cache des légendes : {e}")
@@ -1,5 +1,9 @@
 from sqlite3 import IntegrityError
 from api_src.database.database import Database
+from src.inference.decoding import mean_confidence
+from src.monitoring.metrics import histogram
+
+DB_WRITE_SECONDS = histogram("db_write_seconds", "Écriture des lignes Image/Prediction (transaction comprise)", ["operation"])
 
 class ImageRepository:
     def __init__(self, db: Database):
@@ -36,11 +40,12 @@ class ImageRepository:
         
     def update_monitor_pred(self, id_image: int, monitor_pred: int) -> bool:
         try:
-            self.db.cursor.execute(
-                "UPDATE Prediction SET monitor_pred = ? WHERE id_image = ?",
-                (monitor_pred, id_image)
-            )
-            self.db.conn.commit()
+            with DB_WRITE_SECONDS.time(operation="update_monitor_pred"):
+                self.db.cursor.execute(
+                    "UPDATE Prediction SET monitor_pred = ? WHERE id_image = ?",
+                    (monitor_pred, id_image)
+                )
+                self.db.conn.commit()
             return True
         except Exception as e:
             print(f"Erreur lors de la mise à jour du feedback : {e}")
@@ -52,26 +57,108 @@ class ImageRepository:
         filename: str,
         caption: str,
         confidences: list[float],
-        monitor_pred: int
+        monitor_pred: int,
+        model_version: str | None = None
     ) -> tuple[int, int]:
         """
-        Sauvegarde une image et sa prédiction associée.
+        Sauvegarde une image et sa prédiction associée, en une seule transaction
+        (jamais d'image sans prédiction).
         Retourne (id_image, id_prediction)
         """
-        # 1. Ajouter l’image
-        image_id = self.add_image(nom_fichier=filename, id_user=user_id)
-        if image_id is None:
-            raise Exception("Erreur lors de l'ajout de l'image en base.")
+        confidence_avg = mean_confidence(confidences)
+        now_local = self.db._get_local_now()
+        try:
+            with DB_WRITE_SECONDS.time(operation="save_prediction"), self.db.transaction():
+                # 1. Ajouter l’image
+                self.db.cursor.execute(
+                    "INSERT INTO Image (nom_fichier, date_fichier, id_user) VALUES (?, ?, ?)",
+                    (filename, now_local, user_id)
+                )
+                image_id = self.db.cursor.lastrowid
 
-        # 2. Ajouter la prédiction
-        confidence_avg = round(sum(confidences) / len(confidences), 4)
-        prediction_id = self.add_prediction(
-            resultat_pred=caption,
-            confiance_pred=confidence_avg,
-            id_image=image_id,
-            monitor_pred=monitor_pred
-        )
-        if prediction_id is None:
-            raise Exception("Erreur lors de l'ajout de la prédiction en base.")
+                # 2. Ajouter la prédiction
+                self.db.cursor.execute(
+                    "INSERT INTO Prediction (resultat_pred, confiance_pred, monitor_pred, date_pred, id_image, model_version) VALUES (?, ?, ?, ?, ?, ?)",
+                    (caption, confidence_avg, monitor_pred, now_local, image_id, model_version)
+                )
+                prediction_id = self.db.cursor.lastrowid
+        except IntegrityError as e:
+            raise Exception(f"Erreur de clé étrangère (id_user invalide ?) : {e}")
+        except Exception as e:
+            raise Exception(f"Erreur lors de l'enregistrement de la prédiction : {e}")
 
         return image_id, prediction_id
+
+    def reserve_ids(self, count: int) -> tuple[int, int]:
+        """
+        Réserve `count` identifiants consécutifs dans Image et dans Prediction (écriture différée).
+        Retourne le premier id_image et le premier id_pred du bloc.
+        AUTOINCREMENT ne réutilise jamais un id inférieur à sqlite_sequence : les autres
+        écritures (jobs, /upload_images) ne peuvent pas entrer en collision avec le bloc.
+        """
+        firsts = []
+        with self.db.transaction():
+            for table, column in (("Image", "id_image"), ("Prediction", "id_pred")):
+                self.db.cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+                row = self.db.cursor.fetchone()
+                if row is None:
+                    # Table jamais alimentée : la séquence n'existe pas encore
+                    self.db.cursor.execute(f"SELECT COALESCE(MAX({column}), 0) FROM {table}")
+                    seq = self.db.cursor.fetchone()[0]
+                    self.db.cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, seq + count))
+                else:
+                    seq = row[0]
+                    self.db.cursor.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (seq + count, table))
+                firsts.append(seq + 1)
+        return firsts[0], firsts[1]
+
+    def insert_predictions(self, rows: list[tuple]):
+        """
+        Insère des lignes Image/Prediction aux identifiants déjà réservés, en une transaction.
+        rows : (id_image, id_pred, user_id, filename, date, caption, confiance_pred, monitor_pred, model_version)
+        """
+        with DB_WRITE_SECONDS.time(operation="insert_predictions"), self.db.transaction():
+            self.db.cursor.executemany(
+                "INSERT INTO Image (id_image, nom_fichier, date_fichier, id_user) VALUES (?, ?, ?, ?)",
+                ((id_image, filename, date, user_id) for id_image, _, user_id, filename, date, *_ in rows)
+            )
+            self.db.cursor.executemany(
+                "INSERT INTO Prediction (id_pred, resultat_pred, confiance_pred, monitor_pred, date_pred, id_image, model_version) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (id_pred, caption, confidence, monitor_pred, date, id_image, model_version)
+                    for id_image, id_pred, _, _, date, caption, confidence, monitor_pred, model_version in rows
+                )
+            )
+
+    def save_predictions(
+        self,
+        user_id: int,
+        predictions: list[tuple[str, str, list[float]]],
+        monitor_pred: int = 0,
+        model_version: str | None = None
+    ) -> list[tuple[int, int]]:
+        """
+        Sauvegarde plusieurs images et leurs prédictions en une seule transaction (tout ou rien).
+        Appelée dans une transaction englobante (cf. JobRepository), elle en fait partie.
+        predictions : liste de (filename, caption, confidences)
+        Retourne la liste des (id_image, id_prediction), dans le même ordre.
+        """
+        now_local = self.db._get_local_now()
+        ids = []
+        try:
+            with DB_WRITE_SECONDS.time(operation="save_predictions"), self.db.transaction():
+                for filename, caption, confidences in predictions:
+                    self.db.cursor.execute(
+                        "INSERT INTO Image (nom_fichier, date_fichier, id_user) VALUES (?, ?, ?)",
+                        (filename, now_local, user_id)
+                    )
+                    image_id = self.db.cursor.lastrowid
+                    self.db.cursor.execute(
+                        "INSERT INTO Prediction (resultat_pred, confiance_pred, monitor_pred, date_pred, id_image, model_version) VALUES (?, ?, ?, ?, ?, ?)",
+                        (caption, mean_confidence(confidences), monitor_pred, now_local, image_id, model_version)
+                    )
+                    ids.append((image_id, self.db.cursor.lastrowid))
+        except Exception as e:
+            raise Exception(f"Erreur lors de l'enregistrement du lot d'images : {e}")
+
+        return ids
@@ -0,0 +1,180 @@
+from api_src.database.database import Database
+from api_src.repositories.image_repository import ImageRepository
+
+_JOB_SELECT = """
+    SELECT j.id_job, j.id_user, j.statut, j.langue, j.nb_items, j.message,
+           j.date_creation, j.date_debut, j.date_fin,
+           COALESCE(SUM(i.statut = 'done'), 0),
+           COALESCE(SUM(i.statut = 'failed'), 0),
+           COALESCE(SUM(i.statut = 'cancelled'), 0),
+           COALESCE(SUM(i.statut = 'pending'), 0)
+    FROM Job j LEFT JOIN JobItem i ON i.id_job = j.id_job
+"""
+
+_JOB_FIELDS = (
+    "id_job", "id_user", "statut", "langue", "nb_items", "message",
+    "date_creation", "date_debut", "date_fin",
+    "nb_termines", "nb_echecs", "nb_annules", "nb_restants"
+)
+
+
+class JobRepository:
+    def __init__(self, db: Database):
+        self.db = db
+        # Même connexion : images, prédictions et statut des items dans une seule transaction
+        self.image_repository = ImageRepository(db)
+
+    def create_job(self, id_user: int, langue: str, files: list[tuple[str, bytes | None, str | None]]) -> int:
+        """
+        Crée un job et ses items en une transaction.
+        files : liste de (nom_fichier, contenu, message) ; contenu None → item déjà en échec (message).
+        """
+        now_local = self.db._get_local_now()
+        try:
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    "INSERT INTO Job (id_user, statut, langue, nb_items, date_creation) VALUES (?, 'pending', ?, ?, ?)",
+                    (id_user, langue, len(files), now_local)
+                )
+                id_job = self.db.cursor.lastrowid
+                self.db.cursor.executemany(
+                    "INSERT INTO JobItem (id_job, position, nom_fichier, contenu, statut, message) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (id_job, position, nom_fichier, contenu, "pending" if contenu is not None else "failed", message)
+                        for position, (nom_fichier, contenu, message) in enumerate(files)
+                    )
+                )
+            return id_job
+        except Exception as e:
+            raise Exception(f"Erreur lors de la création du job : {e}")
+
+    def get_job(self, id_job: int) -> dict | None:
+        self.db.cursor.execute(_JOB_SELECT + " WHERE j.id_job = ? GROUP BY j.id_job", (id_job,))
+        row = self.db.cursor.fetchone()
+        return dict(zip(_JOB_FIELDS, row)) if row else None
+
+    def list_jobs(self, id_user: int, limit: int = 50) -> list[dict]:
+        self.db.cursor.execute(
+            _JOB_SELECT + " WHERE j.id_user = ? GROUP BY j.id_job ORDER BY j.id_job DESC LIMIT ?",
+            (id_user, limit)
+        )
+        return [dict(zip(_JOB_FIELDS, row)) for row in self.db.cursor.fetchall()]
+
+    def get_items(self, id_job: int, after: int = -1, limit: int = 100) -> list[dict]:
+        """Résultats des items par position croissante (pagination par `after` = dernière position lue)."""
+        self.db.cursor.execute(
+            """
+            SELECT i.id_item, i.position, i.nom_fichier, i.statut, i.id_image,
+                   p.id_pred, p.resultat_pred, p.confiance_pred, i.message
+            FROM JobItem i LEFT JOIN Prediction p ON p.id_image = i.id_image
+            WHERE i.id_job = ? AND i.position > ?
+            ORDER BY i.position LIMIT ?
+            """,
+            (id_job, after, limit)
+        )
+        fields = (
+            "id_item", "position", "nom_fichier", "statut", "id_image",
+            "id_prediction", "resultat_pred", "confiance_pred", "message"
+        )
+        return [dict(zip(fields, row)) for row in self.db.cursor.fetchall()]
+
+    def start_job(self, id_job: int) -> dict | None:
+        """Passe un job en attente à 'running' ; None s'il n'est plus à traiter (annulé, terminé...)."""
+        with self.db.transaction():
+            self.db.cursor.execute(
+                "UPDATE Job SET statut = 'running', date_debut = COALESCE(date_debut, ?) WHERE id_job = ? AND statut = 'pending'",
+                (self.db._get_local_now(), id_job)
+            )
+        if self.db.cursor.rowcount == 0:
+            return None
+        return self.get_job(id_job)
+
+    def next_items(self, id_job: int, limit: int) -> list[tuple[int, str, bytes]]:
+        self.db.cursor.execute(
+            "SELECT id_item, nom_fichier, contenu FROM JobItem WHERE id_job = ? AND statut = 'pending' ORDER BY position LIMIT ?",
+            (id_job, limit)
+        )
+        return self.db.cursor.fetchall()
+
+    def complete_items(
+        self,
+        id_job: int,
+        id_user: int,
+        done: list[tuple[int, str, str, list[float]]],
+        failed: list[tuple[int, str]],
+        model_version: str | None = None
+    ) -> bool:
+        """
+        Enregistre un lot d'items traités en une transaction : lignes Image/Prediction,
+        statut des items et effacement de leur contenu.
+        done : (id_item, nom_fichier, caption, confidences) ; failed : (id_item, message)
+        Retourne False (rien n'est écrit) si le job a été annulé entre-temps.
+        """
+        # 🔒 Verrou d'écriture pris avant la vérification du statut (BEGIN IMMEDIATE) : pas de course avec cancel_job
+        with self.db.transaction():
+            self.db.cursor.execute("SELECT statut FROM Job WHERE id_job = ?", (id_job,))
+            row = self.db.cursor.fetchone()
+            if row is None or row[0] != "running":
+                return False
+
+            ids = self.image_repository.save_predictions(
+                user_id=id_user,
+                predictions=[(nom_fichier, caption, confidences) for _, nom_fichier, caption, confidences in done],
+                model_version=model_version
+            )
+            self.db.cursor.executemany(
+                "UPDATE JobItem SET statut = 'done', id_image = ?, contenu = NULL WHERE id_item = ?",
+                ((image_id, item[0]) for item, (image_id, _) in zip(done, ids))
+            )
+            self.db.cursor.executemany(
+                "UPDATE JobItem SET statut = 'failed', message = ?, contenu = NULL WHERE id_item = ?",
+                ((message, id_item) for id_item, message in failed)
+            )
+        return True
+
+    def finish_job(self, id_job: int) -> bool:
+        """Marque le job terminé s'il ne reste plus d'item en attente."""
+        with self.db.transaction():
+            self.db.cursor.execute(
+                """
+                UPDATE Job SET statut = 'completed', date_fin = ?
+                WHERE id_job = ? AND statut = 'running'
+                  AND NOT EXISTS (SELECT 1 FROM JobItem WHERE id_job = ? AND statut = 'pending')
+                """,
+                (self.db._get_local_now(), id_job, id_job)
+            )
+        return self.db.cursor.rowcount > 0
+
+    def fail_job(self, id_job: int, message: str):
+        now_local = self.db._get_local_now()
+        with self.db.transaction():
+            self.db.cursor.execute(
+                "UPDATE Job SET statut = 'failed', message = ?, date_fin = ? WHERE id_job = ? AND statut IN ('pending', 'running')",
+                (message[:255], now_local, id_job)
+            )
+            self.db.cursor.execute(
+                "UPDATE JobItem SET statut = 'failed', message = ?, contenu = NULL WHERE id_job = ? AND statut = 'pending'",
+                (message[:255], id_job)
+            )
+
+    def cancel_job(self, id_job: int) -> bool:
+        """Annule un job en attente ou en cours ; les items non traités sont abandonnés."""
+        with self.db.transaction():
+            self.db.cursor.execute(
+                "UPDATE Job SET statut = 'cancelled', date_fin = ? WHERE id_job = ? AND statut IN ('pending', 'running')",
+                (self.db._get_local_now(), id_job)
+            )
+            if self.db.cursor.rowcount == 0:
+                return False
+            self.db.cursor.execute(
+                "UPDATE JobItem SET statut = 'cancelled', contenu = NULL WHERE id_job = ? AND statut = 'pending'",
+                (id_job,)
+            )
+        return True
+
+    def requeue_unfinished(self) -> list[int]:
+        """Au démarrage : les jobs interrompus ('running') repassent en attente ; retourne les jobs à reprendre."""
+        with self.db.transaction():
+            self.db.cursor.execute("UPDATE Job SET statut = 'pending' WHERE statut = 'running'")
+        self.db.cursor.execute("SELECT id_job FROM Job WHERE statut = 'pending' ORDER BY id_job")
+        return [row[0] for row in self.db.cursor.fetchall()]
@@ -0,0 +1,57 @@
+from api_src.database.database import Database
+
+_HISTORY_FIELDS = (
+    "id_image", "nom_fichier", "date_fichier", "id_prediction",
+    "resultat_pred", "confiance_pred", "monitor_pred", "model_version"
+)
+
+_STATS_FIELDS = (
+    "jour", "model_version", "nb_predictions", "nb_feedbacks", "monitor_moyen", "confiance_moyenne"
+)
+
+
+class PredictionRepository:
+    """Lectures sur Image/Prediction (historique, statistiques), appuyées sur les index des migrations."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_history(self, id_user: int, before: int | None = None, limit: int = 50) -> list[dict]:
+        """
+        Prédictions d'un utilisateur, de la plus récente à la plus ancienne.
+        Pagination par clé (`before` = dernier id_image lu) : coût constant quelle que soit la page,
+        parcours de idx_image_user puis accès à Prediction par son index unique sur id_image.
+        """
+        self.db.cursor.execute(
+            """
+            SELECT i.id_image, i.nom_fichier, i.date_fichier, p.id_pred,
+                   p.resultat_pred, p.confiance_pred, p.monitor_pred, p.model_version
+            FROM Image i JOIN Prediction p ON p.id_image = i.id_image
+            WHERE i.id_user = ? AND i.id_image < ?
+            ORDER BY i.id_image DESC LIMIT ?
+            """,
+            (id_user, before if before is not None else 2 ** 63 - 1, limit)
+        )
+        return [dict(zip(_HISTORY_FIELDS, row)) for row in self.db.cursor.fetchall()]
+
+    def get_feedback_stats(self, date_debut: str, date_fin: str, model_version: str | None = None) -> list[dict]:
+        """
+        Agrégats par jour et par version du modèle sur [date_debut, date_fin[ (dates 'AAAA-MM-JJ').
+        monitor_pred = 0 signifie « pas de feedback » : exclu de la note moyenne.
+        Lecture de l'index couvrant idx_prediction_date uniquement.
+        """
+        query = """
+            SELECT substr(date_pred, 1, 10) AS jour, model_version, COUNT(*),
+                   SUM(monitor_pred > 0),
+                   ROUND(AVG(CASE WHEN monitor_pred > 0 THEN monitor_pred END), 4),
+                   ROUND(AVG(confiance_pred), 4)
+            FROM Prediction
+            WHERE date_pred >= ? AND date_pred < ?
+        """
+        params: list = [date_debut, date_fin]
+        if model_version is not None:
+            query += " AND model_version = ?"
+            params.append(model_version)
+        query += " GROUP BY jour, model_version ORDER BY jour DESC, model_version"
+        self.db.cursor.execute(query, params)
+        return [dict(zip(_STATS_FIELDS, row)) for row in self.db.cursor.fetchall()]
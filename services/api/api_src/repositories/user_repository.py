@@ -12,6 +12,15 @@ class UserRepository:
             return row[0]
         return None
     
+    def get_credentials_by_username(self, nom_user: str) -> tuple[int, str] | None:
+        """(id_user, mdp_user) en une seule requête (index idx_user_nom)."""
+        self.db.cursor.execute(
+            "SELECT id_user, mdp_user FROM User WHERE nom_user = ?",
+            (nom_user,)
+        )
+        row = self.db.cursor.fetchone()
+        return (row[0], row[1]) if row else None
+
     def get_id_by_username(self, username: str) -> int | None:
         self.db.cursor.execute(
             "SELECT id_user FROM User WHERE nom_user = ?",
@@ -0,0 +1,111 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """La file d'attente de l'executor est pleine (à traduire en HTTP 503)."""
+
+
+class BoundedExecutor:
+    """
+    Pool de threads borné pour les appels bloquants, hors de la boucle asyncio.
+
+    Au-delà de `max_pending` appels en attente ou en cours, `run` lève QueueFullError
+    au lieu d'empiler : l'appelant répond 503 plutôt que de laisser la latence exploser.
+    Sans lien avec torch : sert aussi bien à l'inférence qu'au hachage des mots de passe.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 0,
+        thread_name_prefix: str = "bounded"
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending  # 0 → file non bornée
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix
+        )
+
+        # 📊 Métriques
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    async def run(self, fn, *args, **kwargs):
+        """Exécute fn(*args, **kwargs) dans le pool et attend son résultat."""
+        with self._lock:
+            if self.max_pending and self._pending >= self.max_pending:
+                self._rejected += 1
+                raise QueueFullError("Trop de requêtes en attente, réessayez plus tard")
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+        task = functools.partial(self._timed_call, submitted_at, fn, *args, **kwargs)
+        try:
+            future = self._executor.submit(task)
+        except BaseException:
+            self._release()
+            raise
+        # 🔢 Compté jusqu'à la fin de la tâche dans le pool, pas jusqu'au retour de l'appelant :
+        # une requête annulée (client déconnecté) dont la tâche tourne encore occupe toujours sa place
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def _timed_call(self, submitted_at: float, fn, *args, **kwargs):
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            wait = started_at - submitted_at
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+        failed = False
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            duration = time.perf_counter() - started_at
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._failed += failed
+                self._run_total += duration
+                self._run_max = max(self._run_max, duration)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "queue_depth": self._pending - self._running,
+                "running": self._running,
+                "completed": completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "wait_mean_ms": round(self._wait_total / completed * 1000, 3) if completed else None,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                "run_mean_ms": round(self._run_total / completed * 1000, 3) if completed else None,
+                "run_max_ms": round(self._run_max * 1000, 3),
+            }
@@ -0,0 +1,100 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from api_src.repositories.caption_cache_repository import CaptionCacheRepository
+from src.monitoring.metrics import CACHE_LOOKUPS
+
+
+class CaptionCache:
+    """
+    Cache des légendes indexé par le contenu de l'image.
+
+    Clé = sha256(octets de l'image) + version du modèle + langue : une image
+    ré-uploadée (retry, re-partage) ne repasse pas dans l'encodeur/décodeur.
+    Niveau 1 : LRU en mémoire. Niveau 2 (optionnel) : table SQLite CaptionCache,
+    qui survit aux redémarrages.
+    """
+
+    def __init__(self, max_size: int = 1024, repository: CaptionCacheRepository | None = None):
+        self.max_size = max_size
+        self.repository = repository
+        self._entries: OrderedDict[str, tuple[str, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 📊 Compteurs
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.persistent_errors = 0
+
+    @staticmethod
+    def make_key(file_bytes: bytes, model_version: str, lang: str) -> str:
+        return f"{hashlib.sha256(file_bytes).hexdigest()}:{model_version}:{lang}"
+
+    def get(self, key: str) -> tuple[str, list[float]] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                CACHE_LOOKUPS.inc(cache="caption", result="hit")
+                return entry
+
+        # 💽 Niveau SQLite hors du verrou : les hits mémoire n'attendent jamais le disque
+        entry = None
+        if self.repository is not None:
+            try:
+                entry = self.repository.get(key)
+            except sqlite3.Error as e:
+                # Base verrouillée ou indisponible : compté comme un miss, la prédiction est recalculée
+                with self._lock:
+                    self.persistent_errors += 1
+                print(f"{e} (cache persistant ignoré pour cette lecture)")
+
+        with self._lock:
+            if entry is not None:
+                self.persistent_hits += 1
+                CACHE_LOOKUPS.inc(cache="caption", result="persistent_hit")
+                self._store(key, entry)
+                return entry
+            self.misses += 1
+            CACHE_LOOKUPS.inc(cache="caption", result="miss")
+            return None
+
+    def put(self, key: str, caption: str, confidences: list[float]):
+        with self._lock:
+            self._store(key, (caption, list(confidences)))
+
+        if self.repository is not None:
+            try:
+                self.repository.put(key, caption, confidences)
+            except Exception as e:
+                # Le niveau mémoire reste valide : un échec d'écriture ne fait pas échouer la prédiction
+                with self._lock:
+                    self.persistent_errors += 1
+                print(f"{e} (légende conservée en mémoire seulement)")
+
+    def _store(self, key: str, entry: tuple[str, list[float]]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.persistent_hits + self.misses
+            return {
+                "max_size": self.max_size,
+                "size": len(self._entries),
+                "persistent": self.repository is not None,
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "persistent_errors": self.persistent_errors,
+                "hit_ratio": round((self.hits + self.persistent_hits) / lookups, 4) if lookups else None,
+            }
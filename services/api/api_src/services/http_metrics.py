@@ -0,0 +1,51 @@
+import time
+
+from src.monitoring.metrics import counter, histogram
+
+HTTP_REQUESTS = counter("http_requests_total", "Requêtes HTTP traitées", ["method", "route", "status"])
+HTTP_REQUEST_SECONDS = histogram("http_request_duration_seconds", "Durée des requêtes HTTP", ["method", "route"])
+HTTP_EXCEPTIONS = counter("http_request_exceptions_total", "Exceptions non gérées pendant une requête", ["method", "route"])
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI : nombre, statut et durée des requêtes par route.
+
+    Le label `route` est le chemin déclaré (/jobs/{id_job}), pas l'URL reçue :
+    le nombre de séries reste borné. Requêtes sans route (404, 413 du
+    ContentLengthLimitMiddleware) : route="unmatched".
+    """
+
+    def __init__(self, app, excluded_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    @staticmethod
+    def _route(scope) -> str:
+        # Route choisie par le routeur (renseignée dans le scope une fois la requête traitée)
+        return getattr(scope.get("route"), "path", None) or "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            HTTP_EXCEPTIONS.inc(method=method, route=self._route(scope))
+            raise
+        finally:
+            route = self._route(scope)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method=method, route=route)
@@ -1,15 +1,42 @@
+import time
+
 from api_src.repositories.image_repository import ImageRepository
 from api_src.inference.pipeline import InferencePipeline
-from PIL import Image
-import io
+from api_src.inference.model_registry import get_default_pipeline
+from api_src.inference.batch_scheduler import BatchScheduler
+from api_src.inference.executor import InferenceExecutor, QueueFullError
+from api_src.inference.image_decoder import ImageTooLargeError
+from api_src.services.caption_cache import CaptionCache
+from api_src.services.prediction_writer import PredictionWriter
+from src.monitoring.metrics import counter, histogram
+
+# 📊 mode : direct (appel synchrone), batched (file de micro-batching), multi (/upload_images)
+PREDICTION_SECONDS = histogram(
+    "prediction_seconds", "Latence de bout en bout : cache, décodage, modèle et enregistrement", ["mode"]
+)
+PREDICTION_ERRORS = counter("prediction_errors_total", "Prédictions en échec", ["mode", "reason"])
 
 class ImageService:
-    def __init__(self, image_repository: ImageRepository):
+    def __init__(
+        self,
+        image_repository: ImageRepository,
+        pipeline: InferencePipeline | None = None,
+        caption_cache: CaptionCache | None = None,
+        prediction_writer: PredictionWriter | None = None
+    ):
         self.image_repository = image_repository 
-        self.pipeline = InferencePipeline(
-            decoder_path="outputs/20250625_115742/decoder.pt",
-            tokenizer_path="data/vocab/tokenizer.pkl"
-        )
+        # ♻️ Modèles partagés : chargés une seule fois par processus (cf. ModelRegistry)
+        self.pipeline = pipeline or get_default_pipeline()
+        self.caption_cache = caption_cache
+        # ✍️ Écriture différée des prédictions unitaires (None → écriture synchrone)
+        self.prediction_writer = prediction_writer
+
+    def _cache_lookup(self, file_bytes: bytes, translate: bool) -> tuple[str | None, tuple | None]:
+        """Retourne (clé, (caption, confidences)) ; (None, None) si le cache est désactivé."""
+        if self.caption_cache is None:
+            return None, None
+        key = CaptionCache.make_key(file_bytes, self.pipeline.model_version, "fr" if translate else "en")
+        return key, self.caption_cache.get(key)
 
     def save_image_and_predict(
         self,
@@ -19,31 +46,190 @@ class ImageService:
         monitor_pred: int,
         translate: bool = False  # 👈 Ajout ici
     ) -> dict:
+        start = time.perf_counter()
+        try:
+            cache_key, cached = self._cache_lookup(file_bytes, translate)
+            if cached is not None:
+                caption, confidences = cached
+            else:
+                image = self.pipeline.preprocess(file_bytes)
+
+                # 📸 Génération de la légende (avec ou sans traduction)
+                caption, confidences = self.pipeline.predict_batch([image], translate=translate)[0]
+                self._cache_store(cache_key, caption, confidences)
+
+            return self._save_result(nom_fichier, id_user, caption, confidences, monitor_pred)
+
+        except ImageTooLargeError:
+            PREDICTION_ERRORS.inc(mode="direct", reason="image_too_large")
+            raise
+        except Exception as e:
+            PREDICTION_ERRORS.inc(mode="direct", reason="error")
+            return {"success": False, "message": str(e)}
+        finally:
+            PREDICTION_SECONDS.observe(time.perf_counter() - start, mode="direct")
+
+    async def save_image_and_predict_batched(
+        self,
+        scheduler: BatchScheduler,
+        executor: InferenceExecutor,
+        nom_fichier: str,
+        id_user: int,
+        file_bytes: bytes,
+        monitor_pred: int,
+        translate: bool = False
+    ) -> dict:
+        """
+        Variante de save_image_and_predict passant par la file de micro-batching.
+        Décodage de l'image et écritures en base (cache des légendes compris) tournent dans
+        l'executor, jamais sur la boucle asyncio.
+        """
+        start = time.perf_counter()
         try:
-            image = Image.open(io.BytesIO(file_bytes)).convert("RGB")
+            cache_key, cached = await executor.run(self._cache_lookup, file_bytes, translate)
+            if cached is not None:
+                caption, confidences = cached
+            else:
+                image = await executor.run(self.pipeline.preprocess, file_bytes)
+
+                # 📦 Inférence regroupée avec les autres requêtes en cours
+                caption, confidences = await scheduler.submit(image, translate=translate)
+                return await executor.run(
+                    self._cache_and_save_result, cache_key, nom_fichier, id_user, caption, confidences, monitor_pred
+                )
+
+            return await executor.run(self._save_result, nom_fichier, id_user, caption, confidences, monitor_pred)
 
-            # 📸 Génération de la légende (avec ou sans traduction)
-            caption, confidences = self.pipeline.captioner.generate(image, translate=translate)
+        except QueueFullError:
+            PREDICTION_ERRORS.inc(mode="batched", reason="queue_full")
+            raise
+        except ImageTooLargeError:
+            PREDICTION_ERRORS.inc(mode="batched", reason="image_too_large")
+            raise
+        except Exception as e:
+            PREDICTION_ERRORS.inc(mode="batched", reason="error")
+            return {"success": False, "message": str(e)}
+        finally:
+            PREDICTION_SECONDS.observe(time.perf_counter() - start, mode="batched")
+
+    def predict_images(
+        self,
+        images_bytes: list[bytes],
+        translate: bool = False,
+        max_batch_size: int = 8
+    ) -> list[tuple[str, list[float]] | str]:
+        """
+        Légendes de plusieurs images : cache, puis un passage encodeur+décodeur par lot
+        de `max_batch_size` images. Retourne (caption, confidences) par image, ou le message
+        d'erreur si l'image n'a pas pu être décodée (illisible ou trop grande).
+        """
+        outputs: list[tuple[str, list[float]] | str | None] = [None] * len(images_bytes)
+        to_predict: list[tuple[int, str | None, object]] = []  # (index, clé de cache, image décodée)
+        for index, file_bytes in enumerate(images_bytes):
+            cache_key, cached = self._cache_lookup(file_bytes, translate)
+            if cached is not None:
+                outputs[index] = cached
+                continue
+            try:
+                image = self.pipeline.preprocess(file_bytes)
+            except Exception as e:
+                outputs[index] = str(e) or "Image illisible"
+                continue
+            to_predict.append((index, cache_key, image))
+
+        # 📦 Inférence par lots
+        for start in range(0, len(to_predict), max_batch_size):
+            chunk = to_predict[start:start + max_batch_size]
+            results = self.pipeline.predict_batch([image for _, _, image in chunk], translate=translate)
+            for (index, cache_key, _), (caption, confidences) in zip(chunk, results):
+                outputs[index] = (caption, confidences)
+                self._cache_store(cache_key, caption, confidences)
+        return outputs
+
+    def save_images_and_predict(
+        self,
+        files: list[tuple[str, bytes]],
+        id_user: int,
+        monitor_pred: int,
+        translate: bool = False,
+        max_batch_size: int = 8
+    ) -> dict:
+        """
+        Variante multi-images : inférence par lots (cf. predict_images) et une seule
+        transaction pour toutes les lignes Image/Prediction.
+        Une image illisible ou trop grande n'échoue que pour elle (résultat avec success=False).
+        """
+        results: list[dict] = [{"success": False, "nom_fichier": nom_fichier} for nom_fichier, _ in files]
+        start = time.perf_counter()
+        try:
+            outputs = self.predict_images([file_bytes for _, file_bytes in files], translate, max_batch_size)
+            indices = [index for index, output in enumerate(outputs) if not isinstance(output, str)]
+            for index, output in enumerate(outputs):
+                if isinstance(output, str):
+                    results[index]["message"] = output
+                    PREDICTION_ERRORS.inc(mode="multi", reason="unreadable_image")
 
-            # 💾 Enregistrement (inchangé)
-            image_id, prediction_id = self.image_repository.save_prediction(
+            # 💾 Enregistrement de tout le lot en une transaction
+            ids = self.image_repository.save_predictions(
                 user_id=id_user,
-                filename=nom_fichier,
-                caption=caption,
-                confidences=confidences,
-                monitor_pred=monitor_pred
+                predictions=[(files[i][0], *outputs[i]) for i in indices],
+                monitor_pred=monitor_pred,
+                model_version=self.pipeline.model_version
             )
+            for index, (image_id, prediction_id) in zip(indices, ids):
+                caption, confidences = outputs[index]
+                results[index].update(
+                    success=True,
+                    id_image=image_id,
+                    id_prediction=prediction_id,
+                    resultat_pred=caption,
+                    confiance_pred=confidences
+                )
 
-            return {
-                "success": True,
-                "id_image": image_id,
-                "id_prediction": prediction_id,
-                "resultat_pred": caption,
-                "confiance_pred": confidences
-            }
+            return {"success": True, "results": results}
 
         except Exception as e:
+            PREDICTION_ERRORS.inc(mode="multi", reason="error")
             return {"success": False, "message": str(e)}
+        finally:
+            PREDICTION_SECONDS.observe(time.perf_counter() - start, mode="multi")
+
+    def _cache_store(self, cache_key: str | None, caption: str, confidences: list[float]):
+        if cache_key is not None:
+            self.caption_cache.put(cache_key, caption, confidences)
+
+    def _cache_and_save_result(
+        self,
+        cache_key: str | None,
+        nom_fichier: str,
+        id_user: int,
+        caption: str,
+        confidences: list[float],
+        monitor_pred: int
+    ) -> dict:
+        # ♻️ Mise en cache et enregistrement dans le même appel à l'executor
+        self._cache_store(cache_key, caption, confidences)
+        return self._save_result(nom_fichier, id_user, caption, confidences, monitor_pred)
+
+    def _save_result(self, nom_fichier: str, id_user: int, caption: str, confidences: list[float], monitor_pred: int) -> dict:
+        # 💾 Enregistrement (en file si l'écriture différée est active, identifiants déjà attribués)
+        repository = self.prediction_writer or self.image_repository
+        image_id, prediction_id = repository.save_prediction(
+            user_id=id_user,
+            filename=nom_fichier,
+            caption=caption,
+            confidences=confidences,
+            monitor_pred=monitor_pred,
+            model_version=self.pipeline.model_version
+        )
+
+        return {
+            "success": True,
+            "id_image": image_id,
+            "id_prediction": prediction_id,
+            "resultat_pred": caption,
+            "confiance_pred": confidences
+        }
 
     def run_inference(self, file_bytes):
         try:
@@ -54,6 +240,9 @@ class ImageService:
     
         
     def save_feedback(self, id_image: int, id_user: int, monitor_pred: int) -> dict:
+        # La prédiction peut être encore en file : on attend son écriture avant la mise à jour
+        if self.prediction_writer is not None:
+            self.prediction_writer.flush()
         # Appelle le repo pour mettre à jour la colonne monitor_pred dans Prediction
         updated = self.image_repository.update_monitor_pred(id_image, monitor_pred)
         if not updated:
@@ -0,0 +1,74 @@
+from api_src.repositories.job_repository import JobRepository
+from api_src.services.image_service import ImageService
+
+
+class JobService:
+    """
+    Jobs de légendage en masse : création, suivi, annulation, et traitement par lots
+    d'items (appelé par le JobWorker, jamais depuis la boucle asyncio).
+    """
+
+    def __init__(self, job_repository: JobRepository, image_service: ImageService):
+        self.job_repository = job_repository
+        self.image_service = image_service
+
+    def create_job(self, id_user: int, translate: bool, files: list[tuple[str, bytes | None, str | None]]) -> dict:
+        try:
+            id_job = self.job_repository.create_job(id_user, "fr" if translate else "en", files)
+            return {"success": True, "job": self.job_repository.get_job(id_job)}
+        except Exception as e:
+            return {"success": False, "message": str(e)}
+
+    def get_job(self, id_job: int, id_user: int) -> dict | None:
+        # 🔒 Un utilisateur ne voit que ses propres jobs
+        job = self.job_repository.get_job(id_job)
+        if job is None or job["id_user"] != id_user:
+            return None
+        return job
+
+    def list_jobs(self, id_user: int, limit: int = 50) -> list[dict]:
+        return self.job_repository.list_jobs(id_user, limit)
+
+    def get_items(self, id_job: int, id_user: int, after: int = -1, limit: int = 100) -> list[dict] | None:
+        if self.get_job(id_job, id_user) is None:
+            return None
+        return self.job_repository.get_items(id_job, after, limit)
+
+    def cancel_job(self, id_job: int) -> bool:
+        return self.job_repository.cancel_job(id_job)
+
+    # ⚙️ Traitement (JobWorker)
+
+    def start_job(self, id_job: int) -> dict | None:
+        return self.job_repository.start_job(id_job)
+
+    def process_chunk(self, id_job: int, id_user: int, translate: bool, batch_size: int) -> int | None:
+        """
+        Traite les `batch_size` prochains items en attente.
+        Retourne le nombre d'items traités (0 → plus rien à faire), None si le job a été annulé.
+        """
+        items = self.job_repository.next_items(id_job, batch_size)
+        if not items:
+            return 0
+
+        outputs = self.image_service.predict_images([contenu for _, _, contenu in items], translate, batch_size)
+        done, failed = [], []
+        for (id_item, nom_fichier, _), output in zip(items, outputs):
+            if isinstance(output, str):
+                failed.append((id_item, output))
+            else:
+                done.append((id_item, nom_fichier, *output))
+
+        model_version = self.image_service.pipeline.model_version
+        if not self.job_repository.complete_items(id_job, id_user, done, failed, model_version):
+            return None
+        return len(items)
+
+    def finish_job(self, id_job: int) -> bool:
+        return self.job_repository.finish_job(id_job)
+
+    def fail_job(self, id_job: int, message: str):
+        self.job_repository.fail_job(id_job, message)
+
+    def requeue_unfinished(self) -> list[int]:
+        return self.job_repository.requeue_unfinished()
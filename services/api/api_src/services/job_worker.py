@@ -0,0 +1,152 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from api_src.database.database import Database
+from api_src.inference.pipeline import InferencePipeline
+from api_src.inference.executor import InferenceExecutor, QueueFullError
+from api_src.repositories.image_repository import ImageRepository
+from api_src.repositories.job_repository import JobRepository
+from api_src.services.caption_cache import CaptionCache
+from api_src.services.image_service import ImageService
+from api_src.services.job_service import JobService
+
+
+@dataclass
+class _JobProgress:
+    remaining: int
+    processed: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+
+class JobWorker:
+    """
+    Traitement en arrière-plan des jobs de légendage (file locale, sans broker).
+
+    `max_workers` tâches asyncio consomment la file des jobs ; chacune traite son job
+    par lots de `batch_size` images dans l'executor d'inférence, en alternance avec
+    les requêtes interactives. L'état est en base : annulation vue au lot suivant,
+    jobs interrompus repris au démarrage.
+    """
+
+    def __init__(
+        self,
+        pipeline: InferencePipeline,
+        executor: InferenceExecutor | None = None,
+        caption_cache: CaptionCache | None = None,
+        max_workers: int = 1,
+        batch_size: int = 8
+    ):
+        self.pipeline = pipeline
+        self.executor = executor
+        self.caption_cache = caption_cache
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._progress: dict[int, _JobProgress] = {}
+
+        # 📊 Métriques
+        self._jobs_completed = 0
+        self._jobs_cancelled = 0
+        self._jobs_failed = 0
+        self._items_processed = 0
+        self._busy_time = 0.0
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        # Les connexions SQLite sont celles du thread qui exécute chaque appel (cf. ConnectionPool)
+        db = Database()
+        service = JobService(JobRepository(db), ImageService(ImageRepository(db), self.pipeline, self.caption_cache))
+
+        # ♻️ Reprise des jobs interrompus par un arrêt
+        for id_job in await self._call(service.requeue_unfinished):
+            self._queue.put_nowait(id_job)
+
+        self._tasks = [asyncio.create_task(self._run(service)) for _ in range(self.max_workers)]
+
+    async def stop(self):
+        # Les jobs en cours restent 'running' en base et seront repris au prochain démarrage
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def submit(self, id_job: int):
+        if self._queue is None:
+            raise RuntimeError("JobWorker non démarré")
+        await self._queue.put(id_job)
+
+    async def _call(self, fn, *args):
+        if self.executor is None:
+            return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+        while True:
+            try:
+                return await self.executor.run(fn, *args)
+            except QueueFullError:
+                # Les requêtes interactives sont prioritaires : on retente un peu plus tard
+                await asyncio.sleep(0.5)
+
+    async def _run(self, service: JobService):
+        while True:
+            id_job = await self._queue.get()
+            try:
+                await self._process_job(service, id_job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Erreur lors du traitement du job {id_job} : {e}")
+                self._jobs_failed += 1
+                await self._call(service.fail_job, id_job, str(e))
+
+    async def _process_job(self, service: JobService, id_job: int):
+        job = await self._call(service.start_job, id_job)
+        if job is None:
+            return  # annulé ou déjà traité
+
+        translate = job["langue"] == "fr"
+        progress = _JobProgress(remaining=job["nb_restants"])
+        self._progress[id_job] = progress
+        try:
+            while True:
+                start = time.perf_counter()
+                processed = await self._call(service.process_chunk, id_job, job["id_user"], translate, self.batch_size)
+                self._busy_time += time.perf_counter() - start
+                if processed is None:
+                    self._jobs_cancelled += 1
+                    return
+                if processed == 0:
+                    await self._call(service.finish_job, id_job)
+                    self._jobs_completed += 1
+                    return
+                progress.processed += processed
+                progress.remaining = max(progress.remaining - processed, 0)
+                self._items_processed += processed
+        finally:
+            self._progress.pop(id_job, None)
+
+    def progress(self, id_job: int) -> dict:
+        """Débit et temps restant estimé d'un job en cours de traitement ({} sinon)."""
+        progress = self._progress.get(id_job)
+        if progress is None or progress.processed == 0:
+            return {}
+        rate = progress.processed / (time.perf_counter() - progress.started_at)
+        return {"debit_items_s": round(rate, 3), "eta_s": round(progress.remaining / rate, 1)}
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "batch_size": self.batch_size,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "jobs_running": len(self._progress),
+            "jobs_completed": self._jobs_completed,
+            "jobs_cancelled": self._jobs_cancelled,
+            "jobs_failed": self._jobs_failed,
+            "items_processed": self._items_processed,
+            "items_per_s": round(self._items_processed / self._busy_time, 3) if self._busy_time else None,
+        }
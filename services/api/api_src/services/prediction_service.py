@@ -0,0 +1,46 @@
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from api_src.repositories.prediction_repository import PredictionRepository
+from api_src.services.prediction_writer import PredictionWriter
+
+
+class PredictionService:
+    """Historique des prédictions d'un utilisateur et statistiques des feedbacks."""
+
+    MAX_STATS_DAYS = 366
+
+    def __init__(self, prediction_repository: PredictionRepository, prediction_writer: PredictionWriter | None = None):
+        self.prediction_repository = prediction_repository
+        self.prediction_writer = prediction_writer
+
+    def get_history(self, id_user: int, before: int | None = None, limit: int = 50) -> list[dict]:
+        # Les dernières prédictions peuvent être encore en file (écriture différée)
+        if self.prediction_writer is not None:
+            self.prediction_writer.flush()
+        return self.prediction_repository.get_history(id_user, before, limit)
+
+    def get_feedback_stats(
+        self,
+        date_debut: date | None = None,
+        date_fin: date | None = None,
+        model_version: str | None = None
+    ) -> dict:
+        """Statistiques par jour sur [date_debut, date_fin] (bornes incluses, 30 derniers jours par défaut)."""
+        date_fin = date_fin or datetime.now(pytz.timezone("Europe/Paris")).date()
+        date_debut = date_debut or date_fin - timedelta(days=29)
+        if date_debut > date_fin:
+            return {"success": False, "message": "date_debut doit précéder date_fin"}
+        if (date_fin - date_debut).days >= self.MAX_STATS_DAYS:
+            return {"success": False, "message": f"Période limitée à {self.MAX_STATS_DAYS} jours"}
+
+        stats = self.prediction_repository.get_feedback_stats(
+            date_debut.isoformat(), (date_fin + timedelta(days=1)).isoformat(), model_version
+        )
+        return {
+            "success": True,
+            "date_debut": date_debut.isoformat(),
+            "date_fin": date_fin.isoformat(),
+            "stats": stats
+        }
@@ -0,0 +1,230 @@
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+from api_src.repositories.image_repository import ImageRepository
+from src.inference.decoding import mean_confidence
+
+
+@dataclass
+class _PendingRow:
+    row: tuple
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+_STOP = object()
+_FLUSH = object()
+
+
+class PredictionWriter:
+    """
+    Écriture différée (write-behind) des lignes Image/Prediction.
+
+    `save_prediction` réserve les identifiants par blocs (cf. ImageRepository.reserve_ids),
+    met la ligne en file et rend la main : la réponse contient déjà id_image et id_prediction.
+    Un thread dédié écrit la file par lots de `max_batch_size` lignes (ou après `max_delay_ms`)
+    en une transaction ; si le lot échoue deux fois, ses lignes sont réécrites une à une
+    (`max_retries` essais chacune) et seules celles en erreur sont perdues.
+    `flush()` attend que tout ce qui a été mis en file soit écrit ;
+    `stop()` vide la file avant de rendre la main.
+    """
+
+    def __init__(
+        self,
+        image_repository: ImageRepository,
+        max_batch_size: int = 256,
+        max_delay_ms: float = 50.0,
+        id_block_size: int = 64,
+        max_retries: int = 3
+    ):
+        self.image_repository = image_repository
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self.id_block_size = id_block_size
+        self.max_retries = max_retries
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+        # 🔢 Bloc d'identifiants réservés
+        self._id_lock = threading.Lock()
+        self._next_image = 0
+        self._next_prediction = 0
+        self._ids_left = 0
+
+        # 📊 Métriques (protégées par la condition, qui sert aussi à flush())
+        self._cond = threading.Condition()
+        self._enqueued = 0
+        self._processed = 0
+        self._failed = 0
+        self._row_fallbacks = 0  # lots réécrits ligne par ligne après un échec
+        self._batches = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._in_flight_since: float | None = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="prediction-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 30.0):
+        """Écrit tout ce qui est en file puis arrête le thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _allocate_ids(self) -> tuple[int, int]:
+        with self._id_lock:
+            if self._ids_left == 0:
+                self._next_image, self._next_prediction = self.image_repository.reserve_ids(self.id_block_size)
+                self._ids_left = self.id_block_size
+            ids = (self._next_image, self._next_prediction)
+            self._next_image += 1
+            self._next_prediction += 1
+            self._ids_left -= 1
+            return ids
+
+    def save_prediction(
+        self,
+        user_id: int,
+        filename: str,
+        caption: str,
+        confidences: list[float],
+        monitor_pred: int,
+        model_version: str | None = None
+    ) -> tuple[int, int]:
+        """Même contrat que ImageRepository.save_prediction, sans attendre l'écriture en base."""
+        if self._thread is None:
+            raise RuntimeError("PredictionWriter non démarré")
+
+        id_image, id_prediction = self._allocate_ids()
+        confidence_avg = mean_confidence(confidences)
+        now_local = self.image_repository.db._get_local_now()
+        with self._cond:
+            self._enqueued += 1
+        self._queue.put(_PendingRow(
+            (id_image, id_prediction, user_id, filename, now_local, caption, confidence_avg, monitor_pred, model_version)
+        ))
+        return id_image, id_prediction
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """Attend l'écriture de tout ce qui a été mis en file jusqu'ici (False si timeout)."""
+        with self._cond:
+            target = self._enqueued
+            if self._processed >= target:
+                return True
+        # ⏩ Le lot en cours de constitution est écrit sans attendre max_delay_ms
+        self._queue.put(_FLUSH)
+        with self._cond:
+            return self._cond.wait_for(lambda: self._processed >= target, timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            if item is _FLUSH:
+                continue
+            batch = [item]
+            deadline = time.perf_counter() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=max(timeout, 0)) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                if item is _FLUSH:
+                    break
+                batch.append(item)
+            self._write(batch)
+
+        # 💾 Arrêt : tout ce qui reste en file est écrit
+        remaining = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and item is not _FLUSH:
+                remaining.append(item)
+        for start in range(0, len(remaining), self.max_batch_size):
+            self._write(remaining[start:start + self.max_batch_size])
+
+    def _insert(self, rows: list[tuple], attempts: int) -> Exception | None:
+        """Insère les lignes en une transaction ; retourne la dernière erreur, None si écrites."""
+        error = None
+        for attempt in range(attempts):
+            try:
+                self.image_repository.insert_predictions(rows)
+                return None
+            except sqlite3.IntegrityError as e:
+                return e  # ligne invalide : réessayer ne changera rien
+            except Exception as e:
+                error = e  # base verrouillée, disque plein… : nouvel essai après une pause
+                if attempt + 1 < attempts:
+                    time.sleep(0.05 * 2 ** attempt)
+        return error
+
+    def _write(self, batch: list[_PendingRow]):
+        with self._cond:
+            self._in_flight_since = batch[0].enqueued_at
+        rows = [pending.row for pending in batch]
+
+        # 1️⃣ Tout le lot en une transaction (un second essai si l'erreur semble passagère)
+        dropped = []
+        error = self._insert(rows, attempts=2)
+        if error is not None:
+            # 2️⃣ Ligne par ligne : une ligne en erreur ne fait pas perdre les autres,
+            # dont les identifiants ont déjà été rendus aux clients
+            for row in rows:
+                row_error = self._insert([row], attempts=self.max_retries)
+                if row_error is not None:
+                    dropped.append(row)
+                    error = row_error
+        if dropped:
+            ids = ", ".join(f"{id_image}/{id_pred}" for id_image, id_pred, *_ in dropped)
+            print(f"Erreur lors de l'écriture différée ({len(dropped)} prédiction(s) perdue(s), id_image/id_pred : {ids}) : {error}")
+
+        now = time.perf_counter()
+        with self._cond:
+            for pending in batch:
+                lag = now - pending.enqueued_at
+                self._lag_total += lag
+                self._lag_max = max(self._lag_max, lag)
+            self._processed += len(batch)
+            self._failed += len(dropped)
+            self._row_fallbacks += error is not None
+            self._batches += 1
+            self._in_flight_since = None
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._queue.mutex:
+            oldest = next((p.enqueued_at for p in self._queue.queue if isinstance(p, _PendingRow)), None)
+        with self._cond:
+            if self._in_flight_since is not None:
+                oldest = self._in_flight_since if oldest is None else min(oldest, self._in_flight_since)
+            processed = self._processed
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_delay_ms": self.max_delay * 1000,
+                "queue_depth": self._enqueued - processed,
+                "enqueued": self._enqueued,
+                "written": processed - self._failed,
+                "failed": self._failed,
+                "batches": self._batches,
+                "row_fallbacks": self._row_fallbacks,
+                "batch_size_mean": round(processed / self._batches, 3) if self._batches else None,
+                # ⏳ Retard de la file : âge de la plus ancienne ligne pas encore écrite
+                "queue_lag_ms": round((time.perf_counter() - oldest) * 1000, 3) if oldest is not None else 0.0,
+                "lag_mean_ms": round(self._lag_total / processed * 1000, 3) if processed else None,
+                "lag_max_ms": round(self._lag_max * 1000, 3),
+            }
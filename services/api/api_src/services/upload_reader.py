@@ -0,0 +1,199 @@
+import io
+import json
+import threading
+import time
+from fastapi import UploadFile
+from starlette.exceptions import HTTPException
+from PIL import Image
+
+
+class UploadTooLargeError(Exception):
+    """Fichier trop lourd ou image trop grande (à traduire en HTTP 413)."""
+
+
+class UnsupportedMediaTypeError(Exception):
+    """Le contenu n'est pas un format d'image accepté (à traduire en HTTP 415)."""
+
+
+# 🔎 Signatures des formats acceptés (lues dans les premiers octets, pas dans l'extension)
+_SIGNATURES = [
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"BM", "BMP"),
+]
+
+
+def sniff_format(head: bytes) -> str | None:
+    for signature, fmt in _SIGNATURES:
+        if head.startswith(signature):
+            return fmt
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+class UploadReader:
+    """
+    Lecture des fichiers envoyés par morceaux, avec limites appliquées au fil de la lecture :
+
+    - format détecté sur les premiers octets → 415 avant de lire la suite ;
+    - dimensions lues dans l'en-tête dès qu'il est complet → 413 si trop de pixels ;
+    - 413 dès que `max_bytes` est dépassé, sans lire le reste du fichier.
+
+    La mémoire tenue par requête est donc bornée par `max_bytes` (+1 octet).
+    """
+
+    HEADER_CHUNK = 64 * 1024  # premier morceau : signature + en-tête de la plupart des images
+    HEADER_MAX_BYTES = 256 * 1024  # au-delà, on renonce à lire les dimensions (le décodeur les vérifiera)
+
+    def __init__(self, max_bytes: int = 20 * 1024 * 1024, max_pixels: int = 50_000_000, chunk_size: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.chunk_size = chunk_size
+
+        # 📊 Métriques
+        self._lock = threading.Lock()
+        self._accepted = 0
+        self._rejected_bytes = 0
+        self._rejected_pixels = 0
+        self._rejected_format = 0
+        self._bytes_total = 0
+        self._bytes_max = 0
+        self._read_total = 0.0
+
+    async def read(self, file: UploadFile) -> bytearray:
+        """
+        Retourne le contenu dans un seul tampon (bytearray, sans copie finale) :
+        hashlib et le décodeur d'image l'acceptent comme des bytes.
+        """
+        start = time.perf_counter()
+        # Taille connue du fichier déjà reçu : échec immédiat
+        if file.size is not None and file.size > self.max_bytes:
+            self._reject("bytes")
+            raise UploadTooLargeError(f"Fichier trop volumineux (limite {self.max_bytes // 2**20} Mo)")
+
+        buffer = bytearray()
+        header_checked = False
+        while True:
+            # En-tête : 64 Ko, puis une seule relance jusqu'à HEADER_MAX_BYTES (le parseur JPEG de PIL est linéaire)
+            if header_checked:
+                read_size = self.chunk_size
+            else:
+                read_size = self.HEADER_CHUNK if not buffer else self.HEADER_MAX_BYTES - len(buffer)
+            # Jamais plus de max_bytes + 1 octets lus : assez pour savoir que la limite est dépassée
+            chunk = await file.read(min(read_size, self.max_bytes + 1 - len(buffer)))
+            if not chunk:
+                break
+            if not buffer and sniff_format(chunk) is None:
+                self._reject("format")
+                raise UnsupportedMediaTypeError("Format non supporté (JPEG, PNG, WEBP ou BMP attendu)")
+            buffer += chunk
+            if len(buffer) > self.max_bytes:
+                self._reject("bytes")
+                raise UploadTooLargeError(f"Fichier trop volumineux (limite {self.max_bytes // 2**20} Mo)")
+
+            if not header_checked:
+                header_checked = self._check_dimensions(buffer) or len(buffer) >= self.HEADER_MAX_BYTES
+
+        if not buffer:
+            self._reject("format")
+            raise UnsupportedMediaTypeError("Fichier vide")
+
+        size = len(buffer)
+        with self._lock:
+            self._accepted += 1
+            self._bytes_total += size
+            self._bytes_max = max(self._bytes_max, size)
+            self._read_total += time.perf_counter() - start
+        return buffer
+
+    def _check_dimensions(self, head: bytearray) -> bool:
+        """True si les dimensions ont pu être lues (et sont acceptables) ; lève UploadTooLargeError sinon."""
+        try:
+            width, height = Image.open(io.BytesIO(head)).size  # en-tête seulement, aucun décodage
+        except Exception:
+            return False  # en-tête incomplet : on réessaie avec le morceau suivant
+        if width * height > self.max_pixels:
+            self._reject("pixels")
+            raise UploadTooLargeError(
+                f"Image trop grande ({width}x{height}, limite {self.max_pixels / 1e6:.0f} Mpx)"
+            )
+        return True
+
+    def _reject(self, reason: str):
+        with self._lock:
+            if reason == "bytes":
+                self._rejected_bytes += 1
+            elif reason == "pixels":
+                self._rejected_pixels += 1
+            else:
+                self._rejected_format += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            accepted = self._accepted
+            return {
+                "max_bytes": self.max_bytes,
+                "max_pixels": self.max_pixels,
+                "accepted": accepted,
+                "rejected_too_large": self._rejected_bytes,
+                "rejected_too_many_pixels": self._rejected_pixels,
+                "rejected_unsupported": self._rejected_format,
+                "bytes_mean": round(self._bytes_total / accepted) if accepted else None,
+                "bytes_max": self._bytes_max,  # plus gros buffer tenu par une requête
+                "read_mean_ms": round(self._read_total / accepted * 1000, 3) if accepted else None,
+            }
+
+
+class ContentLengthLimitMiddleware:
+    """
+    Middleware ASGI : 413 si le corps de la requête dépasse `max_bytes`
+    (ou la limite propre au chemin dans `path_limits`).
+
+    - Content-Length annoncé trop grand → 413 immédiat, avant que le corps multipart
+      ne soit lu et stocké par Starlette ;
+    - sans Content-Length (Transfer-Encoding: chunked) ou s'il est faux → les octets
+      réellement reçus sont comptés, et la lecture du corps lève un 413 dès la limite passée.
+    """
+
+    def __init__(self, app, max_bytes: int, path_limits: dict[str, int] | None = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.path_limits.get(scope["path"], self.max_bytes)
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > max_bytes:
+                    body = json.dumps({"detail": "Requête trop volumineuse"}).encode()
+                    await send({
+                        "type": "http.response.start",
+                        "status": 413,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode()),
+                            (b"connection", b"close"),
+                        ],
+                    })
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                break
+
+        received = 0
+
+        async def receive_limited():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # Remonte du parseur multipart jusqu'au gestionnaire d'exceptions de FastAPI → 413
+                    raise HTTPException(status_code=413, detail="Requête trop volumineuse")
+            return message
+
+        await self.app(scope, receive_limited, send)
@@ -8,15 +8,13 @@ class UserService:
         self.user_repository = user_repository
 
     def authenticate(self, nom_user: str, mdp_user: str) -> AuthResult:
-        hashed_password = self.user_repository.get_password_hash_by_username(nom_user)
-        if not hashed_password:
+        # ⚠️ bcrypt : plusieurs dizaines de ms de CPU, à appeler hors de la boucle asyncio
+        credentials = self.user_repository.get_credentials_by_username(nom_user)
+        if credentials is None:
             return AuthResult(success=False, message="Utilisateur ou mot de passe incorrect")
 
+        id_user, hashed_password = credentials
         if verify_password(mdp_user, hashed_password):
-            id_user = self.get_id_by_username(nom_user)
-            if id_user is None:
-                return AuthResult(success=False, message="Utilisateur introuvable")
-
             access_token = create_access_token(data={"sub": nom_user, "id_user": id_user})
             return AuthResult(success=True, access_token=access_token, token_type="bearer")
 
@@ -1,18 +1,152 @@
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 import sys
 from pathlib import Path
 
+import torch
+
 # Ajout du chemin 'services/api/' au PYTHONPATH
 sys.path.append(str(Path(__file__).resolve().parent))
 
 from api_src.controllers.user_controller import user_router
 from api_src.controllers.image_controller import image_router
+from api_src.controllers.monitoring_controller import monitoring_router
+from api_src.controllers.job_controller import job_router
+from api_src.controllers.prediction_controller import prediction_router
+from api_src.inference.model_registry import model_registry, get_default_pipeline
+from api_src.inference.batch_scheduler import BatchScheduler
+from api_src.inference.executor import InferenceExecutor
+from api_src.services.bounded_executor import BoundedExecutor
+from api_src.services.caption_cache import CaptionCache
+from api_src.auth.token_cache import TokenCache
+from api_src.services.upload_reader import UploadReader, ContentLengthLimitMiddleware
+from api_src.services.http_metrics import MetricsMiddleware
+from api_src.services.job_worker import JobWorker
+from api_src.services.prediction_writer import PredictionWriter
+from api_src.repositories.image_repository import ImageRepository
+from api_src.repositories.caption_cache_repository import CaptionCacheRepository
+from api_src.database.database import Database, get_pool, close_pools
+from src.translation.translator import configure_translation_cache, set_translation_enabled, warmup_translator
+from api_src.config import (
+    MODEL_WARMUP, IMAGE_MAX_PIXELS, DB_BUSY_TIMEOUT_MS, DB_SYNCHRONOUS,
+    WRITE_BEHIND_ENABLED, WRITE_BEHIND_MAX_BATCH, WRITE_BEHIND_MAX_DELAY_MS, WRITE_BEHIND_ID_BLOCK,
+    UPLOAD_MAX_BYTES, UPLOAD_CHUNK_SIZE, UPLOAD_MULTIPART_OVERHEAD, UPLOAD_BATCH_MAX_BYTES,
+    BATCHING_ENABLED, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_MAX_QUEUE,
+    INFERENCE_WORKERS, TORCH_THREADS, INFERENCE_MAX_PENDING,
+    AUTH_WORKERS, AUTH_MAX_PENDING, TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_S,
+    JOBS_ENABLED, JOB_WORKERS, JOB_BATCH_SIZE, JOB_MAX_BYTES,
+    CAPTION_CACHE_SIZE, CAPTION_CACHE_PERSISTENT,
+    TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_PATH,
+    TRANSLATION_ENABLED, TRANSLATION_WARMUP
+)
 from fastapi.middleware.cors import CORSMiddleware  # ✅
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 🧵 Threads intra-op de torch : réglage global du processus, fixé une fois avant tout calcul
+    if TORCH_THREADS:
+        torch.set_num_threads(TORCH_THREADS)
+
+    # 🧠 Chargement unique des modèles au démarrage (partagés par toutes les requêtes)
+    pipeline = get_default_pipeline(warmup=MODEL_WARMUP)
+
+    # 🗄️ Connexions SQLite : une par thread, mode WAL, fermées à l'arrêt
+    get_pool(busy_timeout_ms=DB_BUSY_TIMEOUT_MS, synchronous=DB_SYNCHRONOUS)
+    Database().create_tables()
+
+    # ✍️ Écriture différée des prédictions (thread dédié, vidé à l'arrêt)
+    app.state.prediction_writer = None
+    if WRITE_BEHIND_ENABLED:
+        app.state.prediction_writer = PredictionWriter(
+            ImageRepository(Database()),
+            max_batch_size=WRITE_BEHIND_MAX_BATCH,
+            max_delay_ms=WRITE_BEHIND_MAX_DELAY_MS,
+            id_block_size=WRITE_BEHIND_ID_BLOCK
+        )
+        app.state.prediction_writer.start()
+
+    translation_cache = configure_translation_cache(max_size=TRANSLATION_CACHE_SIZE, path=TRANSLATION_CACHE_PATH)
+    set_translation_enabled(TRANSLATION_ENABLED)
+    if TRANSLATION_ENABLED and TRANSLATION_WARMUP:
+        warmup_translator()
+
+    # ♻️ Cache des légendes (mémoire + SQLite en option)
+    app.state.caption_cache = None
+    if CAPTION_CACHE_SIZE > 0:
+        repository = None
+        if CAPTION_CACHE_PERSISTENT:
+            repository = CaptionCacheRepository(Database())
+        app.state.caption_cache = CaptionCache(max_size=CAPTION_CACHE_SIZE, repository=repository)
+
+    # 📥 Lecture bornée des fichiers envoyés
+    app.state.upload_reader = UploadReader(
+        max_bytes=UPLOAD_MAX_BYTES,
+        max_pixels=IMAGE_MAX_PIXELS,
+        chunk_size=UPLOAD_CHUNK_SIZE
+    )
+
+    # 🧵 Calculs CPU hors de la boucle asyncio
+    app.state.inference_executor = InferenceExecutor(
+        max_workers=INFERENCE_WORKERS,
+        max_pending=INFERENCE_MAX_PENDING
+    )
+
+    # 🔐 Authentification : bcrypt dans un pool générique borné (pas celui du modèle),
+    # tokens vérifiés en cache
+    app.state.auth_executor = BoundedExecutor(
+        max_workers=AUTH_WORKERS,
+        max_pending=AUTH_MAX_PENDING,
+        thread_name_prefix="auth"
+    )
+    app.state.token_cache = None
+    if TOKEN_CACHE_SIZE > 0:
+        app.state.token_cache = TokenCache(max_size=TOKEN_CACHE_SIZE, ttl_s=TOKEN_CACHE_TTL_S)
+
+    # 📦 File de micro-batching devant le pipeline
+    app.state.batch_scheduler = None
+    if BATCHING_ENABLED:
+        app.state.batch_scheduler = BatchScheduler(
+            pipeline,
+            executor=app.state.inference_executor,
+            max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS,
+            max_queue_size=BATCH_MAX_QUEUE
+        )
+        await app.state.batch_scheduler.start()
+
+    # 🗂️ Jobs en arrière-plan (reprise des jobs interrompus au démarrage)
+    app.state.job_worker = None
+    if JOBS_ENABLED:
+        app.state.job_worker = JobWorker(
+            pipeline,
+            executor=app.state.inference_executor,
+            caption_cache=app.state.caption_cache,
+            max_workers=JOB_WORKERS,
+            batch_size=JOB_BATCH_SIZE
+        )
+        await app.state.job_worker.start()
+
+    yield
+
+    if app.state.job_worker is not None:
+        await app.state.job_worker.stop()
+    if app.state.batch_scheduler is not None:
+        await app.state.batch_scheduler.stop()
+    app.state.inference_executor.shutdown()
+    app.state.auth_executor.shutdown()
+    if app.state.prediction_writer is not None:
+        app.state.prediction_writer.stop()
+    close_pools()
+    translation_cache.save()
+    model_registry.clear()
+
+
 app = FastAPI(
     title="API : Annotation Automatique des Images",
     description="API sécurisée avec authentification JWT pour gérer les utilisateurs, l'annotation des images et les prédictions.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ✅ CORS pour autoriser le frontend React
@@ -24,6 +158,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 📏 413 avant lecture du corps si le Content-Length annoncé est trop grand
+app.add_middleware(
+    ContentLengthLimitMiddleware,
+    max_bytes=UPLOAD_MAX_BYTES + UPLOAD_MULTIPART_OVERHEAD,
+    path_limits={
+        "/upload_images": UPLOAD_BATCH_MAX_BYTES + UPLOAD_MULTIPART_OVERHEAD,
+        "/jobs": JOB_MAX_BYTES + UPLOAD_MULTIPART_OVERHEAD,
+    }
+)
+
+# 📊 Requêtes, statuts et durées par route (ajouté en dernier : compte aussi les 413 ci-dessus)
+app.add_middleware(MetricsMiddleware)
+
 # Inclusion des routes
 app.include_router(user_router, tags=["Utilisateur"])
-app.include_router(image_router, tags=["Prédiction"])
\ No newline at end of file
+app.include_router(image_router, tags=["Prédiction"])
+app.include_router(job_router, tags=["Jobs"])
+app.include_router(prediction_router, tags=["Historique"])
+app.include_router(monitoring_router, tags=["Monitoring"])
\ No newline at end of file
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from src.data.dataset import clean_caption
+
+CORPUS_FORMAT_VERSION = 1
+
+
+class CaptionCorpus:
+    """
+    Légendes nettoyées et encodées une seule fois, stockées à plat :
+
+        - tokens: [n_tokens] int32         → tous les tokens bout à bout
+        - offsets: [n_captions + 1] int64  → légende i = tokens[offsets[i]:offsets[i + 1]]
+        - image_offsets: [n_images + 1]    → légendes de l'image j = image_offsets[j]:image_offsets[j + 1]
+    """
+
+    def __init__(self, image_ids, tokens, offsets, image_offsets, fingerprint=""):
+        self.image_ids = list(image_ids)
+        self.tokens = tokens
+        self.offsets = offsets
+        self.image_offsets = image_offsets
+        self.fingerprint = fingerprint
+        self.image_to_index = {image_id: i for i, image_id in enumerate(self.image_ids)}
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def caption_indices(self, image_id) -> range:
+        i = self.image_to_index[image_id]
+        return range(int(self.image_offsets[i]), int(self.image_offsets[i + 1]))
+
+    def get(self, caption_idx) -> torch.Tensor:
+        start, end = self.offsets[caption_idx], self.offsets[caption_idx + 1]
+        return torch.from_numpy(self.tokens[start:end])
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                tokens=self.tokens,
+                offsets=self.offsets,
+                image_offsets=self.image_offsets,
+                image_ids=np.array(self.image_ids),
+                fingerprint=np.array(self.fingerprint)
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                image_ids=data["image_ids"].tolist(),
+                tokens=data["tokens"],
+                offsets=data["offsets"],
+                image_offsets=data["image_offsets"],
+                fingerprint=str(data["fingerprint"])
+            )
+
+
+def corpus_fingerprint(captions_dict_path, tokenizer) -> str:
+    """Empreinte des légendes et du vocabulaire : le cache est invalidé si l'un des deux change"""
+    digest = hashlib.sha256(f"v{CORPUS_FORMAT_VERSION}".encode())
+    with open(captions_dict_path, "rb") as f:
+        digest.update(f.read())
+    digest.update(json.dumps(sorted(tokenizer.word2idx.items())).encode())
+    return digest.hexdigest()[:16]
+
+
+def build_caption_corpus(captions_dict: dict, tokenizer, fingerprint: str = "") -> CaptionCorpus:
+    tokens, offsets, image_offsets = [], [0], [0]
+    for captions in captions_dict.values():
+        for caption in captions:
+            encoded = tokenizer.encode(clean_caption(caption))
+            tokens.extend(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+        image_offsets.append(len(offsets) - 1)
+
+    return CaptionCorpus(
+        image_ids=captions_dict.keys(),
+        tokens=np.array(tokens, dtype=np.int32),
+        offsets=np.array(offsets, dtype=np.int64),
+        image_offsets=np.array(image_offsets, dtype=np.int64),
+        fingerprint=fingerprint
+    )
+
+
+def load_or_build_corpus(captions_dict_path, tokenizer, cache_path) -> CaptionCorpus:
+    """Recharge le corpus pré-tokenisé depuis cache_path, ou le reconstruit si l'empreinte a changé"""
+    fingerprint = corpus_fingerprint(captions_dict_path, tokenizer)
+    cache_path = Path(cache_path)
+
+    if cache_path.exists():
+        corpus = CaptionCorpus.load(cache_path)
+        if corpus.fingerprint == fingerprint:
+            return corpus
+        print("♻️ Tokenizer ou légendes modifiés : reconstruction du corpus")
+
+    with open(captions_dict_path, "r") as f:
+        captions_dict = json.load(f)
+    corpus = build_caption_corpus(captions_dict, tokenizer, fingerprint=fingerprint)
+    corpus.save(cache_path)
+    print(f"💾 Corpus pré-tokenisé sauvegardé : {cache_path} ({len(corpus)} légendes)")
+    return corpus
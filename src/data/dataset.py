@@ -5,6 +5,7 @@ from pathlib import Path
 import re
 from torch.nn.utils.rnn import pad_sequence
 from src.data.tokenizer import Tokenizer
+from src.data.feature_store import FeatureStore
 
 
 def clean_caption(caption):
@@ -14,36 +15,101 @@ def clean_caption(caption):
     return caption.strip()
 
 class ImageCaptionDataset(Dataset):
-    def __init__(self, pairs, features_dir, tokenizer, max_length=20):
+    def __init__(self, pairs, features_dir, tokenizer, max_length=20, feature_store=None, corpus=None):
+        """
+        pairs: liste de (image_id, légende brute), ou de (image_id, indice de légende)
+        si `corpus` (CaptionCorpus pré-tokenisé) est fourni.
+        """
         self.pairs = pairs
-        self.features_dir = Path(features_dir)
+        self.features_dir = Path(features_dir) if features_dir is not None else None
         self.tokenizer = tokenizer
         self.max_length = max_length
 
+        # 🗄️ Feature store compact (memmap) : remplace un torch.load par paire
+        if feature_store is not None and not isinstance(feature_store, FeatureStore):
+            feature_store = FeatureStore(feature_store)
+        self.feature_store = feature_store
+        self.corpus = corpus
+
     def __len__(self):
         return len(self.pairs)
 
-    def __getitem__(self, idx):
-        image_id, caption = self.pairs[idx]
+    def caption_lengths(self):
+        """Longueur (après troncature) de la légende de chaque paire, sans charger les features"""
+        if self.corpus is not None:
+            corpus_lengths = np.diff(self.corpus.offsets)
+            return [min(int(corpus_lengths[caption_idx]), self.max_length) for _, caption_idx in self.pairs]
+        return [
+            min(len(self.tokenizer.encode(clean_caption(caption))), self.max_length)
+            for _, caption in self.pairs
+        ]
 
+    def load_features(self, image_id):
         # 📦 Chargement des features
+        if self.feature_store is not None:
+            return self.feature_store.get(image_id)
         feature_path = self.features_dir / f"{image_id}.pt"
-        features = torch.load(feature_path)
+        return torch.load(feature_path)
 
-        # 🔡 Encodage de la légende
-        caption = clean_caption(caption) 
+    def encode_caption(self, caption):
+        # 🔡 Encodage de la légende (tranche du corpus pré-tokenisé si disponible)
+        if self.corpus is not None:
+            return self.corpus.get(caption)[:self.max_length]
+        caption = clean_caption(caption)
         encoded = self.tokenizer.encode(caption)
         encoded = encoded[:self.max_length]  # 🔪 Troncature
-        encoded_tensor = torch.tensor(encoded, dtype=torch.long)
+        return torch.tensor(encoded, dtype=torch.long)
+
+    def __getitem__(self, idx):
+        image_id, caption = self.pairs[idx]
+        return self.load_features(image_id), self.encode_caption(caption)
+
+
+class ImageCaptionGroupDataset(ImageCaptionDataset):
+    """
+    Variante groupée par image : un exemple = les features d'une image et ses K légendes.
+    Les features ne sont chargées qu'une fois, et le décodeur ne calcule qu'une fois
+    par image ce qui n'en dépend (cf. get_grouped_collate_fn / feature_index).
 
-        return features, encoded_tensor
+    groups: liste de (image_id, liste de légendes brutes ou d'indices du corpus)
+    """
+
+    def __getitem__(self, idx):
+        image_id, captions = self.pairs[idx]
+        return self.load_features(image_id), [self.encode_caption(caption) for caption in captions]
 
 
 def get_collate_fn(tokenizer):
     def collate_fn(batch):
+        # 🔃 Tri par longueur décroissante : lengths est un tenseur déjà trié
+        batch = sorted(batch, key=lambda item: len(item[1]), reverse=True)
         features, captions = zip(*batch)
         features = torch.stack(features)
-        lengths = [len(cap) for cap in captions]
-        captions_padded = pad_sequence(captions, batch_first=True, padding_value=tokenizer.pad_token_id)
+        lengths = torch.tensor([len(cap) for cap in captions], dtype=torch.long)
+        captions_padded = pad_sequence(captions, batch_first=True, padding_value=tokenizer.pad_token_id).long()
         return features, captions_padded, lengths
     return collate_fn
+
+
+def get_grouped_collate_fn(tokenizer):
+    """
+    Collate de ImageCaptionGroupDataset.
+
+    returns:
+        - features: [n_images, encoder_dim] → une ligne par image (pas de duplication)
+        - captions_padded: [n_captions, max_len], triées par longueur décroissante
+        - lengths: [n_captions]
+        - feature_index: [n_captions] → ligne de `features` associée à chaque légende
+    """
+    def collate_fn(batch):
+        features = torch.stack([item[0] for item in batch])
+        captions = [(caption, image_idx) for image_idx, item in enumerate(batch) for caption in item[1]]
+        captions.sort(key=lambda pair: len(pair[0]), reverse=True)
+
+        lengths = torch.tensor([len(caption) for caption, _ in captions], dtype=torch.long)
+        feature_index = torch.tensor([image_idx for _, image_idx in captions], dtype=torch.long)
+        captions_padded = pad_sequence(
+            [caption for caption, _ in captions], batch_first=True, padding_value=tokenizer.pad_token_id
+        ).long()
+        return features, captions_padded, lengths, feature_index
+    return collate_fn
@@ -0,0 +1,194 @@
+import argparse
+import tarfile
+import time
+import zipfile
+import zlib
+from pathlib import Path
+
+import torch
+import yaml
+from PIL import Image
+from torch.utils.data import DataLoader, Dataset
+from torchvision import transforms
+from tqdm import tqdm
+
+from src.data.feature_store import FeatureStoreWriter
+from src.model.encoder import Encoder
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+# 🧪 Mêmes augmentations que notebooks/02_augmentation.ipynb (appliquées en mémoire, sans JPEG intermédiaire)
+augmentation_pipeline = transforms.Compose([
+    transforms.RandomHorizontalFlip(p=1.0),
+    transforms.RandomRotation(15),
+    transforms.ColorJitter(brightness=0.2, contrast=0.2, saturation=0.2),
+])
+
+
+class ImageSource:
+    """Images d'un dossier, d'une archive .zip ou d'une archive .tar(.gz)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._archive = None
+
+    def list(self) -> list[str]:
+        if self.path.is_dir():
+            names = [p.name for p in self.path.iterdir()]
+        elif zipfile.is_zipfile(self.path):
+            with zipfile.ZipFile(self.path) as archive:
+                names = archive.namelist()
+        else:
+            with tarfile.open(self.path) as archive:
+                names = [member.name for member in archive.getmembers() if member.isfile()]
+        return sorted(name for name in names if Path(name).suffix.lower() in IMAGE_EXTENSIONS)
+
+    def open(self, name) -> Image.Image:
+        if self.path.is_dir():
+            return Image.open(self.path / name).convert("RGB")
+
+        # Archive ouverte paresseusement : un descripteur par worker du DataLoader
+        if self._archive is None:
+            self._archive = zipfile.ZipFile(self.path) if zipfile.is_zipfile(self.path) else tarfile.open(self.path)
+        if isinstance(self._archive, zipfile.ZipFile):
+            with self._archive.open(name) as f:
+                return Image.open(f).convert("RGB")
+        with self._archive.extractfile(name) as f:
+            return Image.open(f).convert("RGB")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_archive"] = None
+        return state
+
+
+class ExtractionDataset(Dataset):
+    """
+    Décodage + augmentation + resize (uint8), exécutés dans les workers du DataLoader ;
+    la normalisation est faite par lot dans Encoder.
+
+    items: liste de (feature_id, nom de l'image dans la source, indice d'augmentation ou None)
+    """
+
+    def __init__(self, source: ImageSource, items, seed: int = 0):
+        self.source = source
+        self.items = items
+        self.seed = seed
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, idx):
+        feature_id, name, aug_index = self.items[idx]
+        try:
+            image = self.source.open(name)
+        except Exception as e:
+            print(f"❌ Image illisible {name} : {e}")
+            return feature_id, None
+
+        if aug_index is not None:
+            # 🎲 Augmentation reproductible : graine dérivée de l'identifiant, RNG global intact
+            with torch.random.fork_rng(devices=[]):
+                torch.manual_seed(zlib.crc32(feature_id.encode()) + self.seed)
+                image = augmentation_pipeline(image)
+
+        return feature_id, Encoder.image_to_tensor(image)
+
+
+def collate_images(batch):
+    batch = [(feature_id, tensor) for feature_id, tensor in batch if tensor is not None]
+    if not batch:
+        return [], None
+    ids, tensors = zip(*batch)
+    return list(ids), torch.stack(tensors)
+
+
+def extract_features(
+    source_path,
+    store_dir,
+    batch_size: int = 32,
+    num_workers: int = 4,
+    augmentations: int = 3,
+    device=None,
+    seed: int = 0,
+    limit: int | None = None,
+    flush_every: int = 20
+) -> dict:
+    """
+    Extrait les features ResNet50 globales (2048) de toutes les images de source_path
+    (et de leurs variantes _aug0.._aug{n-1}) directement dans le feature store.
+    Les identifiants déjà présents dans le store sont ignorés : l'extraction peut reprendre.
+    """
+    device = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
+    source = ImageSource(source_path)
+    names = source.list()[:limit]
+
+    writer = FeatureStoreWriter(store_dir, dim=2048)
+    suffixes = [("", None)] + [(f"_aug{i}", i) for i in range(augmentations)]
+    items = [
+        (Path(name).stem + suffix, name, aug_index)
+        for name in names
+        for suffix, aug_index in suffixes
+        if Path(name).stem + suffix not in writer.existing_ids
+    ]
+    skipped = len(names) * len(suffixes) - len(items)
+    if skipped:
+        print(f"⏭️ {skipped} features déjà extraites, ignorées")
+
+    encoder = Encoder().to(device)
+    loader = DataLoader(
+        ExtractionDataset(source, items, seed=seed),
+        batch_size=batch_size,
+        num_workers=num_workers,
+        collate_fn=collate_images,
+        pin_memory=device.type == "cuda"
+    )
+
+    extracted = 0
+    start = time.perf_counter()
+    progress = tqdm(loader, desc="🔍 Extraction des features")
+    for batch_idx, (ids, images) in enumerate(progress, start=1):
+        if images is None:
+            continue
+        features = encoder(images)  # uint8 [B, 3, 224, 224] → [B, 2048]
+        writer.append(ids, features.cpu().numpy(), flush=batch_idx % flush_every == 0)
+        extracted += len(ids)
+        progress.set_postfix(images_per_s=f"{extracted / (time.perf_counter() - start):.1f}")
+    writer.flush()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "extracted": extracted,
+        "skipped": skipped,
+        "elapsed_s": round(elapsed, 2),
+        "images_per_s": round(extracted / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+if __name__ == "__main__":
+    with open("config/config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    parser = argparse.ArgumentParser(description="Extraction batchée des features ResNet50 vers le feature store.")
+    parser.add_argument("source", help="dossier d'images ou archive .zip / .tar(.gz)")
+    parser.add_argument("--store-dir", default=config["feature_store_dir"])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4, help="processus de décodage / resize")
+    parser.add_argument("--augmentations", type=int, default=3, help="variantes _aug0.._aug{n-1} par image (0 = aucune)")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=None, help="nombre maximal d'images sources")
+    args = parser.parse_args()
+
+    stats = extract_features(
+        args.source,
+        args.store_dir,
+        batch_size=args.batch_size,
+        num_workers=args.workers,
+        augmentations=args.augmentations,
+        device=args.device,
+        seed=args.seed,
+        limit=args.limit
+    )
+    print(f"✅ {stats['extracted']} features extraites en {stats['elapsed_s']}s "
+          f"({stats['images_per_s']} images/s), {stats['skipped']} déjà présentes")
@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import torch
+from tqdm import tqdm
+
+FEATURES_FILE = "features.f32"
+INDEX_FILE = "index.json"
+
+
+class FeatureStoreWriter:
+    """
+    Écriture (en ajout) d'un feature store compact : un seul fichier float32
+    contigu [n_images, dim] + un index JSON des image_id (ordre des lignes).
+
+    L'index est réécrit après chaque ajout : une extraction interrompue peut
+    reprendre là où elle s'est arrêtée (cf. existing_ids).
+    """
+
+    def __init__(self, store_dir, dim: int = 2048):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.features_path = self.store_dir / FEATURES_FILE
+        self.index_path = self.store_dir / INDEX_FILE
+
+        self.dim = dim
+        self.ids = []
+        if self.index_path.exists():
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            self.dim = index["dim"]
+            self.ids = index["ids"]
+            # ✂️ Lignes écrites après la dernière sauvegarde de l'index : ignorées
+            with open(self.features_path, "ab") as f:
+                f.truncate(len(self.ids) * self.dim * 4)
+        self.existing_ids = set(self.ids)
+
+    def append(self, image_ids: list[str], features, flush: bool = True):
+        """Ajoute des lignes ; avec flush=False l'index n'est réécrit qu'au prochain flush()"""
+        features = np.ascontiguousarray(np.asarray(features, dtype=np.float32)).reshape(len(image_ids), self.dim)
+        with open(self.features_path, "ab") as f:
+            f.write(features.tobytes())
+        self.ids.extend(image_ids)
+        self.existing_ids.update(image_ids)
+        if flush:
+            self.flush()
+
+    def flush(self):
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"dim": self.dim, "ids": self.ids}, f)
+        os.replace(tmp_path, self.index_path)
+
+
+class FeatureStore:
+    """
+    Lecture du feature store via np.memmap : get(image_id) renvoie une vue
+    (sans copie) de la ligne correspondante, au lieu d'un torch.load par fichier .pt.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / INDEX_FILE, "r") as f:
+            index = json.load(f)
+        self.dim = index["dim"]
+        self.ids = index["ids"]
+        self.id_to_row = {image_id: row for row, image_id in enumerate(self.ids)}
+        self._array = None
+
+    @staticmethod
+    def exists(store_dir) -> bool:
+        return store_dir is not None and (Path(store_dir) / INDEX_FILE).exists()
+
+    @property
+    def array(self) -> np.ndarray:
+        # Ouverture paresseuse : chaque worker du DataLoader ouvre sa propre projection mémoire
+        if self._array is None:
+            self._array = np.memmap(
+                self.store_dir / FEATURES_FILE, dtype=np.float32, mode="c", shape=(len(self.ids), self.dim)
+            )
+        return self._array
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_array"] = None  # pas de copie des features lors du pickling vers les workers
+        return state
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, image_id):
+        return image_id in self.id_to_row
+
+    def get(self, image_id) -> torch.Tensor:
+        return torch.from_numpy(self.array[self.id_to_row[image_id]])
+
+
+def pack_features(features_dir, store_dir, chunk_size: int = 1024) -> int:
+    """Convertit un dossier de fichiers {image_id}.pt en feature store ; retourne le nombre d'images ajoutées."""
+    paths = sorted(Path(features_dir).glob("*.pt"))
+    if not paths:
+        return 0
+    # 📏 dim lue dans l'index en reprise, sinon dans le premier fichier
+    if FeatureStore.exists(store_dir):
+        writer = FeatureStoreWriter(store_dir)
+    else:
+        writer = FeatureStoreWriter(store_dir, dim=torch.load(paths[0]).numel())
+    added = 0
+    ids, chunk = [], []
+
+    for path in tqdm(paths, desc="📦 Packing features"):
+        # ⏭️ Reprise : les images déjà présentes ne sont pas rechargées
+        if path.stem in writer.existing_ids:
+            continue
+        ids.append(path.stem)
+        chunk.append(torch.load(path).float().reshape(-1).numpy())
+        if len(ids) >= chunk_size:
+            writer.append(ids, np.stack(chunk))
+            added += len(ids)
+            ids, chunk = [], []
+
+    if ids:
+        writer.append(ids, np.stack(chunk))
+        added += len(ids)
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convertit les features .pt (une par image) en feature store compact.")
+    parser.add_argument("--features-dir", default="data/processed/features_resnet_global")
+    parser.add_argument("--store-dir", default="data/processed/features_resnet_global_packed")
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    added = pack_features(args.features_dir, args.store_dir, chunk_size=args.chunk_size)
+    print(f"✅ {added} images ajoutées au feature store {args.store_dir}")
@@ -0,0 +1,53 @@
+import torch
+from torch.utils.data import Sampler
+
+
+class BucketBatchSampler(Sampler):
+    """
+    Batches de légendes de longueurs voisines : moins de padding, et moins de pas
+    de LSTMCell puisque le décodeur boucle jusqu'à la plus longue légende du batch.
+
+    À chaque epoch : les indices sont mélangés à l'intérieur de chaque longueur,
+    concaténés par longueur croissante puis découpés en batches, et l'ordre des
+    batches est lui-même mélangé.
+
+    lengths: longueur (tokens) de chaque exemple, dans l'ordre des indices du dataset
+    """
+
+    def __init__(self, lengths, batch_size, shuffle=True, drop_last=False, seed=0):
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+
+        self.buckets = {}
+        for idx, length in enumerate(lengths):
+            self.buckets.setdefault(int(length), []).append(idx)
+        self.n_samples = len(lengths)
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def __iter__(self):
+        generator = torch.Generator().manual_seed(self.seed + self.epoch)
+        self.epoch += 1
+
+        indices = []
+        for length in sorted(self.buckets):
+            bucket = self.buckets[length]
+            if self.shuffle:
+                bucket = [bucket[i] for i in torch.randperm(len(bucket), generator=generator).tolist()]
+            indices.extend(bucket)
+
+        batches = [indices[i:i + self.batch_size] for i in range(0, len(indices), self.batch_size)]
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+        if self.shuffle:
+            batches = [batches[i] for i in torch.randperm(len(batches), generator=generator).tolist()]
+        return iter(batches)
+
+    def __len__(self):
+        if self.drop_last:
+            return self.n_samples // self.batch_size
+        return (self.n_samples + self.batch_size - 1) // self.batch_size
@@ -1,3 +1,4 @@
+import time
 import torch
 from PIL import Image
 from pathlib import Path
@@ -8,12 +9,33 @@ sys.path.append(str(project_root))
 from src.model.decoder import DecoderWithAttention
 from src.model.encoder import Encoder
 from src.data.tokenizer import load_tokenizer
-from src.translation.translator import translate_caption
-import torch.nn.functional as F
+from src.translation.translator import translate_captions
+from src.inference.decoding import greedy_decode, beam_search_decode
+from src.monitoring.metrics import histogram
+
+# 📊 Durées par étape (cf. GET /metrics de l'API)
+ENCODER_SECONDS = histogram("caption_encoder_seconds", "Passage de l'encodeur ResNet50 sur un lot d'images")
+DECODE_SECONDS = histogram(
+    "caption_decode_seconds", "Boucle de décodage complète sur un lot (glouton ou beam search)", ["strategy"]
+)
+DECODE_TOKEN_SECONDS = histogram(
+    "caption_decode_token_seconds", "Durée moyenne d'un pas de la boucle de décodage, par lot", ["strategy"]
+)
+TRANSLATION_SECONDS = histogram("caption_translation_seconds", "Traduction anglais → français d'un lot de légendes")
 
 
 class CaptionGenerator:
-    def __init__(self, decoder_path: str, tokenizer_path: str, device=None):
+    def __init__(
+        self,
+        decoder_path: str,
+        tokenizer_path: str,
+        device=None,
+        beam_size: int = 1,
+        length_penalty: float = 1.0
+    ):
+        # 🔍 beam_size = 1 → décodage glouton, > 1 → beam search
+        self.beam_size = beam_size
+        self.length_penalty = length_penalty
         self.device = device or torch.device("cuda" if torch.cuda.is_available() else "cpu")
         tokenizer_full_path = project_root / tokenizer_path
         self.tokenizer = load_tokenizer(str(tokenizer_full_path))
@@ -32,53 +54,98 @@ class CaptionGenerator:
         self.encoder = Encoder().to(self.device).eval()
 
     def preprocess(self, image: Image.Image):
-        features = self.encoder(image).unsqueeze(0).to(self.device)
-        return features
-
-    def generate(self, image: Image.Image, max_len: int = 20, translate: bool = False):
-        features = self.preprocess(image)
-        decoder = self.decoder
+        return self.encoder(image)  # (1, 2048)
+
+    def preprocess_batch(self, images):
+        # 🧱 Un seul passage ResNet pour tout le lot (liste d'images PIL ou tenseur [B, 3, H, W])
+        return self.encoder(images)  # (B, 2048)
+
+    def generate(self, image: Image.Image, max_len: int = 20, translate: bool = False, beam_size: int | None = None):
+        # Une image = un lot de taille 1 : même chemin (et mêmes résultats) que generate_batch
+        return self.generate_batch([image], max_len=max_len, translate=translate, beam_size=beam_size)[0]
+
+    def generate_batch(
+        self,
+        images: list[Image.Image],
+        max_len: int = 20,
+        translate=False,
+        beam_size: int | None = None
+    ):
+        """
+        Génère les légendes d'un lot d'images en un seul passage encodeur + décodeur.
+
+        translate : booléen commun à tout le lot, ou liste de booléens (un par image).
+        beam_size : surcharge ponctuelle de self.beam_size.
+        Retourne une liste de (caption, confidences), dans l'ordre des images.
+        """
+        with ENCODER_SECONDS.time():
+            features = self.preprocess_batch(images)
+        results = self.decode_batch(features, max_len=max_len, beam_size=beam_size)
+
+        if isinstance(translate, bool):
+            translate = [translate] * len(results)
+
+        # 🇫🇷 Toutes les légendes à traduire du lot partent en un seul appel (avec cache)
+        to_translate = [i for i, do_translate in enumerate(translate) if do_translate]
+        if to_translate:
+            with TRANSLATION_SECONDS.time():
+                translations = translate_captions([results[i][0] for i in to_translate])
+            for i, translation in zip(to_translate, translations):
+                results[i] = (translation, results[i][1])
+
+        return results
+
+    def decode_batch(self, features: torch.Tensor, max_len: int = 20, beam_size: int | None = None):
+        """
+        Décode un lot de features [B, 2048] → liste de (caption anglaise, confidences).
+
+        En glouton, confidences = probabilité de chaque token choisi.
+        En beam search, chaque token reçoit le score de la séquence
+        (exp de la log-probabilité normalisée par la longueur).
+        """
         tokenizer = self.tokenizer
+        beam_size = beam_size or self.beam_size
+        special_tokens = dict(
+            start_token_id=tokenizer.start_token_id,
+            end_token_id=tokenizer.end_token_id,
+            pad_token_id=tokenizer.pad_token_id
+        )
 
-        inputs = torch.tensor([[tokenizer.start_token_id]]).to(self.device)
-        hidden, cell = decoder.init_hidden_state(features)
-
-        sampled_ids = []
-        confidences = []
-
-        for _ in range(max_len):
-            embeddings = decoder.embedding(inputs).squeeze(1)
-            context, _ = decoder.attention(features, hidden)
-            decoder_input = torch.cat([embeddings, context], dim=1)
-
-            hidden, cell = decoder.decode_step(decoder_input, (hidden, cell))
-            preds = decoder.fc(hidden)
-            probs = F.softmax(preds, dim=1)
-
-            predicted = preds.argmax(1)
-            confidence = probs[0, predicted.item()].item()
-
-            sampled_ids.append(predicted.item())
-            confidences.append(confidence)
-
-            if predicted.item() == tokenizer.end_token_id:
-                break
-
-            inputs = predicted.unsqueeze(1)
-
-        words = [
-            tokenizer.idx2word[idx]
-            for idx in sampled_ids
-            if idx not in {tokenizer.start_token_id, tokenizer.end_token_id, tokenizer.pad_token_id}
-        ]
-        filtered_conf = [
-            conf for idx, conf in zip(sampled_ids, confidences)
-            if idx not in {tokenizer.start_token_id, tokenizer.end_token_id, tokenizer.pad_token_id}
-        ]
-
-        caption = " ".join(words)
-
-        if translate:
-            caption = translate_caption(caption)
-
-        return caption, filtered_conf
\ No newline at end of file
+        strategy = "beam" if beam_size > 1 else "greedy"
+        start = time.perf_counter()
+        if beam_size > 1:
+            token_ids, _, scores = beam_search_decode(
+                self.decoder,
+                features.to(self.device),
+                beam_size=beam_size,
+                max_len=max_len,
+                length_penalty=self.length_penalty,
+                **special_tokens
+            )
+            confidences = scores.exp().unsqueeze(1).expand(-1, token_ids.size(1))
+        else:
+            token_ids, confidences = greedy_decode(
+                self.decoder,
+                features.to(self.device),
+                max_len=max_len,
+                **special_tokens
+            )
+
+        # 📤 Un seul transfert device → hôte pour tout le lot
+        steps = token_ids.size(1)
+        packed = torch.cat([token_ids.to(confidences.dtype), confidences], dim=1).cpu()
+        # ⏱️ Mesuré après le transfert vers l'hôte : sur GPU, les noyaux sont alors terminés
+        duration = time.perf_counter() - start
+        DECODE_SECONDS.observe(duration, strategy=strategy)
+        DECODE_TOKEN_SECONDS.observe(duration / max(steps, 1), strategy=strategy)
+        all_ids = packed[:, :steps].long().tolist()
+        all_confidences = packed[:, steps:].tolist()
+
+        special_ids = {tokenizer.start_token_id, tokenizer.end_token_id, tokenizer.pad_token_id}
+        results = []
+        for ids, confs in zip(all_ids, all_confidences):
+            words = [tokenizer.idx2word[idx] for idx in ids if idx not in special_ids]
+            filtered_conf = [conf for idx, conf in zip(ids, confs) if idx not in special_ids]
+            results.append((" ".join(words), filtered_conf))
+
+        return results
@@ -0,0 +1,184 @@
+import torch
+import torch.nn.functional as F
+
+
+def greedy_decode(decoder, features, start_token_id, end_token_id, pad_token_id, max_len=20):
+    """
+    Décodage glouton (argmax) d'un lot de features, entièrement sur le device.
+
+    features: [batch_size, encoder_dim]
+
+    returns:
+        - token_ids: [batch_size, steps]   → pad_token_id après le premier <end>
+        - confidences: [batch_size, steps] → probabilité du token choisi (0 après <end>)
+
+    Aucune synchronisation hôte/device par token : seul le test « toutes les
+    séquences sont terminées » en déclenche une par pas.
+    """
+    batch_size = features.size(0)
+    device = features.device
+
+    inputs = torch.full((batch_size,), start_token_id, dtype=torch.long, device=device)
+    finished = torch.zeros(batch_size, dtype=torch.bool, device=device)
+    pad = torch.full_like(inputs, pad_token_id)
+    token_ids, confidences = [], []
+
+    with torch.no_grad():
+        prepared = decoder.prepare_features(features)
+        hidden, cell = prepared.h, prepared.c
+
+        for _ in range(max_len):
+            embeddings = decoder.embedding(inputs)
+            context, _ = decoder.attend(prepared, hidden)
+            decoder_input = torch.cat([embeddings, context], dim=1)
+
+            hidden, cell = decoder.decode_step(decoder_input, (hidden, cell))
+            preds = decoder.fc(hidden)
+            probs = F.softmax(preds, dim=1)
+
+            predicted = preds.argmax(1)
+            confidence = probs.gather(1, predicted.unsqueeze(1)).squeeze(1)
+
+            # 🎭 Les séquences déjà terminées ne produisent plus que du padding
+            predicted = torch.where(finished, pad, predicted)
+            confidence = confidence.masked_fill(finished, 0.0)
+
+            token_ids.append(predicted)
+            confidences.append(confidence)
+
+            finished = finished | (predicted == end_token_id)
+            if finished.all():
+                break
+
+            inputs = predicted
+
+    return torch.stack(token_ids, dim=1), torch.stack(confidences, dim=1)
+
+
+def beam_search_decode(
+    decoder,
+    features,
+    start_token_id,
+    end_token_id,
+    pad_token_id,
+    beam_size=3,
+    max_len=20,
+    length_penalty=1.0
+):
+    """
+    Beam search sur un lot de features : tous les faisceaux de toutes les images
+    avancent dans un seul tenseur [n_images * beam_size, ...].
+
+    Le score d'une hypothèse est sa log-probabilité divisée par longueur ** length_penalty.
+    Une image est retirée du lot dès qu'aucun faisceau vivant ne peut plus battre sa meilleure
+    hypothèse terminée (borne exacte, quel que soit length_penalty).
+    <end> est interdit au premier pas : la légende contient au moins un mot.
+
+    returns:
+        - token_ids: [batch_size, max_len]   → meilleure séquence (pad_token_id après <end>)
+        - token_probs: [batch_size, max_len] → probabilité de chaque token (0 après <end>)
+        - scores: [batch_size]               → log-probabilité normalisée de la séquence
+    """
+    batch_size = features.size(0)
+    device = features.device
+    k = beam_size
+
+    best_scores = torch.full((batch_size,), float("-inf"), device=device)
+    best_ids = torch.full((batch_size, max_len), pad_token_id, dtype=torch.long, device=device)
+    best_logp = torch.zeros(batch_size, max_len, device=device)
+
+    with torch.no_grad():
+        # 🔁 Chaque image est dupliquée beam_size fois : [n * k, ...]
+        prepared = decoder.prepare_features(features)
+        prepared = prepared.index_select(torch.arange(batch_size, device=device).repeat_interleave(k))
+        hidden, cell = prepared.h, prepared.c
+        inputs = torch.full((batch_size * k,), start_token_id, dtype=torch.long, device=device)
+
+        # Au départ tous les faisceaux sont identiques : on n'en garde qu'un seul actif
+        beam_scores = torch.zeros(batch_size, k, device=device)
+        beam_scores[:, 1:] = float("-inf")
+        seqs = torch.empty(batch_size * k, 0, dtype=torch.long, device=device)
+        seqs_logp = torch.empty(batch_size * k, 0, device=device)
+
+        active = torch.arange(batch_size, device=device)  # indices d'origine des images en cours
+
+        # 📐 Borne supérieure du score final d'un faisceau vivant : sa log-probabilité ne peut
+        # que baisser, mais avec length_penalty > 0 une hypothèse plus longue a un plus grand
+        # diviseur → on borne avec max_len (sinon la longueur courante suffit)
+        def bound_divisor(length):
+            return max_len ** length_penalty if length_penalty > 0 else length ** length_penalty
+        steps = 0
+
+        for t in range(max_len):
+            n = active.numel()
+            length = t + 1
+            steps = length
+
+            embeddings = decoder.embedding(inputs)
+            context, _ = decoder.attend(prepared, hidden)
+            decoder_input = torch.cat([embeddings, context], dim=1)
+
+            hidden, cell = decoder.decode_step(decoder_input, (hidden, cell))
+            logp = F.log_softmax(decoder.fc(hidden), dim=1)  # [n * k, vocab_size]
+            vocab_size = logp.size(1)
+            if t == 0:
+                logp[:, end_token_id] = float("-inf")  # 🚫 pas de légende vide
+
+            # 🏆 2k meilleurs candidats par image : au plus k se terminent par <end>
+            candidates = (beam_scores.view(-1, 1) + logp).view(n, k * vocab_size)
+            top_scores, top_idx = candidates.topk(2 * k, dim=1)
+            rows = torch.arange(n, device=device).unsqueeze(1) * k + top_idx // vocab_size  # [n, 2k]
+            tokens = top_idx % vocab_size
+            tokens_logp = logp[rows, tokens]
+            is_end = tokens == end_token_id
+
+            # ✅ Hypothèses terminées : on ne conserve que la meilleure par image
+            end_scores = (top_scores / length ** length_penalty).masked_fill(~is_end, float("-inf"))
+            end_best, end_pos = end_scores.max(dim=1)
+            end_rows = rows.gather(1, end_pos.unsqueeze(1)).squeeze(1)
+            end_seq = torch.cat([seqs[end_rows], tokens.gather(1, end_pos.unsqueeze(1))], dim=1)
+            end_logp = torch.cat([seqs_logp[end_rows], tokens_logp.gather(1, end_pos.unsqueeze(1))], dim=1)
+
+            improved = end_best > best_scores[active]
+            best_scores[active] = torch.where(improved, end_best, best_scores[active])
+            best_ids[active, :length] = torch.where(improved.unsqueeze(1), end_seq, best_ids[active, :length])
+            best_logp[active, :length] = torch.where(improved.unsqueeze(1), end_logp, best_logp[active, :length])
+
+            # 🌱 Faisceaux vivants : les k meilleurs candidats qui ne sont pas <end>
+            alive_scores, alive_pos = top_scores.masked_fill(is_end, float("-inf")).topk(k, dim=1)
+            alive_rows = rows.gather(1, alive_pos).view(-1)
+            inputs = tokens.gather(1, alive_pos).view(-1)
+            seqs = torch.cat([seqs[alive_rows], inputs.unsqueeze(1)], dim=1)
+            seqs_logp = torch.cat([seqs_logp[alive_rows], tokens_logp.gather(1, alive_pos).view(-1, 1)], dim=1)
+            hidden, cell = hidden[alive_rows], cell[alive_rows]
+            beam_scores = alive_scores
+
+            # ✂️ Élagage des images terminées (une seule synchro hôte/device par pas)
+            done = (best_scores[active] >= beam_scores[:, 0] / bound_divisor(length)).cpu()
+            if done.all():
+                break
+            if done.any():
+                keep = torch.nonzero(~done).squeeze(1).to(device)
+                keep_rows = (keep.unsqueeze(1) * k + torch.arange(k, device=device)).view(-1)
+                active = active[keep]
+                beam_scores = beam_scores[keep]
+                prepared = prepared.index_select(keep_rows)
+                hidden, cell = hidden[keep_rows], cell[keep_rows]
+                inputs = inputs[keep_rows]
+                seqs, seqs_logp = seqs[keep_rows], seqs_logp[keep_rows]
+
+        # ⏱️ max_len atteint : le meilleur faisceau vivant peut battre les hypothèses terminées
+        alive_best = beam_scores[:, 0] / steps ** length_penalty
+        use_alive = alive_best > best_scores[active]
+        alive_rows = torch.arange(active.numel(), device=device) * k
+        best_scores[active] = torch.where(use_alive, alive_best, best_scores[active])
+        best_ids[active, :steps] = torch.where(use_alive.unsqueeze(1), seqs[alive_rows], best_ids[active, :steps])
+        best_logp[active, :steps] = torch.where(use_alive.unsqueeze(1), seqs_logp[alive_rows], best_logp[active, :steps])
+
+    token_probs = best_logp.exp().masked_fill(best_ids == pad_token_id, 0.0)
+    return best_ids, token_probs, best_scores
+
+
+def mean_confidence(confidences) -> float:
+    """Confiance moyenne arrondie d'une légende (0.0 si aucun token, ex. <end> dès le premier pas)."""
+    return round(sum(confidences) / len(confidences), 4) if confidences else 0.0
@@ -10,16 +10,21 @@ class Attention(nn.Module):
         self.relu = nn.ReLU()
         self.softmax = nn.Softmax(dim=1)
 
-    def forward(self, encoder_out, decoder_hidden):
+    def precompute(self, encoder_out):
+        """Projection des features : constante sur toute la séquence, à calculer une seule fois"""
+        return self.encoder_att(encoder_out)             # [batch_size, attention_dim]
+
+    def forward(self, encoder_out, decoder_hidden, encoder_att=None):
         """
         encoder_out: [batch_size, encoder_dim]     → features encodées
         decoder_hidden: [batch_size, decoder_dim]  → état caché courant du LSTM
+        encoder_att: [batch_size, attention_dim]   → précalcul optionnel (cf. precompute)
 
         returns:
             - attention_weighted_encoding: [batch_size, encoder_dim]
             - alpha: [batch_size, 1]
         """
-        att1 = self.encoder_att(encoder_out)             # [batch_size, attention_dim]
+        att1 = self.precompute(encoder_out) if encoder_att is None else encoder_att
         att2 = self.decoder_att(decoder_hidden)          # [batch_size, attention_dim]
         att = self.full_att(self.relu(att1 + att2))      # [batch_size, 1]
         alpha = self.softmax(att)                        # [batch_size, 1]
@@ -1,8 +1,21 @@
 import torch
 import torch.nn as nn
+from typing import NamedTuple
 from src.model.attention import Attention
 
 
+class PreparedFeatures(NamedTuple):
+    """Tout ce qui ne dépend que des features : calculé une fois par image, pas à chaque pas"""
+    encoder_out: torch.Tensor  # [batch_size, encoder_dim]
+    encoder_att: torch.Tensor  # [batch_size, attention_dim] → projection de l'attention
+    h: torch.Tensor            # [batch_size, decoder_dim]   → état initial du LSTM
+    c: torch.Tensor            # [batch_size, decoder_dim]
+
+    def index_select(self, index):
+        """Sous-ensemble / réordonnancement / duplication des lignes (index: LongTensor ou slice)"""
+        return PreparedFeatures(*(t[index] for t in self))
+
+
 class DecoderWithAttention(nn.Module):
     def __init__(self, attention_dim, embed_dim, decoder_dim, vocab_size, encoder_dim=2048, dropout=0.5):
         super(DecoderWithAttention, self).__init__()
@@ -31,38 +44,99 @@ class DecoderWithAttention(nn.Module):
         c = self.init_c(encoder_out)
         return h, c
 
-    def forward(self, encoder_out, encoded_captions, caption_lengths):
+    def prepare_features(self, encoder_out):
+        """Précalcule la projection d'attention et l'état initial (h, c) des features"""
+        h, c = self.init_hidden_state(encoder_out)
+        return PreparedFeatures(encoder_out, self.attention.precompute(encoder_out), h, c)
+
+    def attend(self, prepared, hidden):
+        """Attention sur des features préparées (pas de re-projection des features)"""
+        return self.attention(prepared.encoder_out, hidden, encoder_att=prepared.encoder_att)
+
+    def _decode_packed(self, encoder_out, encoded_captions, caption_lengths, feature_index=None):
         """
-        encoder_out: [batch_size, encoder_dim]           → Features extraites
-        encoded_captions: [batch_size, max_len]          → Captions target
-        caption_lengths: [batch_size] ou [batch_size, 1] → Longueur réelle
+        Boucle teacher-forcing commune à forward et forward_packed.
+
+        feature_index: [n_captions] (optionnel) → ligne de encoder_out associée à chaque légende ;
+        init_h / init_c et la projection d'attention ne sont alors calculés qu'une fois par image.
 
         returns:
-            - prédictions (logits)
+            - logits: [n_tokens, vocab_size] → un vecteur par (séquence, pas) réellement décodé
+            - positions: [n_tokens]          → indice b * max_steps + t dans l'ordre d'origine du batch
+            - max_steps: int
         """
-        batch_size = encoder_out.size(0)
-        vocab_size = self.fc.out_features
+        device = encoder_out.device
 
         # 🔐 Sécurité : conversion caption_lengths en Tensor si nécessaire
         if isinstance(caption_lengths, list):
-            caption_lengths = torch.tensor(caption_lengths, dtype=torch.long, device=encoder_out.device)
+            caption_lengths = torch.tensor(caption_lengths, dtype=torch.long, device=device)
         if caption_lengths.dim() == 2:  # Si [batch_size, 1], on squeeze
             caption_lengths = caption_lengths.squeeze(1)
+        caption_lengths = caption_lengths.to(device)
+
+        # 🔃 Tri décroissant une seule fois : les séquences actives au pas t sont les batch_size_t premières
+        decode_lengths, sort_idx = (caption_lengths - 1).sort(descending=True)
+        encoded_captions = encoded_captions[sort_idx]
+
+        # 📅 Planning batch_size_t de tous les pas, calculé d'un coup
+        max_steps = int(decode_lengths[0])
+        steps = torch.arange(max_steps, device=device)
+        active = decode_lengths.unsqueeze(0) > steps.unsqueeze(1)  # [max_steps, batch_size]
+        batch_sizes = active.sum(dim=1).tolist()
 
         embeddings = self.embedding(encoded_captions)  # [batch_size, max_len, embed_dim]
-        h, c = self.init_hidden_state(encoder_out)     # h, c : [batch_size, decoder_dim]
 
-        decode_lengths = (caption_lengths - 1).tolist()
-        predictions = torch.zeros(batch_size, max(decode_lengths), vocab_size).to(encoder_out.device)
+        # Projection d'attention et état initial calculés une seule fois (par image si feature_index)
+        if feature_index is None:
+            prepared = self.prepare_features(encoder_out[sort_idx])
+        else:
+            prepared = self.prepare_features(encoder_out).index_select(feature_index.to(device)[sort_idx])
+        h, c = prepared.h, prepared.c  # h, c : [batch_size, decoder_dim]
 
-        for t in range(max(decode_lengths)):
-            batch_size_t = sum([l > t for l in decode_lengths])
-            attn_weighted_encoding, _ = self.attention(encoder_out[:batch_size_t], h[:batch_size_t])
+        hiddens = []
+        for t, batch_size_t in enumerate(batch_sizes):
+            attn_weighted_encoding, _ = self.attend(prepared.index_select(slice(0, batch_size_t)), h[:batch_size_t])
 
             input_lstm = torch.cat([embeddings[:batch_size_t, t, :], attn_weighted_encoding], dim=1)
             h, c = self.decode_step(input_lstm, (h[:batch_size_t], c[:batch_size_t]))  # LSTMCell
+            hiddens.append(h)
+
+        # 🧮 Projection vocabulaire en un seul appel sur tous les états cachés
+        logits = self.fc(self.dropout(torch.cat(hiddens, dim=0)))  # [n_tokens, vocab_size]
 
-            preds = self.fc(self.dropout(h))  # [batch_size_t, vocab_size]
-            predictions[:batch_size_t, t, :] = preds
+        # Les états sont concaténés pas par pas (t, puis rang trié) → position dans le batch d'origine
+        step_idx, sorted_row = active.nonzero(as_tuple=True)
+        positions = sort_idx[sorted_row] * max_steps + step_idx
+        return logits, positions, max_steps
 
-        return predictions
\ No newline at end of file
+    def forward(self, encoder_out, encoded_captions, caption_lengths, feature_index=None):
+        """
+        encoder_out: [batch_size, encoder_dim]           → Features extraites
+        encoded_captions: [batch_size, max_len]          → Captions target
+        caption_lengths: [batch_size] ou [batch_size, 1] → Longueur réelle
+        feature_index: [batch_size] (optionnel)          → Ligne de encoder_out de chaque légende
+                                                           (encoder_out: [n_images, encoder_dim])
+
+        returns:
+            - prédictions (logits) : [batch_size, max(caption_lengths) - 1, vocab_size],
+              dans l'ordre d'origine du batch, à zéro au-delà de chaque longueur
+        """
+        batch_size = encoded_captions.size(0)
+        logits, positions, max_steps = self._decode_packed(encoder_out, encoded_captions, caption_lengths, feature_index)
+
+        predictions = logits.new_zeros(batch_size * max_steps, logits.size(1))
+        predictions[positions] = logits
+        return predictions.view(batch_size, max_steps, -1)
+
+    def forward_packed(self, encoder_out, encoded_captions, caption_lengths, feature_index=None):
+        """
+        Variante d'entraînement sans padding : ni tenseur de prédictions rempli de zéros,
+        ni loss calculée sur les positions de padding.
+
+        returns:
+            - logits: [n_tokens, vocab_size]
+            - targets: [n_tokens] → token suivant attendu pour chaque logit
+        """
+        logits, positions, max_steps = self._decode_packed(encoder_out, encoded_captions, caption_lengths, feature_index)
+        targets = encoded_captions[:, 1:max_steps + 1].reshape(-1)[positions]
+        return logits, targets
@@ -2,9 +2,15 @@
 
 import torch
 import torch.nn as nn
+import torchvision.transforms.functional as TF
 from torchvision import models, transforms
 from PIL import Image
 
+IMAGE_SIZE = (224, 224)
+IMAGENET_MEAN = [0.485, 0.456, 0.406]
+IMAGENET_STD = [0.229, 0.224, 0.225]
+
+
 class Encoder(nn.Module):
     def __init__(self):
         super().__init__()
@@ -15,20 +21,60 @@ class Encoder(nn.Module):
         for param in self.resnet.parameters():
             param.requires_grad = False
 
-        # 🧪 Prétraitement intégré
+        # 🎨 Normalisation ImageNet appliquée au lot entier (buffers : suivent .to(device))
+        self.register_buffer("mean", torch.tensor(IMAGENET_MEAN).view(1, 3, 1, 1), persistent=False)
+        self.register_buffer("std", torch.tensor(IMAGENET_STD).view(1, 3, 1, 1), persistent=False)
+
+        # 🧪 Prétraitement PIL image par image (historique, conservé pour les notebooks)
         self.transform = transforms.Compose([
-            transforms.Resize((224, 224)),
+            transforms.Resize(IMAGE_SIZE),
             transforms.ToTensor(),
-            transforms.Normalize(mean=[0.485, 0.456, 0.406],
-                                 std=[0.229, 0.224, 0.225])
+            transforms.Normalize(mean=IMAGENET_MEAN,
+                                 std=IMAGENET_STD)
         ])
 
-    def forward(self, image: Image.Image):
-        image_tensor = self.transform(image).unsqueeze(0)
-        image_tensor = image_tensor.to(next(self.resnet.parameters()).device)
+    @staticmethod
+    def image_to_tensor(image: Image.Image) -> torch.Tensor:
+        """PIL → tenseur uint8 [3, 224, 224] : même resize bilinéaire que transforms.Resize, sans passage en float"""
+        image = image.convert("RGB").resize(IMAGE_SIZE[::-1], Image.BILINEAR)
+        return TF.pil_to_tensor(image)
+
+    def to_batch(self, images, normalized: bool = False) -> torch.Tensor:
+        """
+        Prépare un lot pour ResNet → float [B, 3, 224, 224] normalisé, sur le device de l'encodeur.
+
+        images:
+            - une image PIL ou une liste d'images PIL (tailles quelconques)
+            - un tenseur [B, 3, H, W] ou [3, H, W] : uint8 (0-255) ou float (0-1),
+              ou déjà normalisé si normalized=True
+        """
+        device = self.mean.device
+        if isinstance(images, Image.Image):
+            images = [images]
+        if not isinstance(images, torch.Tensor):
+            images = torch.stack([self.image_to_tensor(image) for image in images])
+        if images.dim() == 3:
+            images = images.unsqueeze(0)
+
+        images = images.to(device, non_blocking=True)
+        if tuple(images.shape[-2:]) != IMAGE_SIZE:
+            images = TF.resize(images, list(IMAGE_SIZE), antialias=True)
+
+        if images.dtype == torch.uint8:
+            images = images.float().div_(255)
+        else:
+            images = images.float()
+        if not normalized:
+            images = (images - self.mean) / self.std
+        return images
 
-        with torch.no_grad():
-            features = self.resnet(image_tensor)  # (1, 2048, 1, 1)
-            features = features.squeeze()         # (2048,)
+    def forward(self, images, normalized: bool = False):
+        """
+        images: image(s) PIL ou tenseur (cf. to_batch)
 
-        return features
+        returns:
+            - features: [batch_size, 2048] → la dimension batch est toujours conservée
+        """
+        with torch.inference_mode():
+            features = self.resnet(self.to_batch(images, normalized=normalized))  # (B, 2048, 1, 1)
+            return features.flatten(1)                                           # (B, 2048)
@@ -0,0 +1,196 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# ⏱️ Bornes (secondes) : du pas de décodage (~ms) à la requête complète (quelques s)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple, extra: dict | None = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    pairs += [f'{name}="{value}"' for name, value in (extra or {}).items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: dict) -> tuple:
+        if not self.labelnames and not labels:
+            return ()
+        try:
+            if len(labels) != len(self.labelnames):
+                raise KeyError
+            return tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            raise ValueError(f"{self.name} : labels attendus {self.labelnames}, reçus {tuple(labels)}") from None
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Compteur monotone, une valeur par combinaison de labels."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Histogramme à bornes fixes (cumulées au rendu), avec somme et nombre d'observations."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}  # labels → [comptes par borne (+Inf en dernier), somme, nombre]
+
+    def observe(self, value: float, **labels):
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Mesure la durée du bloc (observée même si le bloc lève une exception)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels) -> dict:
+        key = self._label_values(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return {"count": 0, "sum": 0.0}
+            return {"count": series[2], "sum": series[1]}
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            series = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Métriques du processus, exposées au format texte de Prometheus (GET /metrics).
+
+    Sans dépendance ni service externe : compteurs et histogrammes en mémoire,
+    protégés par un verrou (threads de l'executor, de FastAPI et du writer).
+    Un nom déjà enregistré renvoie la même métrique (modules importés plusieurs fois),
+    à condition d'être déclaré à l'identique. Les métriques partagées entre modules
+    sont déclarées une seule fois, en bas de ce fichier.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames, **options) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, tuple(labelnames), **options)
+            elif (
+                not isinstance(metric, cls)
+                or metric.labelnames != tuple(labelnames)
+                or metric.documentation != documentation
+            ):
+                raise ValueError(f"Métrique {name} déjà enregistrée avec un autre type, d'autres labels ou une autre aide")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames=()) -> Counter:
+    return registry.counter(name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+    return registry.histogram(name, documentation, labelnames, buckets)
+
+
+# 📊 Métriques partagées par plusieurs modules
+MODEL_LOADS = counter("model_loads_total", "Chargements de modèles", ["model"])
+MODEL_LOAD_SECONDS = histogram("model_load_seconds", "Durée de chargement d'un modèle", ["model"])
+CACHE_LOOKUPS = counter("cache_lookups_total", "Recherches dans les caches", ["cache", "result"])
@@ -40,14 +40,14 @@ def train_model(decoder, train_loader, val_loader, tokenizer, criterion, optimiz
         total_loss = 0.0
 
         batch_bar = tqdm(train_loader, desc=f"🧠 Training Epoch {epoch+1}", leave=True, position=1)
-        for features, captions, lengths in batch_bar:
+        for features, captions, lengths, *feature_index in batch_bar:
             features, captions = features.to(device), captions.to(device)
+            # 🖼️ Mode groupé par image : une ligne de features pour ses K légendes
+            feature_index = feature_index[0].to(device) if feature_index else None
             optimizer.zero_grad()
 
-            outputs = decoder(features, captions, lengths)
-            targets = captions[:, 1:]
-            outputs = outputs.view(-1, outputs.shape[-1])
-            targets = targets.reshape(-1)
+            # 🧮 Logits sans padding : même loss (ignore_index=pad) sans calcul sur les positions vides
+            outputs, targets = decoder.forward_packed(features, captions, lengths, feature_index)
 
             loss = criterion(outputs, targets)
             loss.backward()
@@ -66,9 +66,10 @@ def train_model(decoder, train_loader, val_loader, tokenizer, criterion, optimiz
 
         val_bar = tqdm(val_loader, desc=f"🔍 Evaluating Epoch {epoch+1}", leave=True, position=2)
         with torch.no_grad():
-            for features, captions, lengths in val_bar:
+            for features, captions, lengths, *feature_index in val_bar:
                 features, captions = features.to(device), captions.to(device)
-                outputs = decoder(features, captions, lengths)
+                feature_index = feature_index[0].to(device) if feature_index else None
+                outputs = decoder(features, captions, lengths, feature_index)
 
                 # 🎯 Calcul de la loss sur la validation
                 targets = captions[:, 1:]
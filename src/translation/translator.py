@@ -1,8 +1,165 @@
-from transformers import pipeline
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from src.monitoring.metrics import CACHE_LOOKUPS, MODEL_LOADS, MODEL_LOAD_SECONDS
+
+TRANSLATION_MODEL = "Helsinki-NLP/opus-mt-en-fr"
+
+# 💤 Le modèle n'est chargé qu'au premier besoin (ou via warmup_translator)
+_translator = None
+_translation_enabled = True
+_load_lock = threading.Lock()
+
+# Le tokenizer rapide de HF n'accepte pas d'appels concurrents ("Already borrowed")
+_translator_lock = threading.Lock()
+
+
+class TranslationDisabledError(RuntimeError):
+    """La traduction est désactivée pour ce déploiement."""
+
+
+def set_translation_enabled(enabled: bool):
+    global _translation_enabled
+    _translation_enabled = enabled
+
+
+def is_translation_loaded() -> bool:
+    return _translator is not None
+
+
+def get_translator():
+    """Retourne le pipeline MarianMT, en le chargeant au premier appel."""
+    global _translator
+    if not _translation_enabled:
+        raise TranslationDisabledError("La traduction est désactivée sur ce serveur")
+
+    if _translator is None:
+        with _load_lock:
+            if _translator is None:
+                # Import tardif : transformers est lui-même long à importer
+                start = time.perf_counter()
+                from transformers import pipeline
+                _translator = pipeline("translation_en_to_fr", model=TRANSLATION_MODEL)
+                MODEL_LOADS.inc(model="translation")
+                MODEL_LOAD_SECONDS.observe(time.perf_counter() - start, model="translation")
+    return _translator
+
+
+def warmup_translator():
+    """Charge le modèle et fait une première traduction (à appeler au démarrage si souhaité)."""
+    translator = get_translator()
+    with _translator_lock:
+        translator("a dog runs on the grass", max_length=60)
+
+
+class TranslationCache:
+    """
+    Cache LRU borné des traductions, indexé par la légende anglaise.
+
+    Le vocabulaire du modèle produit beaucoup de légendes identiques : en régime
+    établi, la quasi-totalité des traductions est servie depuis ce cache.
+    Si `path` est fourni, le cache est rechargé depuis / sauvegardé dans un fichier JSON.
+    """
+
+    def __init__(self, max_size: int = 4096, path: str | None = None):
+        self.max_size = max_size
+        self.path = Path(path) if path else None
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.path is not None and self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for caption, translation in json.load(f).items():
+                    self._store(caption, translation)
+
+    def get(self, caption: str) -> str | None:
+        with self._lock:
+            translation = self._entries.get(caption)
+            if translation is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(cache="translation", result="miss")
+                return None
+            self._entries.move_to_end(caption)
+            self.hits += 1
+            CACHE_LOOKUPS.inc(cache="translation", result="hit")
+            return translation
+
+    def put(self, caption: str, translation: str):
+        with self._lock:
+            self._store(caption, translation)
+
+    def _store(self, caption: str, translation: str):
+        self._entries[caption] = translation
+        self._entries.move_to_end(caption)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            entries = dict(self._entries)
+        # 💾 Écriture atomique : fichier temporaire puis renommage
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"max_size": self.max_size, "size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+translation_cache = TranslationCache()
+
+
+def configure_translation_cache(max_size: int = 4096, path: str | None = None) -> TranslationCache:
+    """Remplace le cache global (taille, persistance) ; à appeler au démarrage."""
+    global translation_cache
+    translation_cache = TranslationCache(max_size=max_size, path=path)
+    return translation_cache
+
+
+def get_translation_cache() -> TranslationCache:
+    return translation_cache
+
+
+def translate_captions(captions: list[str]) -> list[str]:
+    """
+    Traduit une liste de légendes anglaises en français.
+    Les légendes déjà connues viennent du cache ; les autres (dédoublonnées)
+    passent en un seul appel batché dans le modèle MarianMT.
+    """
+    cache = translation_cache
+    translations = {}
+    missing = []
+    for caption in dict.fromkeys(captions):
+        if not caption:
+            translations[caption] = caption
+            continue
+        cached = cache.get(caption)
+        if cached is None:
+            missing.append(caption)
+        else:
+            translations[caption] = cached
+
+    if missing:
+        translator = get_translator()
+        with _translator_lock:
+            results = translator(missing, max_length=60, batch_size=len(missing))
+        for caption, result in zip(missing, results):
+            translations[caption] = result["translation_text"]
+            cache.put(caption, result["translation_text"])
+
+    return [translations[caption] for caption in captions]
 
-# Charge une seule fois le modèle de traduction
-translator = pipeline("translation_en_to_fr", model="Helsinki-NLP/opus-mt-en-fr")
 
 def translate_caption(caption: str) -> str:
-    result = translator(caption, max_length=60)
-    return result[0]["translation_text"]
\ No newline at end of file
+    return translate_captions([caption])[0]
@@ -0,0 +1,85 @@
+"""
+Implémentations de référence du décodeur, volontairement naïves : une image à la fois,
+attention recalculée à chaque pas (pas de PreparedFeatures), aucun élagage anticipé.
+Servent d'oracle aux tests et aux benchmarks.
+"""
+import torch
+import torch.nn.functional as F
+
+
+def reference_step(decoder, features, token, hidden, cell):
+    """Un pas de décodage non optimisé → (log-probabilités [1, vocab_size], hidden, cell)"""
+    embeddings = decoder.embedding(torch.tensor([token]))
+    context, _ = decoder.attention(features, hidden)
+    hidden, cell = decoder.decode_step(torch.cat([embeddings, context], dim=1), (hidden, cell))
+    return F.log_softmax(decoder.fc(hidden), dim=1), hidden, cell
+
+
+def reference_forward(decoder, encoder_out, encoded_captions, caption_lengths):
+    """
+    Boucle d'entraînement d'origine : batch trié par longueur décroissante, sum() Python par pas,
+    encoder_att(encoder_out) recalculé à chaque pas, fc appliquée pas par pas.
+    """
+    embeddings = decoder.embedding(encoded_captions)
+    h, c = decoder.init_hidden_state(encoder_out)
+    decode_lengths = [length - 1 for length in caption_lengths]
+    predictions = torch.zeros(encoder_out.size(0), max(decode_lengths), decoder.fc.out_features)
+    for t in range(max(decode_lengths)):
+        batch_size_t = sum([l > t for l in decode_lengths])
+        context, _ = decoder.attention(encoder_out[:batch_size_t], h[:batch_size_t])
+        input_lstm = torch.cat([embeddings[:batch_size_t, t, :], context], dim=1)
+        h, c = decoder.decode_step(input_lstm, (h[:batch_size_t], c[:batch_size_t]))
+        predictions[:batch_size_t, t, :] = decoder.fc(decoder.dropout(h))
+    return predictions
+
+
+def reference_greedy_decode(decoder, features, start_token_id, end_token_id, max_len=20):
+    """Décodage glouton d'une image [encoder_dim] → (tokens jusqu'au <end> inclus, probabilités)"""
+    features = features.unsqueeze(0)
+    hidden, cell = decoder.init_hidden_state(features)
+    token, tokens, probs = start_token_id, [], []
+    with torch.no_grad():
+        for _ in range(max_len):
+            logp, hidden, cell = reference_step(decoder, features, token, hidden, cell)
+            token = logp.argmax(1).item()
+            tokens.append(token)
+            probs.append(logp[0, token].exp().item())
+            if token == end_token_id:
+                break
+    return tokens, probs
+
+
+def reference_beam_search(decoder, features, start_token_id, end_token_id, beam_size=3, max_len=20, length_penalty=1.0):
+    """
+    Beam search d'une image [encoder_dim] jusqu'à max_len, sans early stopping.
+    Retourne (tokens jusqu'au <end> inclus, score normalisé).
+    """
+    features = features.unsqueeze(0)
+    hidden, cell = decoder.init_hidden_state(features)
+    beams = [(torch.zeros(()), [], start_token_id, hidden, cell)]  # (log-prob, tokens, dernier token, h, c)
+    finished = []  # (score normalisé, tokens)
+
+    with torch.no_grad():
+        for t in range(max_len):
+            candidates = []
+            for score, tokens, last, hidden, cell in beams:
+                logp, hidden, cell = reference_step(decoder, features, last, hidden, cell)
+                logp = logp[0]
+                if t == 0:
+                    logp[end_token_id] = float("-inf")
+                top_logp, top_tokens = logp.topk(2 * beam_size)
+                for token_logp, token in zip(top_logp, top_tokens.tolist()):
+                    candidates.append((score + token_logp, tokens + [token], token, hidden, cell))
+
+            candidates.sort(key=lambda candidate: candidate[0].item(), reverse=True)
+            candidates = candidates[:2 * beam_size]
+            finished += [
+                ((score / (t + 1) ** length_penalty).item(), tokens)
+                for score, tokens, last, _, _ in candidates if last == end_token_id
+            ]
+            beams = [candidate for candidate in candidates if candidate[2] != end_token_id][:beam_size]
+
+        finished += [((score / max_len ** length_penalty).item(), tokens) for score, tokens, *_ in beams]
+
+    score, tokens = max(finished, key=lambda hypothesis: hypothesis[0])
+    return tokens, score
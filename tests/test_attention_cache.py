@@ -0,0 +1,69 @@
+import pytest
+import torch
+
+from src.inference.decoding import beam_search_decode, greedy_decode
+from src.model.decoder import DecoderWithAttention
+from tests.reference_decoder import reference_beam_search, reference_forward, reference_greedy_decode
+
+VOCAB_SIZE, ENCODER_DIM = 30, 40
+PAD, START, END = 0, 1, 2
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    torch.manual_seed(0)
+    decoder = DecoderWithAttention(32, 32, 64, VOCAB_SIZE, encoder_dim=ENCODER_DIM).eval()
+    with torch.no_grad():
+        # Distributions piquées et <end> favorisé : séquences de longueurs variées
+        decoder.fc.weight.mul_(20)
+        decoder.fc.bias[END] = 3.0
+    return decoder
+
+
+@pytest.fixture
+def features():
+    torch.manual_seed(1)
+    return torch.randn(6, ENCODER_DIM)
+
+
+def test_attend_matches_attention(decoder, features):
+    prepared = decoder.prepare_features(features)
+    hidden = torch.randn(features.size(0), 64)
+    expected_context, expected_alpha = decoder.attention(features, hidden)
+    context, alpha = decoder.attend(prepared, hidden)
+    torch.testing.assert_close(context, expected_context)
+    torch.testing.assert_close(alpha, expected_alpha)
+
+
+def test_training_forward_matches_uncached(decoder, features):
+    lengths = [9, 7, 7, 5, 3, 2]
+    captions = torch.randint(3, VOCAB_SIZE, (features.size(0), max(lengths)))
+    with torch.no_grad():
+        expected = reference_forward(decoder, features, captions, lengths)
+        actual = decoder(features, captions, lengths)
+    torch.testing.assert_close(actual, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_greedy_decode_matches_uncached(decoder, features):
+    token_ids, confidences = greedy_decode(decoder, features, START, END, PAD, max_len=10)
+
+    for i in range(features.size(0)):
+        tokens, probs = reference_greedy_decode(decoder, features[i], START, END, max_len=10)
+        assert token_ids[i, :len(tokens)].tolist() == tokens
+        assert (token_ids[i, len(tokens):] == PAD).all()
+        assert confidences[i, :len(tokens)].tolist() == pytest.approx(probs, abs=1e-5)
+        assert (confidences[i, len(tokens):] == 0).all()
+
+
+def test_beam_search_decode_matches_uncached(decoder, features):
+    token_ids, token_probs, scores = beam_search_decode(
+        decoder, features, START, END, PAD, beam_size=3, max_len=10, length_penalty=1.0
+    )
+
+    for i in range(features.size(0)):
+        tokens, score = reference_beam_search(
+            decoder, features[i], START, END, beam_size=3, max_len=10, length_penalty=1.0
+        )
+        assert token_ids[i, :len(tokens)].tolist() == tokens
+        assert (token_probs[i, len(tokens):] == 0).all()
+        assert scores[i].item() == pytest.approx(score, abs=1e-5)
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+import pytest
+
+from api_src.services.bounded_executor import BoundedExecutor, QueueFullError
+
+
+def test_cancelled_call_keeps_its_slot_until_the_task_ends():
+    release = threading.Event()
+
+    async def scenario():
+        executor = BoundedExecutor(max_workers=1, max_pending=1)
+        call = asyncio.create_task(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        call.cancel()  # client déconnecté : la tâche tourne toujours dans le pool
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        assert executor.stats()["running"] == 1
+        with pytest.raises(QueueFullError):
+            await executor.run(lambda: None)
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert await executor.run(lambda: 42) == 42
+        stats = executor.stats()
+        executor.shutdown()
+        return stats
+
+    try:
+        stats = asyncio.run(scenario())
+    finally:
+        release.set()
+    assert stats["queue_depth"] == 0
+    assert stats["rejected"] == 1
+
+
+def test_cancelled_call_still_queued_frees_its_slot():
+    release = threading.Event()
+
+    async def scenario():
+        executor = BoundedExecutor(max_workers=1, max_pending=2)
+        running = asyncio.create_task(executor.run(release.wait, 5))
+        queued = asyncio.create_task(executor.run(lambda: None))
+        await asyncio.sleep(0.05)
+        queued.cancel()  # pas encore démarrée : retirée du pool, sa place est rendue
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        await asyncio.sleep(0.05)
+        pending = executor._pending
+        release.set()
+        await running
+        executor.shutdown()
+        return pending
+
+    try:
+        assert asyncio.run(scenario()) == 1
+    finally:
+        release.set()
@@ -0,0 +1,92 @@
+import pytest
+import torch
+from torch import nn
+
+from src.model.decoder import DecoderWithAttention
+from tests.reference_decoder import reference_forward
+
+VOCAB_SIZE, ENCODER_DIM = 50, 40
+PAD = 0
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    torch.manual_seed(0)
+    return DecoderWithAttention(32, 32, 64, VOCAB_SIZE, encoder_dim=ENCODER_DIM).eval()
+
+
+@pytest.fixture
+def batch():
+    """Batch volontairement NON trié par longueur, légendes complétées par du padding"""
+    torch.manual_seed(1)
+    lengths = [4, 9, 2, 9, 6, 3, 7]
+    captions = torch.full((len(lengths), max(lengths)), PAD, dtype=torch.long)
+    for i, length in enumerate(lengths):
+        captions[i, :length] = torch.randint(3, VOCAB_SIZE, (length,))
+    return torch.randn(len(lengths), ENCODER_DIM), captions, lengths
+
+
+def sorted_reference(decoder, features, captions, lengths):
+    """Boucle d'origine (qui exige un batch trié), remise dans l'ordre du batch"""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    expected = reference_forward(decoder, features[order], captions[order], [lengths[i] for i in order])
+    return expected[torch.tensor(order).argsort()]
+
+
+def test_forward_matches_reference_loop(decoder, batch):
+    features, captions, lengths = batch
+    with torch.no_grad():
+        expected = sorted_reference(decoder, features, captions, lengths)
+        actual = decoder(features, captions, lengths)
+
+    assert actual.shape == (len(lengths), max(lengths) - 1, VOCAB_SIZE)
+    torch.testing.assert_close(actual, expected, rtol=1e-5, atol=1e-5)
+    for i, length in enumerate(lengths):
+        assert (actual[i, length - 1:] == 0).all()
+
+
+def test_forward_accepts_lengths_tensor(decoder, batch):
+    features, captions, lengths = batch
+    with torch.no_grad():
+        expected = decoder(features, captions, lengths)
+        actual = decoder(features, captions, torch.tensor(lengths).unsqueeze(1))
+    torch.testing.assert_close(actual, expected)
+
+
+def test_forward_packed_matches_reference_loop(decoder, batch):
+    features, captions, lengths = batch
+    criterion = nn.CrossEntropyLoss(ignore_index=PAD)
+    with torch.no_grad():
+        expected = sorted_reference(decoder, features, captions, lengths)
+        logits, targets = decoder.forward_packed(features, captions, lengths)
+
+    # Un logit par token réellement décodé, aucun pour le padding
+    assert logits.shape == (sum(length - 1 for length in lengths), VOCAB_SIZE)
+    assert (targets != PAD).all()
+
+    valid = torch.zeros(expected.shape[:2], dtype=torch.bool)
+    for i, length in enumerate(lengths):
+        valid[i, :length - 1] = True
+    expected_logits, expected_targets = expected[valid], captions[:, 1:][valid]
+
+    # Ordre interne (pas par pas) : chaque logit doit correspondre à un (séquence, pas) distinct
+    matches = torch.cdist(logits, expected_logits).argmin(dim=1)
+    assert matches.unique().numel() == matches.numel()
+    torch.testing.assert_close(logits, expected_logits[matches], rtol=1e-5, atol=1e-5)
+    assert torch.equal(targets, expected_targets[matches])
+
+    expected_loss = criterion(expected.reshape(-1, VOCAB_SIZE), captions[:, 1:].reshape(-1))
+    torch.testing.assert_close(criterion(logits, targets), expected_loss)
+
+
+def test_forward_with_feature_index_matches_duplicated_features(decoder, batch):
+    _, captions, lengths = batch
+    torch.manual_seed(2)
+    images = torch.randn(3, ENCODER_DIM)
+    feature_index = torch.tensor([0, 2, 1, 0, 2, 2, 1])
+    with torch.no_grad():
+        expected = decoder(images[feature_index], captions, lengths)
+        actual = decoder(images, captions, lengths, feature_index=feature_index)
+        packed, _ = decoder.forward_packed(images, captions, lengths, feature_index=feature_index)
+    torch.testing.assert_close(actual, expected, rtol=1e-5, atol=1e-5)
+    assert packed.size(0) == sum(length - 1 for length in lengths)
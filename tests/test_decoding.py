@@ -0,0 +1,61 @@
+import pytest
+import torch
+
+from src.inference.decoding import beam_search_decode, mean_confidence
+from src.model.decoder import DecoderWithAttention
+from tests.reference_decoder import reference_beam_search
+
+VOCAB_SIZE, ENCODER_DIM = 12, 24
+PAD, START, END = 0, 1, 2
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    torch.manual_seed(0)
+    decoder = DecoderWithAttention(16, 16, 32, VOCAB_SIZE, encoder_dim=ENCODER_DIM).eval()
+    with torch.no_grad():
+        # Distributions piquées et <end> probable : cas où un élagage trop tôt se voit
+        decoder.fc.weight.mul_(30)
+        decoder.fc.bias[END] = 1.5
+    return decoder
+
+
+@pytest.mark.parametrize("beam_size", [2, 3, 5])
+@pytest.mark.parametrize("length_penalty", [0.0, 0.7, 1.0])
+def test_beam_search_matches_search_without_early_stop(decoder, beam_size, length_penalty):
+    torch.manual_seed(1)
+    features = torch.randn(8, ENCODER_DIM)
+    max_len = 8
+
+    token_ids, _, scores = beam_search_decode(
+        decoder, features, START, END, PAD,
+        beam_size=beam_size, max_len=max_len, length_penalty=length_penalty
+    )
+
+    for i in range(features.size(0)):
+        tokens, score = reference_beam_search(
+            decoder, features[i], START, END,
+            beam_size=beam_size, max_len=max_len, length_penalty=length_penalty
+        )
+        assert token_ids[i, :len(tokens)].tolist() == tokens
+        assert (token_ids[i, len(tokens):] == PAD).all()
+        assert scores[i].item() == pytest.approx(score, abs=1e-5)
+
+
+def test_beam_search_never_returns_empty_caption(decoder):
+    torch.manual_seed(2)
+    with torch.no_grad():
+        decoder_end_bias = decoder.fc.bias[END].item()
+        decoder.fc.bias[END] = 50.0  # <end> écrase tout le reste
+        try:
+            token_ids, _, _ = beam_search_decode(decoder, torch.randn(4, ENCODER_DIM), START, END, PAD, beam_size=3, max_len=5)
+        finally:
+            decoder.fc.bias[END] = decoder_end_bias
+
+    assert (token_ids[:, 0] != END).all()
+    assert (token_ids[:, 1] == END).all()
+
+
+def test_mean_confidence_of_empty_caption():
+    assert mean_confidence([]) == 0.0
+    assert mean_confidence([0.5, 0.25]) == 0.375
@@ -0,0 +1,24 @@
+import torch
+
+from src.data import feature_store
+from src.data.feature_store import FeatureStore, pack_features
+
+
+def test_pack_features_resume_skips_existing_files(tmp_path, monkeypatch):
+    features_dir = tmp_path / "features"
+    features_dir.mkdir()
+    for i in range(3):
+        torch.save(torch.full((4,), float(i)), features_dir / f"img{i}.pt")
+    store_dir = tmp_path / "store"
+    assert pack_features(features_dir, store_dir, chunk_size=2) == 3
+
+    torch.save(torch.full((4,), 3.0), features_dir / "img3.pt")
+    loaded = []
+    torch_load = torch.load
+    monkeypatch.setattr(feature_store.torch, "load", lambda path: loaded.append(path.stem) or torch_load(path))
+
+    assert pack_features(features_dir, store_dir) == 1
+    assert loaded == ["img3"]
+    store = FeatureStore(store_dir)
+    assert store.ids == ["img0", "img1", "img2", "img3"]
+    assert store.get("img3").tolist() == [3.0] * 4
@@ -0,0 +1,35 @@
+import pytest
+
+from src.monitoring.metrics import MetricsRegistry
+
+
+def test_redeclaring_a_metric_must_match():
+    registry = MetricsRegistry()
+    lookups = registry.counter("cache_lookups_total", "Recherches dans les caches", ["cache", "result"])
+
+    assert registry.counter("cache_lookups_total", "Recherches dans les caches", ["cache", "result"]) is lookups
+    with pytest.raises(ValueError):
+        registry.counter("cache_lookups_total", "Autre aide", ["cache", "result"])
+    with pytest.raises(ValueError):
+        registry.counter("cache_lookups_total", "Recherches dans les caches", ["cache"])
+    with pytest.raises(ValueError):
+        registry.histogram("cache_lookups_total", "Recherches dans les caches", ["cache", "result"])
+
+
+def test_render_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requêtes", ["route"]).inc(route="/a")
+    registry.histogram("latency_seconds", "Latence", buckets=(0.1, 1.0)).observe(0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latence",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 0',
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 1',
+        "latency_seconds_sum 0.5",
+        "latency_seconds_count 1",
+        "# HELP requests_total Requêtes",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 1',
+    ]
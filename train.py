@@ -2,7 +2,10 @@ import os
 import torch
 from torch import nn, optim
 from torch.utils.data import random_split, DataLoader
-from src.data.dataset import ImageCaptionDataset, get_collate_fn
+from src.data.dataset import ImageCaptionDataset, ImageCaptionGroupDataset, get_collate_fn, get_grouped_collate_fn
+from src.data.feature_store import FeatureStore
+from src.data.caption_corpus import load_or_build_corpus
+from src.data.samplers import BucketBatchSampler
 from src.data.tokenizer import load_tokenizer
 from src.model.decoder import DecoderWithAttention
 from src.train.engine import train_model
@@ -35,24 +38,54 @@ print(f"📝 Captions associées à {example_id} :")
 for cap in captions_dict[example_id]:
     print(" ➤", cap)
 
+# 🔡 Légendes nettoyées et encodées une seule fois (cache invalidé si le tokenizer change)
+corpus = load_or_build_corpus(captions_dict_path, tokenizer, config["caption_corpus_path"])
+
 # 🔄 Génération des ID augmentés
 augmentations = ["", "_aug0", "_aug1", "_aug2"]
 full_pairs = []
+full_groups = []
 
-for image_id, captions in captions_dict.items():
+for image_id in captions_dict:
     for suffix in augmentations:
         full_id = image_id + suffix
-        for caption in captions:
-            full_pairs.append((full_id, caption))
-
-
-
-dataset = ImageCaptionDataset(
-    pairs=full_pairs,
-    features_dir=config["features_dir"],
-    tokenizer=tokenizer
-)
-collate_fn = get_collate_fn(tokenizer)
+        full_groups.append((full_id, list(corpus.caption_indices(image_id))))
+        for caption_idx in corpus.caption_indices(image_id):
+            full_pairs.append((full_id, caption_idx))
+
+
+
+# 🗄️ Feature store compact si disponible (python -m src.data.feature_store), sinon fichiers .pt
+feature_store_dir = config.get("feature_store_dir")
+if FeatureStore.exists(feature_store_dir):
+    print(f"🗄️ Features lues depuis le feature store {feature_store_dir}")
+else:
+    feature_store_dir = None
+
+batch_size = config["training"]["batch_size"]
+group_by_image = config["training"].get("group_by_image", False)
+
+if group_by_image:
+    # 🖼️ Un exemple = une image et ses K légendes : features chargées et préparées une seule fois
+    dataset = ImageCaptionGroupDataset(
+        pairs=full_groups,
+        features_dir=config["features_dir"],
+        tokenizer=tokenizer,
+        feature_store=feature_store_dir,
+        corpus=corpus
+    )
+    collate_fn = get_grouped_collate_fn(tokenizer)
+    captions_per_image = max(len(captions) for captions in captions_dict.values())
+    batch_size = max(1, batch_size // captions_per_image)  # même nombre de légendes par batch
+else:
+    dataset = ImageCaptionDataset(
+        pairs=full_pairs,
+        features_dir=config["features_dir"],
+        tokenizer=tokenizer,
+        feature_store=feature_store_dir,
+        corpus=corpus
+    )
+    collate_fn = get_collate_fn(tokenizer)
 
 
 # 📏 Proportions des splits
@@ -71,9 +104,25 @@ print(f"📊 Split → Train: {len(train_dataset)} | Val: {len(val_dataset)} | T
 
 # 🧪 DataLoaders
 
-train_loader = DataLoader(train_dataset, batch_size=config["training"]["batch_size"], shuffle=True, num_workers=8, pin_memory=True, collate_fn=collate_fn)
-val_loader = DataLoader(val_dataset, batch_size=config["training"]["batch_size"], shuffle=False, num_workers=8, pin_memory=True, collate_fn=collate_fn)
-test_loader = DataLoader(test_dataset, batch_size=config["training"]["batch_size"], shuffle=False, num_workers=8, pin_memory=True, collate_fn=collate_fn)
+if config["training"].get("bucket_batches", False) and not group_by_image:
+    # 🪣 Batches de légendes de longueurs voisines : moins de padding et de pas LSTM
+    caption_lengths = dataset.caption_lengths()
+
+    def bucket_loader(subset, shuffle):
+        sampler = BucketBatchSampler(
+            [caption_lengths[i] for i in subset.indices],
+            batch_size=batch_size,
+            shuffle=shuffle
+        )
+        return DataLoader(subset, batch_sampler=sampler, num_workers=8, pin_memory=True, collate_fn=collate_fn)
+
+    train_loader = bucket_loader(train_dataset, shuffle=True)
+    val_loader = bucket_loader(val_dataset, shuffle=False)
+    test_loader = bucket_loader(test_dataset, shuffle=False)
+else:
+    train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True, num_workers=8, pin_memory=True, collate_fn=collate_fn)
+    val_loader = DataLoader(val_dataset, batch_size=batch_size, shuffle=False, num_workers=8, pin_memory=True, collate_fn=collate_fn)
+    test_loader = DataLoader(test_dataset, batch_size=batch_size, shuffle=False, num_workers=8, pin_memory=True, collate_fn=collate_fn)
 
 
 # 🧠 Modèle